@@ -0,0 +1,3 @@
+"""
+Módulo benchmarks - Medición de rendimiento del analizador de algoritmos
+"""
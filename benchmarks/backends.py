@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Comparación de backends del clasificador
+Mide tiempo de entrenamiento, latencia de inferencia, tamaño del modelo
+y precisión de cada backend sobre el mismo corpus y la misma partición
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Agregar el directorio raíz al path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.throughput import percentile
+from ml.backends import BACKENDS, create_backend
+from ml.dataset_generator import AlgorithmDatasetGenerator
+from ml.deduplication import CorpusDeduplicator
+from ml.feature_cache import FeatureMatrixBuilder
+
+
+class BackendComparison:
+    """Entrena y mide cada backend con la misma partición train/test"""
+
+    def __init__(self, dataset: Sequence[Tuple[str, str]], backends: Optional[List[str]] = None,
+                 epochs: int = 100, batch_size: int = 32, latency_samples: int = 200,
+                 test_size: float = 0.2, seed: int = 42, workers: Optional[int] = None):
+        self.dataset = dataset
+        self.backends = backends or list(BACKENDS)
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.latency_samples = latency_samples
+        self.test_size = test_size
+        self.seed = seed
+        self.workers = workers
+
+    def run(self) -> Dict:
+        """Ejecuta la comparación y retorna los resultados por backend"""
+        from sklearn.metrics import f1_score
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import LabelEncoder
+
+        X, labels = FeatureMatrixBuilder(cache_dir=None, workers=self.workers).build(self.dataset)
+        X = np.asarray(X, dtype=np.float32)
+        encoder = LabelEncoder()
+        y = encoder.fit_transform(labels)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=self.test_size, random_state=self.seed, stratify=y
+        )
+
+        results: Dict[str, Dict] = {}
+        for name in self.backends:
+            print(f"⏱️  {name}...")
+            backend = create_backend(name, X.shape[1], len(encoder.classes_), verbose=False)
+            try:
+                start = time.perf_counter()
+                backend.fit(X_train, y_train, X_test, y_test, epochs=self.epochs, batch_size=self.batch_size)
+                train_seconds = time.perf_counter() - start
+            except ImportError as e:
+                results[name] = {'skipped': f'dependencia no disponible: {e.name or e}'}
+                continue
+
+            predictions = np.argmax(backend.predict_proba(X_test), axis=1)
+            results[name] = {
+                'train_seconds': train_seconds,
+                'accuracy': float(np.mean(predictions == y_test)),
+                'macro_f1': float(f1_score(y_test, predictions, average='macro')),
+                'latency_ms': self._single_latency(backend, X_test),
+                'batch_throughput_per_sec': self._batch_throughput(backend, X_test),
+                'model_bytes': self._model_size(backend)
+            }
+
+        return {
+            'metadata': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'train_samples': int(len(y_train)),
+                'test_samples': int(len(y_test)),
+                'classes': [str(c) for c in encoder.classes_],
+                'epochs': self.epochs
+            },
+            'backends': results
+        }
+
+    def _single_latency(self, backend, X: np.ndarray) -> Dict[str, float]:
+        """Latencia de una predicción individual, como en el analizador"""
+        rows = X[:self.latency_samples] if len(X) else np.zeros((1, X.shape[1]), dtype=np.float32)
+        backend.predict_proba(rows[:1])
+        latencies = []
+        for row in rows:
+            start = time.perf_counter()
+            backend.predict_proba(row.reshape(1, -1))
+            latencies.append((time.perf_counter() - start) * 1000.0)
+        latencies.sort()
+        return {'p50': percentile(latencies, 50), 'p95': percentile(latencies, 95)}
+
+    def _batch_throughput(self, backend, X: np.ndarray) -> float:
+        if not len(X):
+            return 0.0
+        start = time.perf_counter()
+        backend.predict_proba(X)
+        elapsed = time.perf_counter() - start
+        return len(X) / elapsed if elapsed > 0 else 0.0
+
+    def _model_size(self, backend) -> int:
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = str(Path(tmp) / 'model')
+            backend.save(model_path)
+            return backend.model_file(model_path).stat().st_size
+
+
+def print_report(results: Dict):
+    """Muestra la tabla comparativa"""
+    print(f"\n{'Backend':<20}{'acc':>8}{'F1':>8}{'train s':>10}{'p50 ms':>10}"
+          f"{'p95 ms':>10}{'lote/s':>12}{'KB':>10}")
+    print("-" * 88)
+    for name, metrics in results['backends'].items():
+        if 'skipped' in metrics:
+            print(f"{name:<20}  omitido: {metrics['skipped']}")
+            continue
+        print(f"{name:<20}{metrics['accuracy']:>8.3f}{metrics['macro_f1']:>8.3f}"
+              f"{metrics['train_seconds']:>10.2f}{metrics['latency_ms']['p50']:>10.3f}"
+              f"{metrics['latency_ms']['p95']:>10.3f}{metrics['batch_throughput_per_sec']:>12.0f}"
+              f"{metrics['model_bytes'] / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar backends del clasificador")
+    parser.add_argument('--samples', type=int, default=100,
+                       help='Muestras por clase (default: 100)')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Semilla del dataset y de la partición (default: 42)')
+    parser.add_argument('--backends', type=str, default=','.join(BACKENDS),
+                       help=f"Backends separados por comas (default: {','.join(BACKENDS)})")
+    parser.add_argument('--epochs', type=int, default=100,
+                       help='Épocas para los backends iterativos (default: 100)')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='No eliminar duplicados antes de particionar')
+    parser.add_argument('--output', '-o', type=str, default='backend_comparison.json',
+                       help='Archivo JSON de resultados')
+
+    args = parser.parse_args()
+
+    dataset = AlgorithmDatasetGenerator().generate_training_dataset(args.samples, seed=args.seed)
+    if not args.no_dedup:
+        # Sin deduplicar, las copias de una muestra acaban en train y en test
+        dataset, _ = CorpusDeduplicator().deduplicate(dataset)
+    print(f"📊 Dataset: {len(dataset)} muestras")
+
+    backends = [name.strip() for name in args.backends.split(',') if name.strip()]
+    comparison = BackendComparison(dataset, backends=backends, epochs=args.epochs, seed=args.seed)
+    results = comparison.run()
+    print_report(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Resultados guardados en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Evaluación de precisión y latencia de los modos del analizador
+Compara el análisis tradicional, la red neuronal, la combinación de ambos y
+la cascada (red solo si el análisis tradicional es dudoso) sobre un corpus
+etiquetado, y barre los umbrales de confianza de la combinación para ver
+cuándo compensa el coste de inferencia de la red
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Agregar el directorio raíz al path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.throughput import percentile
+from core.analyzer import (AlgorithmAnalyzer, NEURAL_MIN_CONFIDENCE, NEURAL_OVERRIDE_CONFIDENCE,
+                           combine_predictions)
+from ml.dataset_generator import AlgorithmDatasetGenerator
+
+
+NOTATIONS = ['O(1)', 'O(log n)', 'O(n)', 'O(n log n)', 'O(n²)', 'O(n³)', 'O(2ⁿ)', 'O(n!)']
+
+# Rejilla por defecto del barrido: confianza mínima y confianza para prevalecer
+DEFAULT_MIN_CONFIDENCES = [0.0, 0.3, 0.5, 0.6, 0.7, 0.8, 0.9]
+DEFAULT_OVERRIDE_CONFIDENCES = [0.5, 0.7, 0.8, 0.9, 0.95, 1.0]
+
+
+def load_labeled_corpus(path: str) -> List[Tuple[str, str]]:
+    """
+    Lee un corpus etiquetado
+
+    Admite un JSON con una lista de pares [código, notación] o de objetos
+    {"code", "label"}, y el JSONL de valoraciones del bot (ml/feedback.py).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            entries = json.load(f)
+
+    corpus = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            if entry.get('label'):
+                corpus.append((entry['code'], entry['label']))
+        else:
+            corpus.append((entry[0], entry[1]))
+    return corpus
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+    }
+
+
+def _accuracy_report(expected: Sequence[str], predicted: Sequence[str]) -> Dict:
+    """Precisión global, por clase y matriz de confusión (filas: real, columnas: predicha)"""
+    labels = [n for n in NOTATIONS if n in set(expected) | set(predicted)]
+    labels += sorted((set(expected) | set(predicted)) - set(labels))
+    index = {label: i for i, label in enumerate(labels)}
+    matrix = [[0] * len(labels) for _ in labels]
+    for real, guess in zip(expected, predicted):
+        matrix[index[real]][index[guess]] += 1
+
+    per_class = {}
+    for label in labels:
+        total = sum(matrix[index[label]])
+        if total:
+            per_class[label] = matrix[index[label]][index[label]] / total
+
+    hits = sum(1 for real, guess in zip(expected, predicted) if real == guess)
+    return {
+        'accuracy': hits / len(expected) if expected else 0.0,
+        'per_class_accuracy': per_class,
+        'confusion_matrix': {'labels': labels, 'matrix': matrix},
+    }
+
+
+class ModeEvaluation:
+    """Ejecuta el corpus por cada modo del analizador y barre los umbrales de la combinación"""
+
+    def __init__(self, corpus: Sequence[Tuple[str, str]], model_path: Optional[str] = None,
+                 language: str = 'python', min_confidence: float = NEURAL_MIN_CONFIDENCE,
+                 override_confidence: float = NEURAL_OVERRIDE_CONFIDENCE,
+                 min_confidences: Sequence[float] = DEFAULT_MIN_CONFIDENCES,
+                 override_confidences: Sequence[float] = DEFAULT_OVERRIDE_CONFIDENCES):
+        self.corpus = corpus
+        self.model_path = model_path
+        self.language = language
+        # Umbrales con los que se ejecuta el modo combinado
+        self.min_confidence = min_confidence
+        self.override_confidence = override_confidence
+        self.min_confidences = list(min_confidences)
+        self.override_confidences = list(override_confidences)
+
+    def run(self) -> Dict:
+        """Ejecuta la evaluación y retorna los resultados por modo y el barrido"""
+        expected = [label for _, label in self.corpus]
+
+        traditional, traditional_ms = self._run_traditional()
+        modes = {'traditional': dict(_accuracy_report(expected, traditional),
+                                     latency_ms=_latency_summary(traditional_ms))}
+
+        neural_analyzer = self._create_neural_analyzer()
+        sweep: List[Dict] = []
+        if neural_analyzer is None:
+            reason = 'modelo no disponible' if self.model_path else 'sin ruta de modelo'
+            modes['neural'] = {'skipped': reason}
+            modes['combined'] = {'skipped': reason}
+            modes['cascade'] = {'skipped': reason}
+        else:
+            neural, confidences, neural_ms = self._run_neural(neural_analyzer)
+            combined, combined_ms = self._run_combined(neural_analyzer)
+            modes['neural'] = dict(_accuracy_report(expected, neural),
+                                   latency_ms=_latency_summary(neural_ms))
+            modes['combined'] = dict(_accuracy_report(expected, combined),
+                                     latency_ms=_latency_summary(combined_ms),
+                                     thresholds={'min_confidence': neural_analyzer.neural_min_confidence,
+                                                 'override_confidence': neural_analyzer.neural_override_confidence})
+            cascade_analyzer = self._create_neural_analyzer(neural_policy='cascade')
+            cascade, cascade_ms = self._run_combined(cascade_analyzer)
+            modes['cascade'] = dict(_accuracy_report(expected, cascade),
+                                    latency_ms=_latency_summary(cascade_ms),
+                                    neural_stats=cascade_analyzer.get_neural_stats())
+            sweep = self._sweep(expected, traditional, neural, confidences)
+
+        return {
+            'metadata': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'corpus_size': len(self.corpus),
+                'model_path': self.model_path,
+            },
+            'modes': modes,
+            'threshold_sweep': sweep,
+        }
+
+    def _create_neural_analyzer(self, neural_policy: str = 'always') -> Optional[AlgorithmAnalyzer]:
+        if not self.model_path or not Path(f"{self.model_path}_metadata.json").exists():
+            return None
+        analyzer = AlgorithmAnalyzer(use_neural_network=True, model_path=self.model_path,
+                                     neural_min_confidence=self.min_confidence,
+                                     neural_override_confidence=self.override_confidence,
+                                     neural_policy=neural_policy)
+        return analyzer if analyzer.neural_classifier is not None else None
+
+    def _run_traditional(self) -> Tuple[List[str], List[float]]:
+        analyzer = AlgorithmAnalyzer(use_neural_network=False)
+        predictions, latencies = [], []
+        for code, _ in self.corpus:
+            start = time.perf_counter()
+            result = analyzer.analyze_code(code, self.language)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            predictions.append(result.get('traditional_notation') or 'error')
+        return predictions, latencies
+
+    def _run_neural(self, analyzer: AlgorithmAnalyzer) -> Tuple[List[str], List[float], List[float]]:
+        """Solo la red: extracción de características e inferencia"""
+        classifier = analyzer.neural_classifier
+        predictions, confidences, latencies = [], [], []
+        for code, _ in self.corpus:
+            start = time.perf_counter()
+            notation, confidence = classifier.predict(code)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            predictions.append(str(notation))
+            confidences.append(float(confidence))
+        return predictions, confidences, latencies
+
+    def _run_combined(self, analyzer: AlgorithmAnalyzer) -> Tuple[List[str], List[float]]:
+        predictions, latencies = [], []
+        for code, _ in self.corpus:
+            start = time.perf_counter()
+            result = analyzer.analyze_code(code, self.language)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            predictions.append(result.get('notation') or 'error')
+        return predictions, latencies
+
+    def _sweep(self, expected: List[str], traditional: List[str], neural: List[str],
+               confidences: List[float]) -> List[Dict]:
+        """
+        Recalcula la combinación para cada par de umbrales sin volver a analizar
+
+        `neural_override_rate` es la fracción de fragmentos en los que la red
+        cambia el resultado: lo que se obtiene a cambio de su latencia.
+        """
+        traditional_hits = sum(1 for real, guess in zip(expected, traditional) if real == guess)
+        sweep = []
+        for min_confidence in self.min_confidences:
+            for override_confidence in self.override_confidences:
+                if override_confidence < min_confidence:
+                    continue
+                combined = [combine_predictions(t, n, c, min_confidence, override_confidence)
+                            for t, n, c in zip(traditional, neural, confidences)]
+                hits = sum(1 for real, guess in zip(expected, combined) if real == guess)
+                overrides = sum(1 for t, f in zip(traditional, combined) if t != f)
+                sweep.append({
+                    'min_confidence': min_confidence,
+                    'override_confidence': override_confidence,
+                    'accuracy': hits / len(expected),
+                    'gain_vs_traditional': (hits - traditional_hits) / len(expected),
+                    'neural_override_rate': overrides / len(expected),
+                })
+        sweep.sort(key=lambda r: (-r['accuracy'], r['neural_override_rate']))
+        return sweep
+
+
+def print_report(results: Dict, limit: int = 10):
+    """Muestra la tabla por modo, las matrices de confusión y el mejor tramo del barrido"""
+    print(f"\n{'Modo':<14}{'acc':>8}{'media ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    print("-" * 52)
+    for mode, metrics in results['modes'].items():
+        if 'skipped' in metrics:
+            print(f"{mode:<14}  omitido: {metrics['skipped']}")
+            continue
+        latency = metrics['latency_ms']
+        print(f"{mode:<14}{metrics['accuracy']:>8.3f}{latency['mean']:>10.3f}"
+              f"{latency['p50']:>10.3f}{latency['p95']:>10.3f}")
+        if 'neural_stats' in metrics:
+            stats = metrics['neural_stats']
+            print(f"{'':<14}red omitida en {stats['skipped']}/{stats['invoked'] + stats['skipped']} "
+                  f"({stats['skip_rate']:.1%})")
+
+    for mode, metrics in results['modes'].items():
+        if 'skipped' in metrics:
+            continue
+        labels = metrics['confusion_matrix']['labels']
+        print(f"\n🔢 Matriz de confusión ({mode}; filas: real, columnas: predicha)")
+        print(' ' * 12 + ''.join(f"{label:>11}" for label in labels))
+        for label, row in zip(labels, metrics['confusion_matrix']['matrix']):
+            print(f"{label:<12}" + ''.join(f"{count:>11}" for count in row))
+
+    if results['threshold_sweep']:
+        current = results['modes']['combined']['thresholds']
+        print(f"\n🎚️  Barrido de umbrales (evaluados: {current['min_confidence']}/{current['override_confidence']})")
+        print(f"{'mín':>6}{'prevalece':>11}{'acc':>8}{'ganancia':>10}{'red decide':>12}")
+        for row in results['threshold_sweep'][:limit]:
+            print(f"{row['min_confidence']:>6.2f}{row['override_confidence']:>11.2f}{row['accuracy']:>8.3f}"
+                  f"{row['gain_vs_traditional']:>+10.3f}{row['neural_override_rate']:>12.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluar precisión y latencia de los modos del analizador")
+    parser.add_argument('--corpus', type=str, default=None,
+                       help='Corpus etiquetado (JSON de pares o JSONL de valoraciones); por defecto se genera')
+    parser.add_argument('--samples', type=int, default=20,
+                       help='Muestras por clase del corpus generado (default: 20)')
+    parser.add_argument('--seed', type=int, default=1234,
+                       help='Semilla del corpus generado; distinta de la de entrenamiento (default: 1234)')
+    parser.add_argument('--model-path', type=str, default='models/algorithm_classifier',
+                       help='Modelo para los modos con red neuronal')
+    parser.add_argument('--min-confidence', type=float, default=NEURAL_MIN_CONFIDENCE,
+                       help=f'Confianza mínima de la red en el modo combinado (default: {NEURAL_MIN_CONFIDENCE})')
+    parser.add_argument('--override-confidence', type=float, default=NEURAL_OVERRIDE_CONFIDENCE,
+                       help=f'Confianza para que la red prevalezca (default: {NEURAL_OVERRIDE_CONFIDENCE})')
+    parser.add_argument('--output', '-o', type=str, default='evaluation_results.json',
+                       help='Archivo JSON de resultados')
+
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = load_labeled_corpus(args.corpus)
+    else:
+        corpus = AlgorithmDatasetGenerator().generate_training_dataset(args.samples, seed=args.seed)
+    print(f"📊 Corpus: {len(corpus)} fragmentos")
+
+    results = ModeEvaluation(corpus, model_path=args.model_path, min_confidence=args.min_confidence,
+                             override_confidence=args.override_confidence).run()
+    print_report(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados guardados en: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
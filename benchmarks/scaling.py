@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escalado del analizador
+Mide el tiempo de análisis frente al tamaño de la entrada en cada lenguaje
+y señala crecimientos superlineales
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Agregar el directorio raíz al path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.analyzer import AlgorithmAnalyzer
+from benchmarks.synthetic import SyntheticSourceGenerator
+
+
+LANGUAGES = ['python', 'javascript', 'java', 'cpp']
+DEFAULT_SIZES = [8, 16, 32, 64, 128, 256]
+DEFAULT_DEPTHS = [2, 4, 8, 16, 32]
+
+
+def growth_exponent(sizes: List[float], times: List[float]) -> float:
+    """Pendiente de la regresión log-log tiempo vs tamaño (1.0 = lineal)"""
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if s > 0 and t > 0]
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return 0.0
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return covariance / variance
+
+
+class ScalingBenchmark:
+    """Mide cómo crece el tiempo de cada etapa con el tamaño del código"""
+
+    def __init__(self, sizes: Optional[List[int]] = None, nesting_depth: int = 3,
+                 repeats: int = 3, max_seconds: float = 5.0, threshold: float = 1.25,
+                 sweep: str = 'functions'):
+        if sweep not in ('functions', 'depth'):
+            raise ValueError(f"Barrido no soportado: {sweep}")
+        self.sweep = sweep
+        self.sizes = sizes or (DEFAULT_SIZES if sweep == 'functions' else DEFAULT_DEPTHS)
+        self.nesting_depth = nesting_depth
+        self.repeats = repeats
+        self.max_seconds = max_seconds
+        self.threshold = threshold
+        self.generator = SyntheticSourceGenerator()
+        self.analyzer = AlgorithmAnalyzer(use_neural_network=False)
+
+    def run(self, languages: Optional[List[str]] = None) -> Dict:
+        """Ejecuta el barrido de tamaños para cada lenguaje"""
+        results = {}
+        for language in languages or LANGUAGES:
+            print(f"⏱️  {language}...")
+            results[language] = self._run_language(language)
+        return {
+            'metadata': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'sweep': self.sweep,
+                'nesting_depth': self.nesting_depth,
+                'threshold': self.threshold
+            },
+            'languages': results
+        }
+
+    def _run_language(self, language: str) -> Dict:
+        stages: Dict[str, Callable[[str], object]] = {
+            'parse': lambda code: self.analyzer.code_parser.parse(code, language),
+            'detect_patterns': lambda code: self.analyzer.pattern_detector.detect_patterns(code, language),
+            'total': lambda code: self.analyzer.analyze_code(code, language)
+        }
+        points = []
+        truncated = False
+
+        for size in self.sizes:
+            code = self._generate(language, size)
+            timings = {name: self._time(stage, code) for name, stage in stages.items()}
+            points.append({
+                self.sweep: size,
+                'lines': code.count('\n') + 1,
+                'bytes': len(code),
+                'seconds': timings
+            })
+            # Detener el barrido si la entrada ya es demasiado lenta
+            if timings['total'] > self.max_seconds:
+                truncated = True
+                break
+
+        # El tamaño se mide en líneas: los bytes crecen con la indentación
+        growth = {}
+        line_counts = [p['lines'] for p in points]
+        for name in stages:
+            exponent = growth_exponent(line_counts, [p['seconds'][name] for p in points])
+            growth[name] = {
+                'exponent': exponent,
+                'superlinear': exponent > self.threshold
+            }
+
+        return {'points': points, 'growth': growth, 'truncated': truncated}
+
+    def _generate(self, language: str, size: int) -> str:
+        """Genera la entrada para un punto del barrido"""
+        if self.sweep == 'functions':
+            return self.generator.generate(language, num_functions=size,
+                                           nesting_depth=self.nesting_depth)
+        # Barrido de profundidad: una sola función con exactamente `size` niveles
+        return self.generator.generate(language, num_functions=1, nesting_depth=size,
+                                       min_depth=size)
+
+    def _time(self, func: Callable[[str], object], code: str) -> float:
+        """Mediana del tiempo de ejecución sobre varias repeticiones"""
+        samples = []
+        for _ in range(self.repeats):
+            start = time.perf_counter()
+            func(code)
+            samples.append(time.perf_counter() - start)
+            if samples[-1] > self.max_seconds:
+                break
+        return statistics.median(samples)
+
+
+def print_report(results: Dict):
+    """Muestra los exponentes de crecimiento y las alertas"""
+    print(f"\n{'Lenguaje':<12}{'Etapa':<18}{'Exponente':>10}  Estado")
+    print("-" * 56)
+    for language, data in results['languages'].items():
+        for stage, growth in data['growth'].items():
+            status = "⚠️  superlineal" if growth['superlinear'] else "✅ lineal"
+            print(f"{language:<12}{stage:<18}{growth['exponent']:>10.2f}  {status}")
+        if data['truncated']:
+            print(f"{'':<12}(barrido truncado: se superó el tiempo máximo)")
+
+
+def plot_results(results: Dict, output_path: str) -> bool:
+    """Grafica tiempo vs tamaño en escala log-log (requiere matplotlib)"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️ matplotlib no disponible, se omite la gráfica")
+        return False
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    for language, data in results['languages'].items():
+        sizes = [p['lines'] for p in data['points']]
+        times = [p['seconds']['total'] for p in data['points']]
+        exponent = data['growth']['total']['exponent']
+        ax.loglog(sizes, times, marker='o', label=f"{language} (k={exponent:.2f})")
+
+    ax.set_xlabel('Tamaño de la entrada (líneas)')
+    ax.set_ylabel('Tiempo de análisis (s)')
+    ax.set_title('Escalado del analizador')
+    ax.grid(True, which='both', alpha=0.3)
+    ax.legend()
+    fig.savefig(output_path, dpi=120, bbox_inches='tight')
+    plt.close(fig)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escalado del analizador")
+    parser.add_argument('--languages', nargs='+', choices=LANGUAGES, default=LANGUAGES,
+                       help='Lenguajes a medir (default: todos)')
+    parser.add_argument('--sweep', choices=['functions', 'depth'], default='functions',
+                       help='Parámetro a barrer: funciones por archivo o profundidad de anidamiento')
+    parser.add_argument('--sizes', nargs='+', type=int,
+                       help='Valores del barrido (default según --sweep)')
+    parser.add_argument('--depth', type=int, default=3,
+                       help='Profundidad máxima de bucles anidados (default: 3)')
+    parser.add_argument('--repeats', type=int, default=3,
+                       help='Repeticiones por punto (default: 3)')
+    parser.add_argument('--max-seconds', type=float, default=5.0,
+                       help='Tiempo máximo por punto antes de truncar el barrido')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                       help='Exponente a partir del cual se considera superlineal')
+    parser.add_argument('--output', '-o', type=str, default='scaling_results.json',
+                       help='Archivo JSON de resultados')
+    parser.add_argument('--plot', type=str,
+                       help='Ruta de la gráfica PNG (opcional)')
+
+    args = parser.parse_args()
+
+    benchmark = ScalingBenchmark(sizes=args.sizes, nesting_depth=args.depth,
+                                 repeats=args.repeats, max_seconds=args.max_seconds,
+                                 threshold=args.threshold, sweep=args.sweep)
+    results = benchmark.run(args.languages)
+    print_report(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Resultados guardados en: {args.output}")
+
+    if args.plot and plot_results(results, args.plot):
+        print(f"📈 Gráfica guardada en: {args.plot}")
+
+    superlinear = [
+        f"{language}.{stage}"
+        for language, data in results['languages'].items()
+        for stage, growth in data['growth'].items()
+        if growth['superlinear']
+    ]
+    if superlinear:
+        print(f"\n⚠️ Crecimiento superlineal en: {', '.join(superlinear)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
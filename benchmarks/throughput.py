@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latencia y throughput del analizador
+Mide cada etapa sobre un corpus generado con AlgorithmDatasetGenerator
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Agregar el directorio raíz al path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from core.analyzer import AlgorithmAnalyzer
+from ml.dataset_generator import AlgorithmDatasetGenerator
+
+
+# Métricas comparadas contra la ejecución anterior y su sentido de mejora
+COMPARED_METRICS = {
+    'latency_ms.p50': 'lower',
+    'latency_ms.p95': 'lower',
+    'throughput_per_sec': 'higher'
+}
+
+
+def load_corpus(samples_per_class: int = 20, seed: int = 42) -> List[Tuple[str, str]]:
+    """Genera un corpus reproducible de fragmentos etiquetados"""
+    random.seed(seed)
+    generator = AlgorithmDatasetGenerator()
+    return generator.generate_training_dataset(samples_per_class=samples_per_class)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Percentil con interpolación lineal sobre valores ordenados"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * p / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+class ThroughputBenchmark:
+    """Mide latencia por fragmento y throughput por lotes de cada etapa"""
+
+    def __init__(self, corpus: List[Tuple[str, str]], model_path: Optional[str] = None,
+                 repeats: int = 3, warmup: int = 1):
+        self.corpus = corpus
+        self.model_path = model_path
+        self.repeats = repeats
+        self.warmup = warmup
+
+    def run(self) -> Dict:
+        """Ejecuta todas las etapas y retorna los resultados"""
+        stages = {
+            'traditional_cold': self._measure_stage(
+                AlgorithmAnalyzer(use_neural_network=False)
+            ),
+            'traditional_cached': self._measure_stage(
+                AlgorithmAnalyzer(use_neural_network=False, cache_size=len(self.corpus)),
+                prime_cache=True
+            )
+        }
+
+        neural_analyzer, reason = self._create_neural_analyzer(cache_size=0)
+        if neural_analyzer is None:
+            stages['neural_cold'] = {'skipped': reason}
+            stages['neural_cached'] = {'skipped': reason}
+        else:
+            stages['neural_cold'] = self._measure_stage(neural_analyzer)
+            cached_analyzer, _ = self._create_neural_analyzer(cache_size=len(self.corpus))
+            stages['neural_cached'] = self._measure_stage(cached_analyzer, prime_cache=True)
+
+        return {
+            'metadata': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'corpus_size': len(self.corpus),
+                'repeats': self.repeats
+            },
+            'stages': stages
+        }
+
+    def _create_neural_analyzer(self, cache_size: int) -> Tuple[Optional[AlgorithmAnalyzer], str]:
+        """Crea un analizador con red neuronal si el modelo está disponible"""
+        if not self.model_path:
+            return None, 'sin ruta de modelo'
+        if not Path(f"{self.model_path}_metadata.json").exists():
+            return None, f'modelo no encontrado: {self.model_path}'
+
+        analyzer = AlgorithmAnalyzer(use_neural_network=True, model_path=self.model_path,
+                                     cache_size=cache_size)
+        if analyzer.neural_classifier is None:
+            return None, 'no se pudo cargar el modelo'
+        return analyzer, ''
+
+    def _measure_stage(self, analyzer: AlgorithmAnalyzer, prime_cache: bool = False) -> Dict:
+        """Mide la latencia individual y el throughput de un analizador"""
+        codes = [code for code, _ in self.corpus]
+
+        for _ in range(self.warmup):
+            for code in codes[:10]:
+                analyzer.analyze_code(code, 'python')
+
+        if prime_cache:
+            for code in codes:
+                analyzer.analyze_code(code, 'python')
+
+        latencies = []
+        batch_times = []
+        for _ in range(self.repeats):
+            batch_start = time.perf_counter()
+            for code in codes:
+                start = time.perf_counter()
+                analyzer.analyze_code(code, 'python')
+                latencies.append((time.perf_counter() - start) * 1000.0)
+            batch_times.append(time.perf_counter() - batch_start)
+
+        latencies.sort()
+        best_batch = min(batch_times)
+        return {
+            'latency_ms': {
+                'mean': sum(latencies) / len(latencies),
+                'p50': percentile(latencies, 50),
+                'p90': percentile(latencies, 90),
+                'p95': percentile(latencies, 95),
+                'p99': percentile(latencies, 99),
+                'max': latencies[-1]
+            },
+            'throughput_per_sec': len(codes) / best_batch if best_batch > 0 else 0.0,
+            'samples': len(latencies)
+        }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compara dos ejecuciones y retorna las regresiones detectadas
+
+    Args:
+        current: Resultados actuales
+        baseline: Resultados de la ejecución anterior
+        threshold: Variación relativa tolerada (0.1 = 10%)
+
+    Returns:
+        Lista de descripciones de regresiones
+    """
+    regressions = []
+
+    for stage, metrics in current.get('stages', {}).items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous or 'skipped' in metrics or 'skipped' in previous:
+            continue
+
+        for metric, direction in COMPARED_METRICS.items():
+            now = _get_metric(metrics, metric)
+            before = _get_metric(previous, metric)
+            if not before:
+                continue
+
+            change = (now - before) / before
+            if (direction == 'lower' and change > threshold) or \
+               (direction == 'higher' and -change > threshold):
+                regressions.append(
+                    f"{stage}.{metric}: {before:.4f} → {now:.4f} ({change:+.1%})"
+                )
+
+    return regressions
+
+
+def _get_metric(stage_results: Dict, metric: str) -> float:
+    """Obtiene una métrica anidada con notación de puntos"""
+    value = stage_results
+    for key in metric.split('.'):
+        value = value.get(key, {}) if isinstance(value, dict) else {}
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def print_results(results: Dict):
+    """Muestra una tabla resumen de los resultados"""
+    print(f"\n{'Etapa':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'snip/s':>12}")
+    print("-" * 64)
+    for stage, metrics in results['stages'].items():
+        if 'skipped' in metrics:
+            print(f"{stage:<22}  omitida: {metrics['skipped']}")
+            continue
+        latency = metrics['latency_ms']
+        print(f"{stage:<22}{latency['p50']:>10.3f}{latency['p95']:>10.3f}"
+              f"{latency['p99']:>10.3f}{metrics['throughput_per_sec']:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de latencia y throughput del analizador")
+    parser.add_argument('--samples', type=int, default=20,
+                       help='Muestras por clase del corpus (default: 20)')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Semilla del corpus (default: 42)')
+    parser.add_argument('--repeats', type=int, default=3,
+                       help='Repeticiones por etapa (default: 3)')
+    parser.add_argument('--model-path', type=str, default='models/algorithm_classifier',
+                       help='Modelo para las etapas con red neuronal')
+    parser.add_argument('--output', '-o', type=str, default='benchmark_results.json',
+                       help='Archivo JSON de resultados')
+    parser.add_argument('--baseline', type=str,
+                       help='Resultados anteriores para comparar')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                       help='Regresión relativa tolerada (default: 0.10)')
+
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.samples, args.seed)
+    print(f"📊 Corpus: {len(corpus)} fragmentos")
+
+    benchmark = ThroughputBenchmark(corpus, model_path=args.model_path, repeats=args.repeats)
+    results = benchmark.run()
+    results['metadata']['seed'] = args.seed
+    print_results(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Resultados guardados en: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regresiones detectadas (umbral {args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  • {regression}")
+            sys.exit(1)
+        print(f"\n✅ Sin regresiones respecto a {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
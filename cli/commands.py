@@ -12,8 +12,8 @@ from core.analyzer import AlgorithmAnalyzer
 class CLIHandler:
     """Manejador de la interfaz de línea de comandos"""
     
-    def __init__(self):
-        self.analyzer = AlgorithmAnalyzer()
+    def __init__(self, profile_dir: Optional[str] = None):
+        self.analyzer = AlgorithmAnalyzer(profile_dir=profile_dir)
         
     def analyze_file(self, file_path: str, language: str = 'python', 
                     verbose: bool = False, output_file: Optional[str] = None):
@@ -66,6 +66,13 @@ class CLIHandler:
                     output.append(f"• {pattern['type']}: {pattern['description']}")
                 output.append("")
             
+            if result.get('performance_issues'):
+                output.append("⚠️  PROBLEMAS DE RENDIMIENTO:")
+                for issue in result['performance_issues']:
+                    output.append(f"• Línea {issue['line']}: {issue['message']} ({issue['total_cost']})")
+                    output.append(f"  💡 {issue['suggestion']}")
+                output.append("")
+            
             if verbose and result.get('complexity'):
                 complexity = result['complexity']
                 output.append("🔬 DETALLES DE COMPLEJIDAD:")
@@ -73,6 +80,15 @@ class CLIHandler:
                 output.append(f"• Complejidad total: {complexity.get('total_complexity', 'O(1)')}")
                 output.append("")
             
+            if result.get('profile'):
+                profile = result['profile']
+                output.append("⏱️  PERFIL DE EJECUCIÓN:")
+                output.append(f"• Estadísticas (pstats): {profile['pstats']}")
+                output.append(f"• Pilas colapsadas (flamegraph): {profile['collapsed']}")
+                if verbose and self.analyzer.profiler:
+                    output.append(self.analyzer.profiler.summary(profile['pstats']))
+                output.append("")
+            
             result_text = "\n".join(output)
             print(result_text)
             
@@ -109,6 +125,7 @@ Opciones:
   --language, -l    Lenguaje del código (python, javascript, java, cpp)
   --verbose, -v     Mostrar información detallada
   --output, -o      Archivo de salida para resultados
+  --profile [DIR]   Perfilar el análisis con cProfile (default: profiles/)
 
 Ejemplos:
   python main.py --file bubble_sort.py --language python --verbose
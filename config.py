@@ -23,7 +23,10 @@ MAX_PATTERNS_SHOW = 5   # Máximo número de patrones a mostrar
 
 # Configuración de archivos
 MODEL_PATH = "models/algorithm_classifier"
+MODEL_RELOAD_INTERVAL = 30  # Segundos entre comprobaciones de un modelo nuevo
 DATASET_PATH = "ml/dataset_generator.py"
+FEEDBACK_PATH = "data/feedback.jsonl"  # Valoraciones de los usuarios del bot
+IO_CATALOG_PATH = os.getenv('IO_CATALOG_PATH')  # Firmas de E/S adicionales (JSON), opcional
 
 # Configuración de respuestas
 RESPONSE_TEMPLATES = {
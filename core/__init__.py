@@ -4,6 +4,8 @@ Módulo core - Núcleo del analizador de algoritmos
 
 from .analyzer import AlgorithmAnalyzer
 from .complexity import ComplexityCalculator
+from .io_calls import IOCatalog
 from .patterns import PatternDetector
+from .symbolic import Complexity
 
-__all__ = ['AlgorithmAnalyzer', 'ComplexityCalculator', 'PatternDetector'] 
\ No newline at end of file
+__all__ = ['AlgorithmAnalyzer', 'ComplexityCalculator', 'PatternDetector', 'Complexity', 'IOCatalog'] 
\ No newline at end of file
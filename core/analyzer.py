@@ -4,34 +4,115 @@ Responsable de coordinar el análisis de complejidad temporal
 """
 
 import ast
+import copy
+import hashlib
 import re
+from collections import Counter, OrderedDict
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
 from .complexity import ComplexityCalculator
-from .patterns import PatternDetector
+from .io_calls import IOCatalog
+from .patterns import PatternDetector, PatternKind, PatternTable
 from utils.parser import CodeParser
 
 
+# Umbrales de confianza de la red neuronal por defecto (ver benchmarks/evaluation.py)
+NEURAL_MIN_CONFIDENCE = 0.7
+NEURAL_OVERRIDE_CONFIDENCE = 0.9
+
+# Políticas de uso de la red: siempre, o solo cuando el análisis tradicional no es concluyente
+NEURAL_POLICIES = ('always', 'cascade')
+
+
+def combine_predictions(traditional: str, neural: Optional[str], confidence: float,
+                        min_confidence: float = NEURAL_MIN_CONFIDENCE,
+                        override_confidence: float = NEURAL_OVERRIDE_CONFIDENCE) -> str:
+    """
+    Combina predicciones tradicionales y de red neuronal
+    
+    Por debajo de `min_confidence` se ignora la red; por encima de
+    `override_confidence` su predicción prevalece; entre ambos, en caso de
+    conflicto se mantiene la tradicional.
+    """
+    if not neural or confidence < min_confidence:
+        # Si la red neuronal no está disponible o tiene baja confianza,
+        # usar predicción tradicional
+        return traditional
+    
+    # Si la confianza es alta, usar predicción de red neuronal
+    if confidence > override_confidence:
+        return neural
+    
+    # Si la confianza es media, en caso de conflicto se usa la predicción tradicional
+    return traditional
+
+
 class AlgorithmAnalyzer:
     """Analizador principal de algoritmos para calcular notación asintótica"""
     
-    def __init__(self, use_neural_network: bool = True, model_path: Optional[str] = None):
+    def __init__(self, use_neural_network: bool = True, model_path: Optional[str] = None,
+                 profile_dir: Optional[str] = None, cache_size: int = 0,
+                 neural_min_confidence: float = NEURAL_MIN_CONFIDENCE,
+                 neural_override_confidence: float = NEURAL_OVERRIDE_CONFIDENCE,
+                 neural_policy: str = 'always', max_patterns: int = 20,
+                 io_catalog: Optional[str] = None):
+        if neural_policy not in NEURAL_POLICIES:
+            raise ValueError(f"Política de red neuronal no soportada: {neural_policy}")
         self.complexity_calc = ComplexityCalculator()
-        self.pattern_detector = PatternDetector()
+        # Catálogo JSON de llamadas de E/S que se añade al predeterminado (ver core/io_calls.py)
+        self.pattern_detector = PatternDetector(IOCatalog.from_file(io_catalog) if io_catalog else None)
         self.code_parser = CodeParser()
         self.use_neural_network = use_neural_network
-        self.neural_classifier = None
+        # Handle del registro de modelos (compartido y recargable) o clasificador propio
+        self.model_handle = None
+        self._neural_classifier = None
+        self.profiler = None
+        
+        # Confianza mínima para considerar la red y para que prevalezca sobre el análisis tradicional
+        self.neural_min_confidence = neural_min_confidence
+        self.neural_override_confidence = neural_override_confidence
+        
+        # En 'cascade' la red solo se consulta si el análisis tradicional es dudoso
+        self.neural_policy = neural_policy
+        
+        # Patrones más significativos que se conservan en el resultado (los totales se cuentan todos)
+        self.max_patterns = max_patterns
+        self.neural_stats = {'invoked': 0, 'skipped': 0, 'reasons': Counter()}
+        
+        # Caché LRU de resultados por (lenguaje, hash del código); 0 la desactiva
+        self.cache_size = cache_size
+        self._result_cache: OrderedDict = OrderedDict()
+        
+        if profile_dir:
+            self.enable_profiling(profile_dir)
         
         # Cargar modelo de red neuronal si está disponible
         if use_neural_network and model_path:
             try:
-                from ml.neural_network import AlgorithmClassifier
-                self.neural_classifier = AlgorithmClassifier(model_path)
+                self.model_handle = self._shared_model(model_path)
                 print("🧠 Modelo de red neuronal cargado exitosamente")
             except Exception as e:
                 print(f"⚠️ No se pudo cargar el modelo de red neuronal: {e}")
                 self.use_neural_network = False
+    
+    @property
+    def neural_classifier(self):
+        """Clasificador vigente: la última versión publicada en el registro de modelos"""
+        if self.model_handle is not None:
+            return self.model_handle.classifier
+        return self._neural_classifier
+    
+    @neural_classifier.setter
+    def neural_classifier(self, classifier):
+        self.model_handle = None
+        self._neural_classifier = classifier
+    
+    @staticmethod
+    def _shared_model(model_path: str):
+        """Obtiene el modelo del registro del proceso: se carga una vez para todos los analizadores"""
+        from ml.model_registry import get_registry
+        return get_registry().get(model_path)
         
     def analyze_code(self, code: str, language: str = 'python') -> Dict:
         """
@@ -44,26 +125,73 @@ class AlgorithmAnalyzer:
         Returns:
             Diccionario con resultados del análisis
         """
+        cache_key = None
+        # Al perfilar se ejecuta siempre el análisis: un acierto de caché no
+        # mediría nada y devolvería los perfiles de otra ejecución
+        if self.cache_size > 0 and self.profiler is None:
+            cache_key = self._cache_key(code, language)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                # Copia profunda: quien modifique el resultado no altera la caché
+                return copy.deepcopy(cached)
+        
+        if self.profiler is None:
+            result = self._run_analysis(code, language)
+        else:
+            result, profile_paths = self.profiler.profile(self._run_analysis, code, language)
+            result['profile'] = profile_paths
+        
+        if cache_key is not None and result.get('success'):
+            self._result_cache[cache_key] = copy.deepcopy(result)
+            if len(self._result_cache) > self.cache_size:
+                self._result_cache.popitem(last=False)
+        
+        return result
+    
+    def _cache_key(self, code: str, language: str) -> Tuple[str, str, int]:
+        """Genera la clave de caché para un fragmento de código y la versión del modelo"""
+        version = self.model_handle.version if self.model_handle is not None else 0
+        return language, hashlib.sha1(code.encode('utf-8')).hexdigest(), version
+    
+    def clear_cache(self):
+        """Vacía la caché de resultados"""
+        self._result_cache.clear()
+    
+    def _run_analysis(self, code: str, language: str) -> Dict:
+        """Ejecuta las etapas del análisis sobre el código"""
         try:
             # Parsear el código según el lenguaje
             parsed_code = self.code_parser.parse(code, language)
             
-            # Detectar patrones de complejidad
-            patterns = self.pattern_detector.detect_patterns(code, language)
+            # Detectar patrones (sin repeticiones)
+            all_patterns = self.pattern_detector.detect_patterns(code, language)
             
-            # Calcular complejidad usando métodos tradicionales
-            complexity = self.complexity_calc.calculate_complexity(patterns)
+            # Calcular complejidad usando métodos tradicionales, con todos los patrones
+            complexity = self.complexity_calc.calculate_complexity(all_patterns)
+            
+            # El resultado solo conserva los más costosos
+            patterns = all_patterns.top(self.max_patterns)
             traditional_notation = self._generate_notation(complexity)
             
             # Predicción de la red neuronal (si está disponible)
             neural_notation = None
             neural_confidence = 0.0
             
-            if self.use_neural_network and self.neural_classifier:
-                try:
-                    neural_notation, neural_confidence = self.neural_classifier.predict(code)
-                except Exception as e:
-                    print(f"⚠️ Error en predicción de red neuronal: {e}")
+            # Se lee una vez: una recarga en caliente no afecta a este análisis
+            classifier = self.neural_classifier
+            neural_reason = None
+            if self.use_neural_network and classifier:
+                neural_reason = self._neural_reason(all_patterns, complexity)
+                if neural_reason is None:
+                    self.neural_stats['skipped'] += 1
+                else:
+                    self.neural_stats['invoked'] += 1
+                    self.neural_stats['reasons'][neural_reason] += 1
+                    try:
+                        neural_notation, neural_confidence = classifier.predict(code)
+                    except Exception as e:
+                        print(f"⚠️ Error en predicción de red neuronal: {e}")
             
             # Combinar resultados
             final_notation = self._combine_predictions(
@@ -73,12 +201,16 @@ class AlgorithmAnalyzer:
             return {
                 'success': True,
                 'language': language,
-                'patterns': patterns,
+                'patterns': list(patterns.as_dicts()),
+                'pattern_counts': all_patterns.counts(),
+                'pattern_total': len(all_patterns),
+                'performance_issues': [issue.to_dict() for issue in sorted(all_patterns.issues, key=lambda i: i.line)],
                 'complexity': complexity,
                 'notation': final_notation,
                 'traditional_notation': traditional_notation,
                 'neural_notation': neural_notation,
                 'neural_confidence': neural_confidence,
+                'neural_reason': neural_reason,
                 'explanation': self._generate_explanation(
                     patterns, complexity, final_notation, 
                     traditional_notation, neural_notation, neural_confidence
@@ -92,6 +224,52 @@ class AlgorithmAnalyzer:
                 'language': language
             }
     
+    def _neural_reason(self, patterns: PatternTable, complexity: Dict) -> Optional[str]:
+        """
+        Motivo para consultar la red, o None si el análisis tradicional es concluyente
+        
+        Con la política 'cascade' se consideran concluyentes los resultados
+        obtenidos del AST con bucles for simples o un único par de bucles
+        anidados; la recursión genérica, los while (posibles búsquedas
+        logarítmicas), el fallback por expresiones regulares o la ausencia de
+        patrones se delegan a la red.
+        """
+        if self.neural_policy == 'always':
+            return 'always'
+        if not patterns:
+            return 'no_patterns'
+        if patterns.contains('source', 'regex'):
+            return 'regex_fallback'
+        if not complexity.get('terms'):
+            return 'undetermined'
+        
+        kinds = Counter(patterns.kinds())
+        if kinds[PatternKind.RECURSION]:
+            return 'recursion'
+        if kinds[PatternKind.NESTED_LOOP] > 1:
+            # Tres niveles o varios pares de bucles: el anidamiento real es incierto
+            return 'deep_nesting'
+        if patterns.contains('construct', 'while'):
+            return 'while_loop'
+        if set(kinds) - {PatternKind.SIMPLE_LOOP, PatternKind.NESTED_LOOP}:
+            return 'other_patterns'
+        return None
+    
+    def get_neural_stats(self) -> Dict:
+        """Contadores de consultas a la red y de consultas evitadas por la cascada"""
+        total = self.neural_stats['invoked'] + self.neural_stats['skipped']
+        return {
+            'policy': self.neural_policy,
+            'invoked': self.neural_stats['invoked'],
+            'skipped': self.neural_stats['skipped'],
+            'skip_rate': self.neural_stats['skipped'] / total if total else 0.0,
+            'reasons': dict(self.neural_stats['reasons'])
+        }
+    
+    def reset_neural_stats(self):
+        """Reinicia los contadores de la red"""
+        self.neural_stats = {'invoked': 0, 'skipped': 0, 'reasons': Counter()}
+    
     def analyze_file(self, file_path: str, language: str = 'python') -> Dict:
         """
         Analiza un archivo de código fuente
@@ -124,22 +302,8 @@ class AlgorithmAnalyzer:
     def _combine_predictions(self, traditional: str, neural: Optional[str], 
                            confidence: float) -> str:
         """Combina predicciones tradicionales y de red neuronal"""
-        if not neural or confidence < 0.7:
-            # Si la red neuronal no está disponible o tiene baja confianza,
-            # usar predicción tradicional
-            return traditional
-        
-        # Si la confianza es alta, usar predicción de red neuronal
-        if confidence > 0.9:
-            return neural
-        
-        # Si la confianza es media, verificar si coinciden
-        if traditional == neural:
-            return traditional
-        else:
-            # En caso de conflicto, usar la predicción tradicional
-            # pero marcar la discrepancia
-            return traditional
+        return combine_predictions(traditional, neural, confidence,
+                                   self.neural_min_confidence, self.neural_override_confidence)
     
     def _generate_notation(self, complexity: Dict) -> str:
         """Genera la notación asintótica basada en la complejidad calculada"""
@@ -159,7 +323,7 @@ class AlgorithmAnalyzer:
         
         return notation_map.get(dominant_term, dominant_term) or 'O(1)'
     
-    def _generate_explanation(self, patterns: List, complexity: Dict, 
+    def _generate_explanation(self, patterns: PatternTable, complexity: Dict, 
                             final_notation: str, traditional_notation: str,
                             neural_notation: Optional[str], neural_confidence: float) -> str:
         """Genera una explicación detallada del análisis"""
@@ -172,7 +336,7 @@ class AlgorithmAnalyzer:
         if patterns:
             explanation += "• Patrones detectados:\n"
             for pattern in patterns:
-                explanation += f"  - {pattern['type']}: {pattern['description']}\n"
+                explanation += f"  - {pattern.kind.value}: {pattern.description}\n"
         else:
             explanation += "• No se detectaron patrones específicos\n"
         
@@ -193,9 +357,11 @@ class AlgorithmAnalyzer:
             explanation += "\n"
         
         # Nota sobre el método final
-        if self.use_neural_network and neural_notation and neural_confidence > 0.7:
+        if self.use_neural_network and neural_notation and neural_confidence >= self.neural_min_confidence:
             if traditional_notation == neural_notation:
                 explanation += "✅ RESULTADO FINAL: Ambos métodos coinciden en la predicción.\n"
+            elif final_notation == neural_notation:
+                explanation += "🧠 RESULTADO FINAL: Basado en la red neuronal (confianza alta).\n"
             else:
                 explanation += "🤖 RESULTADO FINAL: Basado en análisis tradicional (red neuronal en conflicto).\n"
         else:
@@ -223,8 +389,7 @@ class AlgorithmAnalyzer:
     def enable_neural_network(self, model_path: str):
         """Habilita el uso de la red neuronal"""
         try:
-            from ml.neural_network import AlgorithmClassifier
-            self.neural_classifier = AlgorithmClassifier(model_path)
+            self.model_handle = self._shared_model(model_path)
             self.use_neural_network = True
             print("🧠 Red neuronal habilitada exitosamente")
         except Exception as e:
@@ -235,4 +400,13 @@ class AlgorithmAnalyzer:
         """Deshabilita el uso de la red neuronal"""
         self.use_neural_network = False
         self.neural_classifier = None
-        print("📊 Red neuronal deshabilitada, usando solo análisis tradicional") 
\ No newline at end of file
+        print("📊 Red neuronal deshabilitada, usando solo análisis tradicional")
+    
+    def enable_profiling(self, output_dir: str = 'profiles'):
+        """Habilita el perfilado con cProfile de cada análisis"""
+        from utils.profiler import AnalysisProfiler
+        self.profiler = AnalysisProfiler(output_dir)
+    
+    def disable_profiling(self):
+        """Deshabilita el perfilado"""
+        self.profiler = None 
\ No newline at end of file
@@ -0,0 +1,256 @@
+"""
+Detector de antipatrones de rendimiento en bucles de Python
+Reglas que se evalúan durante el mismo recorrido del AST que detecta los
+patrones: cada nodo dentro de un bucle se pasa solo a las reglas que
+registran su tipo de nodo
+"""
+
+import ast
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple
+
+from .call_costs import call_cost
+from .loop_bounds import loop_cost
+from .symbolic import Complexity
+
+
+# Métodos que modifican su receptor
+MUTATING_METHODS = {
+    'append', 'extend', 'insert', 'pop', 'remove', 'clear', 'sort', 'reverse',
+    'add', 'discard', 'update', 'setdefault', 'appendleft', 'popleft',
+}
+
+
+def _names(node: ast.AST) -> Set[str]:
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+
+
+class PerformanceIssue:
+    """Antipatrón encontrado: dónde está, cuánto cuesta y cómo evitarlo"""
+
+    __slots__ = ('rule', 'line', 'loop_line', 'cost', 'total_cost', 'message', 'suggestion', 'improved_cost')
+
+    def __init__(self, rule: str, line: int, loop_line: int, cost: str, total_cost: str,
+                 message: str, suggestion: str, improved_cost: Optional[str] = None):
+        self.rule = rule
+        self.line = line
+        # Línea del bucle más interior que la contiene
+        self.loop_line = loop_line
+        # Coste de la operación en cada iteración y multiplicado por los bucles
+        self.cost = cost
+        self.total_cost = total_cost
+        self.message = message
+        self.suggestion = suggestion
+        # Coste estimado si se aplica la sugerencia, cuando se puede calcular
+        self.improved_cost = improved_cost
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"PerformanceIssue({self.rule}, line={self.line}, {self.total_cost})"
+
+
+class LoopContext:
+    """Datos de un bucle que comparten todas las reglas; se calculan una vez por bucle"""
+
+    __slots__ = ('node', 'iterations', 'variables', 'modified')
+
+    def __init__(self, node: ast.AST, parent: Optional['LoopContext'], scope: ast.AST):
+        self.node = node
+        outer = parent.iterations if parent else Complexity.constant()
+        self.iterations = outer * loop_cost(node, scope)
+        # Variables que cambian en cada vuelta: las del bucle y las que se asignan o mutan dentro
+        self.variables = set(parent.variables) if parent else set()
+        if isinstance(node, ast.For):
+            self.variables |= _names(node.target)
+        self.modified = set(self.variables)
+        for child in ast.walk(node):
+            if isinstance(child, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+                targets = child.targets if isinstance(child, ast.Assign) else [child.target]
+                for target in targets:
+                    self.modified |= _names(target)
+            elif isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute) and \
+                    isinstance(child.func.value, ast.Name) and child.func.attr in MUTATING_METHODS:
+                self.modified.add(child.func.value.id)
+
+    def is_invariant(self, node: ast.AST) -> bool:
+        """La expresión da lo mismo en todas las vueltas (depende de variables que no cambian)"""
+        names = _names(node)
+        return bool(names) and not names & self.modified
+
+
+class PerformanceRule(ABC):
+    """
+    Regla del detector
+
+    Las subclases declaran los tipos de nodo que examinan y devuelven, si el
+    nodo es un antipatrón, su coste por iteración, el mensaje y la sugerencia.
+    """
+
+    rule_id = ''
+    node_types: Tuple[type, ...] = ()
+
+    @abstractmethod
+    def check(self, node: ast.AST, loop: LoopContext,
+              types: Dict[str, str]) -> Optional[Tuple[Complexity, str, str]]:
+        """Coste por iteración, mensaje y sugerencia si el nodo es un antipatrón; None si no"""
+
+
+class ListMembershipRule(PerformanceRule):
+    rule_id = 'list_membership'
+    node_types = (ast.Compare,)
+    _CONTAINERS = {
+        'in:list': 'lista', 'in:tuple': 'tupla', 'in:deque': 'deque',
+        'in:*': 'secuencia de tipo no inferido (se supone una lista)',
+    }
+
+    def check(self, node, loop, types):
+        known = call_cost(node, types)
+        if known is None or known[0] not in self._CONTAINERS:
+            return None
+        return (known[1], f"Búsqueda `in` en una {self._CONTAINERS[known[0]]}: recorre la secuencia en cada iteración",
+                "Convierte la secuencia en un set antes del bucle")
+
+
+class RepeatedSortRule(PerformanceRule):
+    rule_id = 'repeated_sort'
+    node_types = (ast.Call,)
+
+    def check(self, node, loop, types):
+        known = call_cost(node, types)
+        if known is None or known[0] not in ('sorted', 'list.sort', '*.sort'):
+            return None
+        return (known[1], "Ordenación dentro de un bucle",
+                "Ordena una sola vez fuera del bucle, o usa bisect.insort / heapq para mantener el orden")
+
+
+class InvariantCallRule(PerformanceRule):
+    rule_id = 'invariant_call'
+    node_types = (ast.Call,)
+    _FUNCTIONS = ('list', 'tuple', 'set', 'dict', 'min', 'max', 'sum')
+
+    def check(self, node, loop, types):
+        if not isinstance(node.func, ast.Name) or node.func.id not in self._FUNCTIONS or not node.args:
+            return None
+        if not all(loop.is_invariant(arg) for arg in node.args):
+            return None
+        known = call_cost(node, types)
+        if known is None or known[1] is Complexity.constant():
+            # Llamadas O(1) (max(a, b), set()...): repetirlas no cuesta nada
+            return None
+        cost = known[1]
+        action = 'copia' if node.func.id in ('list', 'tuple', 'set', 'dict') else 'calcula'
+        return (cost, f"`{node.func.id}()` {action} el mismo valor en cada iteración",
+                "Calcúlalo una vez antes del bucle y guárdalo en una variable")
+
+
+class StringConcatRule(PerformanceRule):
+    rule_id = 'string_concat'
+    node_types = (ast.AugAssign,)
+
+    def check(self, node, loop, types):
+        if not isinstance(node.op, ast.Add) or not isinstance(node.target, ast.Name):
+            return None
+        value = node.value
+        is_text = types.get(node.target.id) == 'str' or isinstance(value, ast.JoinedStr) or \
+            (isinstance(value, ast.Constant) and isinstance(value.value, str)) or \
+            (isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == 'str')
+        if not is_text:
+            return None
+        return (Complexity.poly('n'), "Concatenación de cadenas con += dentro de un bucle: copia la cadena cada vez",
+                "Acumula las partes en una lista y únelas con ''.join() al final")
+
+
+class PopFrontRule(PerformanceRule):
+    rule_id = 'pop_front'
+    node_types = (ast.Call,)
+
+    def check(self, node, loop, types):
+        func = node.func
+        if not isinstance(func, ast.Attribute) or not node.args:
+            return None
+        first = node.args[0]
+        at_front = isinstance(first, ast.Constant) and first.value == 0
+        if not at_front or func.attr not in ('pop', 'insert'):
+            return None
+        # Solo listas (o receptores de tipo desconocido): dict.pop(0) o deque no desplazan nada
+        type_name = types.get(func.value.id) if isinstance(func.value, ast.Name) else None
+        if type_name not in (None, 'list'):
+            return None
+        container = 'una lista' if type_name else 'una secuencia de tipo no inferido (se supone una lista)'
+        return (Complexity.poly('n'), f"`{func.attr}(0)` en {container} desplaza todos los elementos",
+                "Usa collections.deque con popleft() / appendleft()")
+
+
+class RegexCompileRule(PerformanceRule):
+    rule_id = 'regex_compile'
+    node_types = (ast.Call,)
+
+    def check(self, node, loop, types):
+        func = node.func
+        if not (isinstance(func, ast.Attribute) and func.attr == 'compile' and
+                isinstance(func.value, ast.Name) and func.value.id == 're'):
+            return None
+        if node.args and not isinstance(node.args[0], ast.Constant) and not loop.is_invariant(node.args[0]):
+            return None
+        return (Complexity.constant(), "Expresión regular compilada en cada iteración",
+                "Compílala una vez fuera del bucle (por ejemplo, como constante del módulo)")
+
+
+class QuadraticSliceRule(PerformanceRule):
+    rule_id = 'quadratic_slicing'
+    node_types = (ast.Subscript,)
+
+    def check(self, node, loop, types):
+        if not isinstance(node.slice, ast.Slice) or not isinstance(node.ctx, ast.Load):
+            return None
+        bounds = [b for b in (node.slice.lower, node.slice.upper) if b is not None]
+        # Solo las porciones que cambian con el bucle: arr[i:], arr[:i]
+        if not bounds or not any(_names(b) & loop.variables for b in bounds):
+            return None
+        known = call_cost(node, types)
+        if known is None:
+            # s[i:i + 2]: ventana de ancho constante, copia O(1)
+            return None
+        return (known[1], "Porción de una secuencia dentro del bucle: copia los elementos en cada iteración",
+                "Recorre con índices, itertools.islice o memoryview en lugar de copiar")
+
+
+DEFAULT_RULES = (
+    ListMembershipRule, RepeatedSortRule, InvariantCallRule, StringConcatRule,
+    PopFrontRule, RegexCompileRule, QuadraticSliceRule,
+)
+
+
+class PerformanceRuleSet:
+    """Conjunto de reglas indexado por tipo de nodo"""
+
+    def __init__(self, rules: Optional[List[PerformanceRule]] = None):
+        self.rules = list(rules) if rules is not None else [rule() for rule in DEFAULT_RULES]
+        self._dispatch: Dict[type, List[PerformanceRule]] = {}
+        for rule in self.rules:
+            for node_type in rule.node_types:
+                self._dispatch.setdefault(node_type, []).append(rule)
+
+    def loop_context(self, node: ast.AST, parent: Optional[LoopContext], scope: ast.AST) -> LoopContext:
+        return LoopContext(node, parent, scope)
+
+    def check(self, node: ast.AST, loop: LoopContext, types: Dict[str, str]) -> List[PerformanceIssue]:
+        """Evalúa las reglas que corresponden al tipo del nodo"""
+        rules = self._dispatch.get(type(node))
+        if not rules:
+            return []
+        issues = []
+        for rule in rules:
+            found = rule.check(node, loop, types)
+            if found is None:
+                continue
+            cost, message, suggestion = found
+            issues.append(PerformanceIssue(
+                rule.rule_id, node.lineno, loop.node.lineno, cost.notation,
+                (loop.iterations * cost).notation, message, suggestion
+            ))
+            # Un nodo se informa una sola vez, con la primera regla que lo reconoce
+            break
+        return issues
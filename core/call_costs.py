@@ -0,0 +1,323 @@
+"""
+Modelo de coste de llamadas a bibliotecas y operaciones de contenedores
+Tabla por lenguaje con el coste de funciones y métodos conocidos; en Python
+los métodos se buscan por el tipo del receptor cuando se puede inferir
+"""
+
+import ast
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .symbolic import Complexity, parse_notation
+
+
+CALL_COSTS: Dict[str, Dict[str, str]] = {
+    'python': {
+        # Funciones integradas
+        'sorted': 'O(n log n)',
+        'min': 'O(n)', 'max': 'O(n)', 'sum': 'O(n)', 'any': 'O(n)', 'all': 'O(n)',
+        'list': 'O(n)', 'tuple': 'O(n)', 'set': 'O(n)', 'frozenset': 'O(n)', 'dict': 'O(n)',
+        'len': 'O(1)', 'reversed': 'O(1)', 'range': 'O(1)',
+        # Módulos de la biblioteca estándar
+        'heapq.heapify': 'O(n)', 'heapq.heappush': 'O(log n)', 'heapq.heappop': 'O(log n)',
+        'heapq.nlargest': 'O(n log n)', 'heapq.nsmallest': 'O(n log n)',
+        'bisect.bisect': 'O(log n)', 'bisect.bisect_left': 'O(log n)', 'bisect.bisect_right': 'O(log n)',
+        'bisect.insort': 'O(n)', 'bisect.insort_left': 'O(n)', 'bisect.insort_right': 'O(n)',
+        'copy.copy': 'O(n)', 'copy.deepcopy': 'O(n)',
+        # Métodos por tipo del receptor
+        'list.append': 'O(1)', 'list.pop': 'O(1)', 'list.pop(0)': 'O(n)',
+        'list.index': 'O(n)', 'list.count': 'O(n)', 'list.remove': 'O(n)', 'list.insert': 'O(n)',
+        'list.extend': 'O(n)', 'list.copy': 'O(n)', 'list.reverse': 'O(n)', 'list.sort': 'O(n log n)',
+        'str.join': 'O(n)', 'str.split': 'O(n)', 'str.replace': 'O(n)', 'str.find': 'O(n)',
+        'str.index': 'O(n)', 'str.count': 'O(n)',
+        'set.add': 'O(1)', 'set.remove': 'O(1)', 'set.discard': 'O(1)',
+        'dict.get': 'O(1)', 'dict.setdefault': 'O(1)', 'dict.pop': 'O(1)',
+        'deque.append': 'O(1)', 'deque.appendleft': 'O(1)', 'deque.pop': 'O(1)', 'deque.popleft': 'O(1)',
+        # Receptor desconocido: métodos que cuestan lo mismo en todos los tipos que los tienen
+        '*.index': 'O(n)', '*.count': 'O(n)', '*.insert': 'O(n)', '*.join': 'O(n)', '*.sort': 'O(n log n)',
+        # pop(0) sin tipo inferido: se supone una lista, como en pertenencia
+        '*.pop(0)': 'O(n)',
+        # Pertenencia (x in contenedor); con un receptor de tipo desconocido se supone una lista
+        'in:list': 'O(n)', 'in:tuple': 'O(n)', 'in:str': 'O(n)', 'in:deque': 'O(n)',
+        'in:set': 'O(1)', 'in:dict': 'O(1)', 'in:range': 'O(1)', 'in:*': 'O(n)',
+        # Porciones (a[i:j]): copian los elementos
+        'slice': 'O(n)',
+    },
+    'javascript': {
+        '.sort': 'O(n log n)', '.indexOf': 'O(n)', '.lastIndexOf': 'O(n)', '.includes': 'O(n)',
+        '.find': 'O(n)', '.findIndex': 'O(n)', '.filter': 'O(n)', '.map': 'O(n)', '.reduce': 'O(n)',
+        '.some': 'O(n)', '.every': 'O(n)', '.splice': 'O(n)', '.shift': 'O(n)', '.unshift': 'O(n)',
+        '.slice': 'O(n)', '.concat': 'O(n)', '.join': 'O(n)', '.reverse': 'O(n)',
+        'Math.max': 'O(n)', 'Math.min': 'O(n)', 'Array.from': 'O(n)',
+    },
+    'java': {
+        'Arrays.sort': 'O(n log n)', 'Collections.sort': 'O(n log n)',
+        'Arrays.binarySearch': 'O(log n)', 'Collections.binarySearch': 'O(log n)',
+        'Arrays.fill': 'O(n)', 'Arrays.copyOf': 'O(n)', 'Arrays.asList': 'O(n)',
+        'Collections.max': 'O(n)', 'Collections.min': 'O(n)', 'Collections.reverse': 'O(n)',
+        '.indexOf': 'O(n)', '.lastIndexOf': 'O(n)', '.removeAll': 'O(n)', '.containsValue': 'O(n)',
+    },
+    'cpp': {
+        'std::sort': 'O(n log n)', 'std::stable_sort': 'O(n log n)', 'sort': 'O(n log n)',
+        'std::find': 'O(n)', 'std::count': 'O(n)', 'std::reverse': 'O(n)', 'std::accumulate': 'O(n)',
+        'std::min_element': 'O(n)', 'std::max_element': 'O(n)', 'std::fill': 'O(n)', 'std::copy': 'O(n)',
+        'std::binary_search': 'O(log n)', 'std::lower_bound': 'O(log n)', 'std::upper_bound': 'O(log n)',
+        'std::next_permutation': 'O(n)',
+    },
+}
+
+# Constructores y literales que fijan el tipo de una variable
+_CONSTRUCTORS = {
+    'list': 'list', 'sorted': 'list', 'tuple': 'tuple', 'set': 'set', 'frozenset': 'set',
+    'dict': 'dict', 'defaultdict': 'dict', 'Counter': 'dict', 'OrderedDict': 'dict',
+    'deque': 'deque', 'str': 'str', 'range': 'range',
+}
+_LITERALS = {
+    ast.List: 'list', ast.ListComp: 'list', ast.Tuple: 'tuple', ast.Set: 'set', ast.SetComp: 'set',
+    ast.Dict: 'dict', ast.DictComp: 'dict', ast.JoinedStr: 'str',
+}
+_ANNOTATIONS = {
+    'list': 'list', 'List': 'list', 'Sequence': 'list', 'tuple': 'tuple', 'Tuple': 'tuple',
+    'set': 'set', 'Set': 'set', 'frozenset': 'set', 'FrozenSet': 'set',
+    'dict': 'dict', 'Dict': 'dict', 'Mapping': 'dict', 'str': 'str', 'deque': 'deque', 'Deque': 'deque',
+}
+# Métodos que delatan el tipo de un receptor sin otra información
+_EVIDENCE = {
+    'append': 'list', 'extend': 'list', 'insert': 'list', 'sort': 'list',
+    'add': 'set', 'discard': 'set',
+    'items': 'dict', 'keys': 'dict', 'values': 'dict', 'setdefault': 'dict',
+    'appendleft': 'deque', 'popleft': 'deque',
+}
+_MODULES = {'heapq', 'bisect', 'copy'}
+# Lenguajes cuya tabla se busca con expresiones regulares (Python usa el AST)
+_REGEX_LANGUAGES = ('javascript', 'java', 'cpp')
+
+
+@lru_cache(maxsize=None)
+def _complexity(notation: str) -> Complexity:
+    return parse_notation(notation)
+
+
+def _value_type(value: ast.AST, types: Dict[str, str]) -> Optional[str]:
+    for node_type, type_name in _LITERALS.items():
+        if isinstance(value, node_type):
+            return type_name
+    if isinstance(value, ast.Constant) and isinstance(value.value, str):
+        return 'str'
+    if isinstance(value, ast.Call):
+        func = value.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name == 'join':
+            return 'str'
+        if name == 'split':
+            return 'list'
+        return _CONSTRUCTORS.get(name)
+    if isinstance(value, ast.Subscript) and isinstance(value.slice, ast.Slice) and isinstance(value.value, ast.Name):
+        return types.get(value.value.id)
+    return None
+
+
+def _annotation_type(annotation: Optional[ast.AST]) -> Optional[str]:
+    if isinstance(annotation, ast.Subscript):
+        annotation = annotation.value
+    if isinstance(annotation, ast.Attribute):
+        return _ANNOTATIONS.get(annotation.attr)
+    if isinstance(annotation, ast.Name):
+        return _ANNOTATIONS.get(annotation.id)
+    return None
+
+
+def infer_types(scope: ast.AST) -> Dict[str, str]:
+    """
+    Tipo de contenedor de cada variable, cuando se puede inferir
+
+    En orden de preferencia: anotaciones, asignaciones (literales,
+    comprensiones, constructores) y valores por defecto de los parámetros o
+    métodos que solo tiene un tipo (append → list, add → set, items → dict...).
+    """
+    types: Dict[str, str] = {}
+    evidence: Dict[str, str] = {}
+    for node in ast.walk(scope):
+        if isinstance(node, ast.arg):
+            annotated = _annotation_type(node.annotation)
+            if annotated:
+                types[node.arg] = annotated
+        elif isinstance(node, ast.arguments):
+            # def f(n, memo={}): el valor por defecto fija el tipo
+            positional = node.posonlyargs + node.args
+            defaults = list(zip(positional[len(positional) - len(node.defaults):], node.defaults))
+            defaults += [(arg, value) for arg, value in zip(node.kwonlyargs, node.kw_defaults) if value is not None]
+            for arg, value in defaults:
+                inferred = _value_type(value, types)
+                if inferred:
+                    evidence.setdefault(arg.arg, inferred)
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            annotated = _annotation_type(node.annotation)
+            if annotated:
+                types[node.target.id] = annotated
+        elif isinstance(node, ast.Assign):
+            inferred = _value_type(node.value, types)
+            if inferred:
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        types.setdefault(target.id, inferred)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and \
+                isinstance(node.func.value, ast.Name) and node.func.attr in _EVIDENCE:
+            evidence.setdefault(node.func.value.id, _EVIDENCE[node.func.attr])
+    for name, type_name in evidence.items():
+        types.setdefault(name, type_name)
+    return types
+
+
+def _is_window(lower: Optional[ast.AST], upper: Optional[ast.AST]) -> bool:
+    """Porción de ancho constante: s[i:i + 3] o s[i - 3:i]"""
+    if lower is None or upper is None:
+        return False
+    for start, end, op in ((lower, upper, ast.Add), (upper, lower, ast.Sub)):
+        if isinstance(end, ast.BinOp) and isinstance(end.op, op) and isinstance(end.right, ast.Constant) and \
+                ast.dump(end.left) == ast.dump(start):
+            return True
+    return False
+
+
+def _receiver_type(node: ast.AST, types: Dict[str, str]) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return types.get(node.id)
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set, ast.Dict)) or \
+            (isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes))):
+        # Literal en el propio código ('aeiou', [1, 2]): tamaño fijo
+        return 'literal'
+    return _value_type(node, types)
+
+
+def call_cost(node: ast.AST, types: Dict[str, str]) -> Optional[Tuple[str, Complexity]]:
+    """
+    Coste de una llamada, comprobación de pertenencia o porción de Python
+
+    Args:
+        node: ast.Call, ast.Compare con in / not in o ast.Subscript con porción
+        types: Tipos inferidos con infer_types
+
+    Returns:
+        (clave de la tabla, coste) o None si no es una operación conocida
+    """
+    costs = CALL_COSTS['python']
+    if isinstance(node, ast.Compare):
+        for op, comparator in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                type_name = _receiver_type(comparator, types)
+                if type_name is None and isinstance(comparator, (ast.Name, ast.Attribute)):
+                    # Variable de tipo no inferido (un parámetro): se supone una lista
+                    type_name = '*'
+                key = f'in:{type_name}'
+                if key in costs:
+                    return key, _complexity(costs[key])
+        return None
+    if isinstance(node, ast.Subscript):
+        if not isinstance(node.slice, ast.Slice) or not isinstance(node.ctx, ast.Load) or \
+                _receiver_type(node.value, types) == 'literal':
+            return None
+        if _is_window(node.slice.lower, node.slice.upper):
+            # s[i:i + 2]: ventana de ancho constante
+            return None
+        return 'slice', _complexity(costs['slice'])
+    if not isinstance(node, ast.Call):
+        return None
+
+    func = node.func
+    if isinstance(func, ast.Name):
+        if func.id in _CONSTRUCTORS and not node.args:
+            # set(), list(), dict(): contenedor vacío
+            return None
+        if func.id in ('min', 'max') and len(node.args) > 1:
+            # max(a, b): compara sus argumentos, no recorre una colección
+            return None
+        key = func.id
+    elif isinstance(func, ast.Attribute):
+        receiver = func.value
+        if isinstance(receiver, ast.Name) and receiver.id in _MODULES:
+            key = f'{receiver.id}.{func.attr}'
+        else:
+            type_name = _receiver_type(receiver, types)
+            # ', '.join(partes) recorre su argumento, no el separador literal
+            if type_name == 'literal' and func.attr != 'join':
+                return None
+            key = f'{type_name}.{func.attr}'
+            if func.attr == 'pop' and node.args and isinstance(node.args[0], ast.Constant) and node.args[0].value == 0:
+                key = f"{type_name or '*'}.pop(0)"
+            if key not in costs:
+                key = f'*.{func.attr}'
+    else:
+        return None
+    if key not in costs:
+        return None
+    return key, _complexity(costs[key])
+
+
+def _call_pattern(key: str) -> re.Pattern:
+    if key.startswith('.'):
+        return re.compile(re.escape(key) + r'\s*\(')
+    return re.compile(r'(?<![\w.:])' + re.escape(key) + r'\s*\(')
+
+
+_LOOP_HEADER = re.compile(r'\b(for|while)\s*\(|\.forEach\s*\(')
+
+
+def loop_nesting(code: str) -> List[Tuple[int, int]]:
+    """
+    Bucles abiertos en cada posición del código (lenguajes con llaves)
+
+    Returns:
+        Por cada carácter, (número de bucles abiertos, posición donde empieza
+        el más interior o -1)
+    """
+    nesting = []
+    # Posición de la cabecera de cada bloque abierto, o None si no es un bucle
+    stack: List[Optional[int]] = []
+    loops: List[int] = []
+    segment_start = 0
+    parentheses = 0
+    for position, char in enumerate(code):
+        if char == '(':
+            parentheses += 1
+        elif char == ')':
+            parentheses = max(0, parentheses - 1)
+        elif char == '{':
+            header = _LOOP_HEADER.search(code, segment_start, position)
+            stack.append(header.start() if header else None)
+            if header:
+                loops.append(header.start())
+            segment_start = position + 1
+        elif char == '}':
+            if stack and stack.pop() is not None:
+                loops.pop()
+            segment_start = position + 1
+        elif char == ';' and not parentheses:
+            # Los ; de la cabecera de un for (i = 0; i < n; i++) no cierran la sentencia
+            segment_start = position + 1
+        nesting.append((len(loops), loops[-1] if loops else -1))
+    return nesting
+
+
+def regex_call_costs(code: str, language: str) -> Iterator[Tuple[str, int, Complexity]]:
+    """
+    Llamadas conocidas en código de lenguajes sin AST (JavaScript, Java, C++)
+
+    Cada bucle abierto alrededor de la llamada la multiplica por n.
+
+    Yields:
+        (clave de la tabla, línea, coste total de la llamada)
+    """
+    if language not in _REGEX_LANGUAGES:
+        return
+    costs = CALL_COSTS[language]
+    nesting = loop_nesting(code)
+    n = Complexity.poly('n')
+    for key, notation in costs.items():
+        cost = _complexity(notation)
+        if cost is Complexity.constant():
+            continue
+        for match in _call_pattern(key).finditer(code):
+            depth = nesting[match.start()][0]
+            yield key, code.count('\n', 0, match.start()) + 1, cost * n ** depth
@@ -2,26 +2,30 @@
 Calculador de complejidad temporal para algoritmos
 """
 
-from typing import Dict, List, Tuple, Optional
-import re
+from typing import Dict, List, Optional
+
+from .patterns import PatternKind, PatternRecord, PatternTable
+from .recurrence import solve_recurrence
+from .symbolic import Complexity, dominant, parse_notation, total
 
 
 class ComplexityCalculator:
     """Calcula la complejidad temporal de algoritmos basado en patrones detectados"""
     
     def __init__(self):
+        n = Complexity.poly('n')
         self.complexity_patterns = {
-            'constant': {'notation': 'O(1)', 'weight': 1},
-            'logarithmic': {'notation': 'O(log n)', 'weight': 2},
-            'linear': {'notation': 'O(n)', 'weight': 3},
-            'linearithmic': {'notation': 'O(n log n)', 'weight': 4},
-            'quadratic': {'notation': 'O(n²)', 'weight': 5},
-            'cubic': {'notation': 'O(n³)', 'weight': 6},
-            'exponential': {'notation': 'O(2ⁿ)', 'weight': 7},
-            'factorial': {'notation': 'O(n!)', 'weight': 8}
+            'constant': Complexity.constant(),
+            'logarithmic': Complexity.log('n'),
+            'linear': n,
+            'linearithmic': n * Complexity.log('n'),
+            'quadratic': n ** 2,
+            'cubic': n ** 3,
+            'exponential': Complexity.exp('n'),
+            'factorial': Complexity.factorial('n')
         }
     
-    def calculate_complexity(self, patterns: List[Dict]) -> Dict:
+    def calculate_complexity(self, patterns: PatternTable) -> Dict:
         """
         Calcula la complejidad temporal basada en los patrones detectados
         
@@ -53,112 +57,105 @@ class ComplexityCalculator:
             }
         
         # Encontrar el término dominante
-        dominant_term = self._find_dominant_term(complexity_terms)
+        dominant = self._find_dominant_term(complexity_terms)
         
         # Calcular complejidad total
         total_complexity = self._calculate_total_complexity(complexity_terms)
         
+        # El resultado solo lleva notaciones: la expresión simbólica es interna
+        terms = [{key: value for key, value in term.items() if key != 'expression'} for term in complexity_terms]
         return {
-            'dominant_term': dominant_term,
-            'total_complexity': total_complexity,
-            'terms': complexity_terms,
-            'analysis': self._generate_complexity_analysis(complexity_terms, dominant_term)
+            'dominant_term': dominant.notation,
+            'total_complexity': total_complexity.notation,
+            'terms': terms,
+            'analysis': self._generate_complexity_analysis(complexity_terms, dominant.notation)
         }
     
-    def _analyze_pattern_complexity(self, pattern: Dict) -> Optional[Dict]:
+    def _analyze_pattern_complexity(self, pattern: PatternRecord) -> Optional[Dict]:
         """Analiza la complejidad de un patrón específico"""
-        pattern_type = pattern.get('type', '')
-        description = pattern.get('description', '')
-        
-        # Detectar bucles anidados
-        if 'nested_loop' in pattern_type:
-            nesting_level = self._count_nesting_level(description)
-            if nesting_level == 1:
-                return {'type': 'linear', 'notation': 'O(n)', 'description': description}
-            elif nesting_level == 2:
-                return {'type': 'quadratic', 'notation': 'O(n²)', 'description': description}
-            elif nesting_level == 3:
-                return {'type': 'cubic', 'notation': 'O(n³)', 'description': description}
-            else:
-                return {'type': 'polynomial', 'notation': f'O(n^{nesting_level})', 'description': description}
-        
-        # Detectar recursión
-        elif 'recursion' in pattern_type:
-            if 'fibonacci' in description.lower() or 'exponential' in description.lower():
-                return {'type': 'exponential', 'notation': 'O(2ⁿ)', 'description': description}
-            elif 'factorial' in description.lower():
-                return {'type': 'factorial', 'notation': 'O(n!)', 'description': description}
+        kind = pattern.kind
+
+        # Las llamadas de E/S ya cuentan en el bucle o la recursión que las repite;
+        # su coste es el número de llamadas, no un término más de tiempo
+        if kind is PatternKind.IO_CALL:
+            return None
+
+        # Coste ya analizado: bucles con su cota y llamadas de biblioteca
+        if pattern.cost:
+            bounded = parse_notation(pattern.cost)
+            if bounded is not None:
+                return self._term(self._type_of(bounded), bounded, pattern)
+        
+        # Detectar bucles anidados: cada nivel multiplica por n
+        if kind is PatternKind.NESTED_LOOP:
+            depth = pattern.depth
+            term_type = {1: 'linear', 2: 'quadratic', 3: 'cubic'}.get(depth, 'polynomial')
+            return self._term(term_type, Complexity.poly('n') ** depth, pattern)
+        
+        # Detectar recursión: primero la recurrencia extraída del AST
+        elif kind is PatternKind.RECURSION:
+            solved = solve_recurrence(pattern.recurrence) if pattern.recurrence else None
+            if solved is not None:
+                return self._term(self._type_of(solved), solved, pattern)
+            name = (pattern.callee or '').lower()
+            if 'fibonacci' in name or 'exponential' in name:
+                return self._term('exponential', self.complexity_patterns['exponential'], pattern)
+            elif 'factorial' in name:
+                return self._term('factorial', self.complexity_patterns['factorial'], pattern)
             else:
-                return {'type': 'recursive', 'notation': 'O(2ⁿ)', 'description': description}
+                # Recurrencia sin resolver: estimación provisional que se conserva
+                # aunque haya otros términos; un bucle no la rebaja
+                return self._term('recursive', Complexity.exp('n'), pattern, provisional=True)
         
         # Detectar búsqueda binaria
-        elif 'binary_search' in pattern_type:
-            return {'type': 'logarithmic', 'notation': 'O(log n)', 'description': description}
+        elif kind is PatternKind.BINARY_SEARCH:
+            return self._term('logarithmic', self.complexity_patterns['logarithmic'], pattern)
         
         # Detectar algoritmos de ordenamiento
-        elif 'sorting' in pattern_type:
-            if 'merge' in description.lower() or 'quick' in description.lower() or 'heap' in description.lower():
-                return {'type': 'linearithmic', 'notation': 'O(n log n)', 'description': description}
-            elif 'bubble' in description.lower() or 'selection' in description.lower() or 'insertion' in description.lower():
-                return {'type': 'quadratic', 'notation': 'O(n²)', 'description': description}
+        elif kind is PatternKind.SORTING:
+            name = (pattern.callee or '').lower()
+            if 'merge' in name or 'quick' in name or 'heap' in name:
+                return self._term('linearithmic', self.complexity_patterns['linearithmic'], pattern)
+            elif 'bubble' in name or 'selection' in name or 'insertion' in name:
+                return self._term('quadratic', self.complexity_patterns['quadratic'], pattern)
         
         # Detectar bucle simple
-        elif 'simple_loop' in pattern_type:
-            return {'type': 'linear', 'notation': 'O(n)', 'description': description}
+        elif kind is PatternKind.SIMPLE_LOOP:
+            return self._term('linear', self.complexity_patterns['linear'], pattern)
         
         # Detectar operaciones constantes
-        elif 'constant' in pattern_type:
-            return {'type': 'constant', 'notation': 'O(1)', 'description': description}
+        elif kind is PatternKind.CONSTANT:
+            return self._term('constant', self.complexity_patterns['constant'], pattern)
         
         return None
     
-    def _count_nesting_level(self, description: str) -> int:
-        """Cuenta el nivel de anidamiento de bucles"""
-        # Si la descripción menciona bucles anidados, contar las líneas
-        if 'anidados' in description.lower():
-            # Extraer números de línea de la descripción
-            line_numbers = re.findall(r'\d+', description)
-            if len(line_numbers) >= 2:
-                # Si hay múltiples líneas mencionadas, es al menos 2 bucles anidados
-                return 2
-            else:
-                return 2  # Por defecto para bucles anidados
-        
-        # Buscar patrones de bucles anidados en el texto
-        nested_patterns = [
-            r'for.*for.*for',  # 3 bucles anidados
-            r'for.*for',       # 2 bucles anidados
-            r'while.*while.*while',  # 3 whiles anidados
-            r'while.*while',   # 2 whiles anidados
-        ]
-        
-        for i, pattern in enumerate(nested_patterns, 1):
-            if re.search(pattern, description, re.IGNORECASE):
-                return i + 1
-        
-        return 1  # Por defecto, un bucle
+    def _type_of(self, expression: Complexity) -> str:
+        """Tipo con nombre de una expresión ('quadratic'...), o 'polynomial' si no lo tiene"""
+        for term_type, known in self.complexity_patterns.items():
+            if known is expression:
+                return term_type
+        return 'polynomial'
     
-    def _find_dominant_term(self, terms: List[Dict]) -> str:
-        """Encuentra el término dominante en la complejidad"""
-        if not terms:
-            return 'O(1)'
-        
-        # Ordenar por peso de complejidad
-        sorted_terms = sorted(terms, key=lambda x: self.complexity_patterns.get(x['type'], {}).get('weight', 0), reverse=True)
-        
-        return sorted_terms[0]['notation']
+    @staticmethod
+    def _term(term_type: str, expression: Complexity, pattern: PatternRecord,
+              provisional: bool = False) -> Dict:
+        return {
+            'type': term_type,
+            'notation': expression.notation,
+            'expression': expression,
+            'provisional': provisional,
+            'description': pattern.description
+        }
     
-    def _calculate_total_complexity(self, terms: List[Dict]) -> str:
-        """Calcula la complejidad total combinando todos los términos"""
+    def _find_dominant_term(self, terms: List[Dict]) -> Complexity:
+        """Encuentra el término dominante según el orden total de complejidades"""
         if not terms:
-            return 'O(1)'
-        
-        # Si solo hay un término, es la complejidad total
-        if len(terms) == 1:
-            return terms[0]['notation']
-        
-        # Si hay múltiples términos, tomar el dominante
-        return self._find_dominant_term(terms)
+            return Complexity.constant()
+        return dominant(term['expression'] for term in terms)
+    
+    def _calculate_total_complexity(self, terms: List[Dict]) -> Complexity:
+        """Compone secuencialmente todos los términos (suma simbólica)"""
+        return total(term['expression'] for term in terms)
     
     def _generate_complexity_analysis(self, terms: List[Dict], dominant_term: str) -> str:
         """Genera un análisis detallado de la complejidad"""
@@ -0,0 +1,142 @@
+"""
+Catálogo de operaciones de entrada/salida
+Firmas de llamadas de E/S (ficheros, red, base de datos, procesos) por
+lenguaje. Una llamada de E/S dentro de un bucle o de una recursión se
+ejecuta tantas veces como iteraciones haya: el clásico problema N+1
+"""
+
+import ast
+import json
+import re
+from fnmatch import fnmatchcase
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Firmas por lenguaje y categoría; '*' casa con cualquier prefijo (p. ej. '*.execute'
+# casa con cursor.execute y con self.db.cursor.execute)
+DEFAULT_IO_CATALOG: Dict[str, Dict[str, List[str]]] = {
+    'python': {
+        'file': [
+            'open', 'io.open', 'os.listdir', 'os.scandir', 'os.walk', 'os.stat', 'os.remove',
+            'os.path.exists', 'os.path.getsize', 'shutil.*', '*.read_text', '*.write_text',
+            '*.read_bytes', '*.write_bytes', 'json.load', 'json.dump', 'pickle.load', 'pickle.dump',
+            'pd.read_*', 'pandas.read_*', '*.to_csv', 'np.load', 'np.save',
+        ],
+        'network': [
+            'requests.*', 'httpx.*', 'urlopen', '*.urlopen', 'aiohttp.*', 'socket.*',
+            '*.sendall', '*.recv', 'smtplib.*', 'boto3.*',
+        ],
+        'database': [
+            '*.execute', '*.executemany', '*.fetchone', '*.fetchall', '*.fetchmany', '*.commit',
+            '*.objects.*', '*.query', '*.query.*', 'sqlite3.connect', 'psycopg2.connect',
+            '*.find_one', '*.insert_one', '*.update_one', '*.delete_one', 'redis.*',
+        ],
+        'process': ['subprocess.*', 'os.system', 'os.popen'],
+        'sleep': ['time.sleep', 'asyncio.sleep'],
+    },
+    'javascript': {
+        'file': ['fs.*', 'readFileSync', 'writeFileSync'],
+        'network': ['fetch', 'axios', 'axios.*', '$.ajax', '$.get', 'http.get', 'https.get', 'http.request'],
+        'database': ['*.query', '*.findOne', '*.findAll', '*.findById', '*.findByPk', '*.save', 'db.*', 'prisma.*'],
+    },
+    'java': {
+        'file': ['Files.*', 'FileReader', 'FileWriter', 'FileInputStream', 'FileOutputStream'],
+        'network': ['*.openConnection', '*.openStream', '*HttpClient.*', '*.send'],
+        'database': [
+            '*.executeQuery', '*.executeUpdate', '*.execute', '*.prepareStatement',
+            '*.createQuery', 'entityManager.*', '*Repository.find*', '*Repository.save',
+        ],
+    },
+    'cpp': {
+        'file': ['fopen', 'fread', 'fwrite', 'fgets', 'fprintf', '*.open', 'std::getline'],
+        'network': ['socket', 'connect', 'send', 'recv', 'curl_easy_perform'],
+        'database': ['sqlite3_exec', 'sqlite3_step', 'mysql_query', 'PQexec'],
+    },
+}
+
+# Qué hacer con cada categoría cuando se repite en un bucle o una recursión
+IO_SUGGESTIONS = {
+    'file': "Lee o escribe el fichero una sola vez y reutiliza su contenido",
+    'network': "Agrupa las peticiones (endpoint por lotes) o hazlas concurrentes y cachea las respuestas",
+    'database': "Haz una sola consulta para todos los elementos (IN, JOIN, select_related/prefetch_related)",
+    'process': "Lanza un único proceso con todos los argumentos o usa una biblioteca en el mismo proceso",
+    'sleep': "Evita esperas dentro del bucle; usa reintentos con backoff fuera del camino principal",
+}
+
+_KEYWORDS = {'if', 'for', 'while', 'switch', 'return', 'catch', 'function', 'sizeof', 'new'}
+_CALL = re.compile(r'((?:[A-Za-z_$][\w$]*\s*(?:\.|::)\s*)*[A-Za-z_$][\w$]*)\s*\(')
+
+
+def dotted_name(node: ast.AST) -> Optional[str]:
+    """Nombre con puntos de lo que se llama: Model.objects.filter(x).first() → Model.objects.filter.first"""
+    if isinstance(node, ast.Call):
+        return dotted_name(node.func)
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = dotted_name(node.value)
+        return f"{base}.{node.attr}" if base else node.attr
+    return None
+
+
+class IOCatalog:
+    """Firmas de E/S configurables por lenguaje"""
+
+    def __init__(self, signatures: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        source = DEFAULT_IO_CATALOG if signatures is None else signatures
+        self.signatures = {language: {category: list(patterns) for category, patterns in categories.items()}
+                           for language, categories in source.items()}
+
+    @classmethod
+    def from_file(cls, path: str, extend_defaults: bool = True) -> 'IOCatalog':
+        """
+        Carga un catálogo JSON con la forma {lenguaje: {categoría: [firmas]}}
+
+        Args:
+            path: Ruta del JSON
+            extend_defaults: Si es True las firmas se añaden a las predeterminadas
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        catalog = cls() if extend_defaults else cls({})
+        for language, categories in data.items():
+            for category, patterns in categories.items():
+                for pattern in patterns:
+                    catalog.add(language, category, pattern)
+        return catalog
+
+    def add(self, language: str, category: str, signature: str):
+        """Añade una firma al catálogo"""
+        patterns = self.signatures.setdefault(language, {}).setdefault(category, [])
+        if signature not in patterns:
+            patterns.append(signature)
+
+    def match(self, language: str, name: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        Categoría y firma que casan con el nombre de una llamada
+
+        Returns:
+            (categoría, firma) o None si la llamada no es de E/S
+        """
+        if not name:
+            return None
+        for category, patterns in self.signatures.get(language, {}).items():
+            for pattern in patterns:
+                if fnmatchcase(name, pattern):
+                    return category, pattern
+        return None
+
+    def find_calls(self, code: str, language: str) -> Iterator[Tuple[str, str, int]]:
+        """
+        Llamadas de E/S en código sin AST, buscadas con expresiones regulares
+
+        Yields:
+            (nombre de la llamada, categoría, posición en el código)
+        """
+        for call in _CALL.finditer(code):
+            name = re.sub(r'\s+', '', call.group(1))
+            if name in _KEYWORDS:
+                continue
+            found = self.match(language, name)
+            if found:
+                yield name, found[0], call.start()
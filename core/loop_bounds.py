@@ -0,0 +1,236 @@
+"""
+Análisis de cotas de bucles
+Estima cuántas veces itera cada bucle a partir de su cabecera y de cómo se
+actualizan sus variables: rangos constantes, actualizaciones multiplicativas
+o divisivas (logarítmicos), i * i <= n (raíz) y el resto lineales
+"""
+
+import ast
+from fractions import Fraction
+from typing import Dict, Iterator, List, Optional, Set
+
+from .call_costs import call_cost
+from .recurrence import halving_factor, halving_names
+from .symbolic import Complexity
+
+
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+
+
+def _is_constant(node: ast.AST) -> bool:
+    """Expresión sin variables (10, 2 ** 8, -1...)"""
+    return all(not isinstance(child, (ast.Name, ast.Attribute, ast.Call, ast.Subscript)) for child in ast.walk(node))
+
+
+def _names(node: ast.AST) -> Set[str]:
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+
+
+def _mentions_log(node: ast.AST) -> bool:
+    """range(int(math.log2(n))), range(n.bit_length())..."""
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            func = child.func
+            name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else ''
+            if name in ('log', 'log2', 'log10', 'bit_length'):
+                return True
+    return False
+
+
+def _range_cost(call: ast.Call) -> Complexity:
+    args = call.args
+    if not args or all(_is_constant(arg) for arg in args[:2]):
+        return Complexity.constant()
+    if len(args) >= 2:
+        start, stop = args[0], args[1]
+        # range(i, i + 3): ventana de ancho constante
+        if isinstance(stop, ast.BinOp) and isinstance(stop.op, ast.Add) and _is_constant(stop.right) and \
+                ast.dump(stop.left) == ast.dump(start):
+            return Complexity.constant()
+    if any(_mentions_log(arg) for arg in args[:2]):
+        return Complexity.log('n')
+    return Complexity.poly('n')
+
+
+def _for_cost(node: ast.For) -> Complexity:
+    iterable = node.iter
+    if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) and \
+            iterable.func.id in ('enumerate', 'reversed') and iterable.args:
+        iterable = iterable.args[0]
+    if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) and iterable.func.id == 'range':
+        return _range_cost(iterable)
+    if isinstance(iterable, (ast.List, ast.Tuple, ast.Set, ast.Constant)):
+        # Colección literal: tamaño fijo
+        return Complexity.constant()
+    if isinstance(iterable, ast.Subscript) and isinstance(iterable.slice, ast.Slice):
+        # arr[:3] es constante; arr[:n // 2] o arr[i:] siguen siendo lineales
+        bounds = [b for b in (iterable.slice.lower, iterable.slice.upper) if b is not None]
+        if bounds and iterable.slice.upper is not None and all(_is_constant(b) for b in bounds):
+            return Complexity.constant()
+    return Complexity.poly('n')
+
+
+def _updates(node: ast.AST, variables: Set[str]) -> List[ast.AST]:
+    """Asignaciones a las variables del bucle dentro de su cuerpo"""
+    updates = []
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, _SCOPES):
+            continue
+        if isinstance(child, ast.AugAssign) and isinstance(child.target, ast.Name) and child.target.id in variables:
+            updates.append(child)
+        elif isinstance(child, ast.Assign) and \
+                any(isinstance(t, ast.Name) and t.id in variables for t in child.targets):
+            updates.append(child)
+        stack.extend(ast.iter_child_nodes(child))
+    return updates
+
+
+def _is_geometric(update: ast.AST, halving: dict) -> bool:
+    """i *= 2, n //= 2, i <<= 1, n = n // 3, lo = mid + 1..."""
+    if isinstance(update, ast.AugAssign):
+        if isinstance(update.op, (ast.Mult, ast.FloorDiv, ast.Div)):
+            return isinstance(update.value, ast.Constant) and isinstance(update.value.value, (int, float)) \
+                and update.value.value > 1
+        return isinstance(update.op, (ast.LShift, ast.RShift))
+    value = update.value
+    if isinstance(value, ast.BinOp) and isinstance(value.op, ast.Mult) and \
+            any(isinstance(side, ast.Constant) and isinstance(side.value, (int, float)) and side.value > 1
+                for side in (value.left, value.right)):
+        return True
+    factor = halving_factor(value)
+    if factor is None:
+        factor = next((halving[name] for name in _names(value) if name in halving), None)
+    return factor is not None
+
+
+def _starts_constant(variables: Set[str], scope: Optional[ast.AST], loop: ast.AST) -> bool:
+    """Las variables se inicializan con constantes fuera del bucle (i = 0 antes de while i < 10)"""
+    if scope is None:
+        return False
+    inside = {id(child) for child in ast.walk(loop)}
+    initial = {name: [] for name in variables}
+    for node in ast.walk(scope):
+        if isinstance(node, ast.Assign) and id(node) not in inside:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id in initial:
+                    initial[target.id].append(node.value)
+    return all(values and all(_is_constant(value) for value in values) for values in initial.values())
+
+
+def _while_cost(node: ast.While, scope: Optional[ast.AST]) -> Complexity:
+    variables = _names(node.test)
+    if not variables:
+        # while True: depende de un break que no se analiza
+        return Complexity.poly('n')
+    updates = _updates(node, variables)
+    if not updates:
+        return Complexity.poly('n')
+
+    halving = halving_names(node)
+    if any(_is_geometric(update, halving) for update in updates):
+        return Complexity.log('n')
+
+    if isinstance(node.test, ast.Compare):
+        sides = [node.test.left] + list(node.test.comparators)
+        # i < 10 con i avanzando de uno en uno: número fijo de vueltas
+        if any(_is_constant(side) for side in sides) and \
+                all(_is_constant(side) or _names(side) <= variables for side in sides) and \
+                _starts_constant(variables, scope, node):
+            return Complexity.constant()
+        # i * i <= n: se detiene en la raíz de n
+        for side in sides:
+            if isinstance(side, ast.BinOp) and (
+                    (isinstance(side.op, ast.Mult) and ast.dump(side.left) == ast.dump(side.right)) or
+                    (isinstance(side.op, ast.Pow) and isinstance(side.right, ast.Constant) and side.right.value == 2)):
+                return Complexity.poly('n', Fraction(1, 2))
+    return Complexity.poly('n')
+
+
+def loop_cost(node: ast.AST, scope: Optional[ast.AST] = None) -> Complexity:
+    """
+    Número de iteraciones de un bucle for/while en función de n
+    
+    Args:
+        node: Bucle
+        scope: Código que lo contiene, para ver cómo se inicializan sus variables
+    """
+    if isinstance(node, ast.For):
+        return _for_cost(node)
+    if isinstance(node, ast.While):
+        return _while_cost(node, scope)
+    return Complexity.constant()
+
+
+def inner_loops(node: ast.AST) -> List[ast.AST]:
+    """Bucles directamente contenidos en otro (sin otro bucle ni función en medio)"""
+    loops = []
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, _SCOPES):
+            continue
+        if isinstance(child, (ast.For, ast.While)):
+            loops.append(child)
+        else:
+            stack.extend(ast.iter_child_nodes(child))
+    return loops
+
+
+def _operations(nodes: List[ast.AST]) -> Iterator[ast.AST]:
+    """
+    Llamadas, comprobaciones de pertenencia y porciones, sin entrar en bucles
+    interiores ni funciones. Un return sale del bucle: su expresión se evalúa
+    una sola vez y no se repite con las vueltas
+    """
+    stack = list(nodes)
+    while stack:
+        child = stack.pop()
+        if isinstance(child, _SCOPES + (ast.For, ast.While, ast.Return)):
+            continue
+        if isinstance(child, (ast.Call, ast.Compare, ast.Subscript)):
+            yield child
+        stack.extend(ast.iter_child_nodes(child))
+
+
+def _operations_cost(nodes: List[ast.AST], types: Dict[str, str]) -> Complexity:
+    cost = Complexity.constant()
+    for operation in _operations(nodes):
+        known = call_cost(operation, types)
+        if known is not None:
+            cost = cost + known[1]
+    return cost
+
+
+def nest_cost(node: ast.AST, scope: Optional[ast.AST] = None, types: Optional[Dict[str, str]] = None,
+              _cache: Optional[dict] = None) -> Complexity:
+    """
+    Coste de un bucle con todos sus bucles interiores
+
+    Cada nivel multiplica su número de iteraciones por la suma de los bucles
+    que contiene y de las llamadas de su cuerpo (ver call_costs), de modo que
+    un for constante alrededor de uno lineal es O(n), un while que divide a
+    la mitad dentro de un for es O(n log n) y un `x in lista` dentro de un
+    for es O(n²). El iterable de un for se evalúa una sola vez.
+
+    Args:
+        node: Bucle
+        scope: Código que lo contiene
+        types: Tipos de contenedor inferidos (infer_types); sin ellos solo
+            cuentan las llamadas cuyo coste no depende del receptor
+    """
+    cache = {} if _cache is None else _cache
+    cost = cache.get(id(node))
+    if cost is None:
+        types = types or {}
+        if isinstance(node, ast.For):
+            header, body = [node.iter], node.body + node.orelse
+        else:
+            header, body = [], [node.test] + node.body + node.orelse
+        inner = _operations_cost(body, types)
+        for child in inner_loops(node):
+            inner = inner + nest_cost(child, scope, types, cache)
+        cost = loop_cost(node, scope) * inner + _operations_cost(header, types)
+        cache[id(node)] = cost
+    return cost
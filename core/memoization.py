@@ -0,0 +1,155 @@
+"""
+Oportunidades de memoización
+Una función pura con varias llamadas recursivas sobre argumentos que se
+solapan (fib(n - 1) + fib(n - 2), lcs(i - 1, j) + lcs(i, j - 1)) resuelve los
+mismos subproblemas una y otra vez. Con memoización cada estado distinto se
+calcula una sola vez: el coste pasa a ser estados × trabajo por estado
+"""
+
+import ast
+from typing import Dict, List, Optional, Set
+
+from .antipatterns import MUTATING_METHODS
+from .io_calls import IOCatalog, dotted_name
+from .recurrence import solve_recurrence
+from .symbolic import Complexity, parse_notation
+
+
+_MEMO_DECORATORS = {'lru_cache', 'cache', 'cached', 'memoize', 'memoized'}
+
+
+def _recursive_calls(func: ast.FunctionDef) -> List[ast.Call]:
+    return [node for node in ast.walk(func)
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == func.name]
+
+
+def is_memoized(func: ast.FunctionDef) -> bool:
+    """@lru_cache, @cache... o una tabla propia: `if clave in memo` y `memo[clave] = ...`"""
+    for decorator in func.decorator_list:
+        name = dotted_name(decorator) or ''
+        if name.rsplit('.', 1)[-1] in _MEMO_DECORATORS:
+            return True
+    checked, stored = set(), set()
+    for node in ast.walk(func):
+        if isinstance(node, ast.Compare) and any(isinstance(op, (ast.In, ast.NotIn)) for op in node.ops):
+            checked.update(dotted_name(side) for side in node.comparators)
+        elif isinstance(node, ast.Assign):
+            stored.update(dotted_name(target.value) for target in node.targets if isinstance(target, ast.Subscript))
+    return bool((checked & stored) - {None})
+
+
+def _is_pure(func: ast.FunctionDef, parameters: Set[str], catalog: IOCatalog) -> bool:
+    """Sin global/nonlocal, sin E/S y sin modificar los argumentos"""
+    for node in ast.walk(func):
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            return False
+        if isinstance(node, ast.Call):
+            name = dotted_name(node.func)
+            if name == 'print' or catalog.match('python', name):
+                return False
+            if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name) and \
+                    node.func.value.id in parameters and node.func.attr in MUTATING_METHODS:
+                return False
+        elif isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign, ast.Delete)):
+            targets = node.targets if isinstance(node, (ast.Assign, ast.Delete)) else [node.target]
+            if any(_modified_base(part) in parameters for target in targets for part in ast.walk(target)):
+                return False
+    return True
+
+
+def _modified_base(target: ast.AST) -> Optional[str]:
+    """Variable que se modifica al asignar a arr[i], arr[i][j] u obj.campo; None si no es una de esas"""
+    if not isinstance(target, (ast.Subscript, ast.Attribute)) or not isinstance(target.ctx, (ast.Store, ast.Del)):
+        return None
+    while isinstance(target, (ast.Subscript, ast.Attribute)):
+        target = target.value
+    return target.id if isinstance(target, ast.Name) else None
+
+
+def _shifted_parameters(calls: List[ast.Call], parameters: List[str]) -> Optional[Set[str]]:
+    """
+    Parámetros que las llamadas desplazan (n - 1, i + 1, n - k)
+
+    Returns:
+        Los parámetros desplazados, o None si algún argumento no es un
+        parámetro, una constante o un parámetro más/menos un entero o una
+        variable (entonces los subproblemas no se pueden enumerar)
+    """
+    shifted = set()
+    for call in calls:
+        if call.keywords or len(call.args) > len(parameters):
+            return None
+        for arg in call.args:
+            if isinstance(arg, ast.Constant) or (isinstance(arg, ast.Name) and arg.id in parameters):
+                continue
+            if isinstance(arg, ast.BinOp) and isinstance(arg.op, (ast.Add, ast.Sub)) and \
+                    isinstance(arg.left, ast.Name) and arg.left.id in parameters and \
+                    (isinstance(arg.right, ast.Name) or
+                     (isinstance(arg.right, ast.Constant) and isinstance(arg.right.value, int))):
+                shifted.add(arg.left.id)
+                continue
+            return None
+    return shifted
+
+
+def _in_loop(call: ast.Call, func: ast.FunctionDef) -> bool:
+    for node in ast.walk(func):
+        if isinstance(node, (ast.For, ast.While)) and any(child is call for child in ast.walk(node)):
+            return True
+    return False
+
+
+def memoized_cost(func: ast.FunctionDef, recurrence: Optional[str],
+                  helpers: Optional[Dict[str, Complexity]] = None) -> Optional[Complexity]:
+    """
+    Coste de la función con memoización
+
+    Args:
+        func: Función recursiva
+        recurrence: Su recurrencia (extract_recurrence), si se extrajo
+        helpers: Coste no recursivo de las funciones del módulo (function_costs)
+
+    Returns:
+        Estados distintos × trabajo por estado, o None si los subproblemas
+        no se pueden enumerar o memoizar no reduce el coste de la recurrencia
+    """
+    calls = _recursive_calls(func)
+    shifted = _shifted_parameters(calls, [arg.arg for arg in func.args.args]) if calls else None
+    if not shifted:
+        return None
+
+    # Cada parámetro desplazado toma O(n) valores; el trabajo de cada estado
+    # es el de la recurrencia (bucles y llamadas de biblioteca del cuerpo)
+    work = parse_notation(recurrence.rpartition(' + ')[2]) if recurrence else None
+    if work is None:
+        work = (helpers or {}).get(func.name, Complexity.constant())
+    memoized = Complexity.poly('n', len(shifted)) * work
+    current = solve_recurrence(recurrence) if recurrence else None
+    if current is not None and (current is memoized or not current.dominates(memoized)):
+        return None
+    return memoized
+
+
+def memoization_opportunity(func: ast.FunctionDef, recurrence: Optional[str], catalog: Optional[IOCatalog] = None,
+                            helpers: Optional[Dict[str, Complexity]] = None) -> Optional[Complexity]:
+    """
+    Coste estimado si se memoizara una función que todavía no lo está
+
+    Args:
+        func: Función recursiva
+        recurrence: Su recurrencia (extract_recurrence), si se extrajo
+        catalog: Catálogo de E/S para descartar funciones con efectos laterales
+        helpers: Coste no recursivo de las funciones del módulo (function_costs)
+
+    Returns:
+        El coste memoizado (memoized_cost), o None si la función ya está
+        memoizada, no es pura o sus subproblemas no se solapan
+    """
+    calls = _recursive_calls(func)
+    # Solapamiento: dos llamadas en el mismo cuerpo o una dentro de un bucle
+    if not calls or (len(calls) < 2 and not _in_loop(calls[0], func)):
+        return None
+    parameters = {arg.arg for arg in func.args.args}
+    if is_memoized(func) or not _is_pure(func, parameters, catalog or IOCatalog()):
+        return None
+    return memoized_cost(func, recurrence, helpers)
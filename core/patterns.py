@@ -4,21 +4,408 @@ Detector de patrones en algoritmos para análisis de complejidad
 
 import re
 import ast
-from typing import Dict, List, Optional
+from array import array
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Union
+
+from .antipatterns import LoopContext, PerformanceIssue, PerformanceRuleSet
+from .call_costs import call_cost, infer_types, loop_nesting, regex_call_costs
+from .io_calls import IO_SUGGESTIONS, IOCatalog, dotted_name
+from .loop_bounds import nest_cost
+from .memoization import is_memoized, memoization_opportunity, memoized_cost
+from .recurrence import extract_recurrence, function_costs, recursive_calls, solve_recurrence
+from .symbolic import Complexity, parse_notation
+
+
+class PatternKind(str, Enum):
+    """Tipos de patrón que reconoce el detector"""
+    SIMPLE_LOOP = 'simple_loop'
+    NESTED_LOOP = 'nested_loop'
+    RECURSION = 'recursion'
+    SORTING = 'sorting'
+    BINARY_SEARCH = 'binary_search'
+    CONSTANT = 'constant'
+    LIBRARY_CALL = 'library_call'
+    IO_CALL = 'io_call'
+
+
+class PatternRecord:
+    """
+    Patrón detectado en el código
+    
+    Los campos estructurados son los que usa el calculador; la descripción
+    en texto solo se genera al mostrarla.
+    """
+    
+    __slots__ = ('kind', 'line', 'end_line', 'depth', 'callee', 'bound', 'construct', 'source', 'match',
+                 'recurrence', 'cost')
+    
+    def __init__(self, kind: PatternKind, line: int, end_line: Optional[int] = None, depth: int = 1,
+                 callee: Optional[str] = None, bound: Optional[str] = None,
+                 construct: Optional[str] = None, source: str = 'ast', match: Optional[str] = None,
+                 recurrence: Optional[str] = None, cost: Optional[str] = None):
+        self.kind = kind
+        self.line = line
+        self.end_line = end_line if end_line is not None else line
+        # Niveles de bucle a partir de este (1 = bucle simple)
+        self.depth = depth
+        # Función llamada: la propia función en una recursión, la de ordenación...
+        self.callee = callee
+        # Variable que acota el bucle (p. ej. n en range(n), arr en for x in arr)
+        self.bound = bound
+        # Construcción sintáctica: 'for', 'while'...
+        self.construct = construct
+        # 'ast' o 'regex' (fallback para otros lenguajes o código que no parsea)
+        self.source = source
+        self.match = match
+        # Recurrencia de una función recursiva, p. ej. 'T(n) = 2T(n/2) + O(n)'
+        self.recurrence = recurrence
+        # Iteraciones de un bucle con sus bucles interiores, p. ej. 'O(log n)'
+        self.cost = cost
+    
+    @property
+    def description(self) -> str:
+        """Descripción legible del patrón"""
+        if self.source == 'regex':
+            return f'Patrón {self.kind.value} detectado'
+        cost = f': {self.cost}' if self.cost else ''
+        if self.kind is PatternKind.SIMPLE_LOOP:
+            return f'Bucle {self.construct} en línea {self.line}{cost}'
+        if self.kind is PatternKind.NESTED_LOOP:
+            depth = f' ({self.depth} niveles)' if self.depth > 2 else ''
+            return f'Bucles anidados en líneas {self.line}-{self.end_line}{depth}{cost}'
+        if self.kind is PatternKind.LIBRARY_CALL:
+            return f'Llamada a {self.callee} en línea {self.line}{cost}'
+        if self.kind is PatternKind.IO_CALL:
+            times = f' ({self.cost} veces)' if self.cost else ''
+            return f'E/S ({self.construct}) {self.callee} en línea {self.line}{times}'
+        if self.kind is PatternKind.RECURSION:
+            recurrence = f': {self.recurrence}' if self.recurrence else ''
+            # En una recursión solo hay coste si está memoizada
+            memoized = f' (memoizada: {self.cost})' if self.cost else ''
+            return f'Función recursiva {self.callee} en línea {self.line}{recurrence}{memoized}'
+        return f'{self.kind.value} en línea {self.line}'
+    
+    def to_dict(self) -> Dict:
+        """Representación serializable (incluye la descripción)"""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['kind'] = self.kind.value
+        data['type'] = self.kind.value
+        data['description'] = self.description
+        return data
+    
+    def __repr__(self) -> str:
+        return f"PatternRecord({self.kind.value}, line={self.line}, depth={self.depth})"
+
+
+# Códigos compactos de las columnas de la tabla
+_KINDS = list(PatternKind)
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+_SOURCES = ['ast', 'regex']
+
+# Sugerencia para las categorías de E/S añadidas por el usuario
+_IO_SUGGESTION = "Agrupa las operaciones de E/S y hazlas una sola vez fuera de la repetición"
+
+# Relevancia de cada tipo para elegir los patrones que se muestran
+_SIGNIFICANCE = {
+    PatternKind.NESTED_LOOP: 10,
+    PatternKind.IO_CALL: 9,
+    PatternKind.RECURSION: 8,
+    PatternKind.SORTING: 6,
+    PatternKind.BINARY_SEARCH: 5,
+    PatternKind.LIBRARY_CALL: 4,
+    PatternKind.SIMPLE_LOOP: 3,
+    PatternKind.CONSTANT: 1,
+}
+
+
+class PatternTable:
+    """
+    Patrones almacenados por columnas
+    
+    Tipo, líneas, profundidad y origen van en arrays compactos; los textos
+    (función llamada, variable límite, construcción, texto casado por la
+    regex) se guardan una sola vez en una tabla de cadenas y las columnas
+    solo guardan su índice. Los PatternRecord se crean al acceder a una fila.
+    """
+    
+    COLUMNS = ('kind', 'line', 'end_line', 'depth', 'source', 'callee', 'bound', 'construct', 'match',
+               'recurrence', 'cost')
+    _STRING_COLUMNS = ('callee', 'bound', 'construct', 'match', 'recurrence', 'cost')
+    
+    def __init__(self):
+        self.kind = array('B')
+        self.line = array('i')
+        self.end_line = array('i')
+        self.depth = array('H')
+        self.source = array('B')
+        # Índice en self.strings; -1 = None
+        self.callee = array('i')
+        self.bound = array('i')
+        self.construct = array('i')
+        self.match = array('i')
+        self.recurrence = array('i')
+        self.cost = array('i')
+        self.strings: List[str] = []
+        self._string_index: Dict[str, int] = {}
+        # Antipatrones de rendimiento encontrados en el mismo recorrido (no van por columnas)
+        self.issues: List[PerformanceIssue] = []
+    
+    def add(self, kind: PatternKind, line: int, end_line: Optional[int] = None, depth: int = 1,
+            callee: Optional[str] = None, bound: Optional[str] = None,
+            construct: Optional[str] = None, source: str = 'ast', match: Optional[str] = None,
+            recurrence: Optional[str] = None, cost: Optional[str] = None):
+        """Añade una fila con los mismos campos que PatternRecord"""
+        self.kind.append(_KIND_CODES[kind])
+        self.line.append(line)
+        self.end_line.append(end_line if end_line is not None else line)
+        self.depth.append(depth)
+        self.source.append(_SOURCES.index(source))
+        self.callee.append(self._intern(callee))
+        self.bound.append(self._intern(bound))
+        self.construct.append(self._intern(construct))
+        self.match.append(self._intern(match))
+        self.recurrence.append(self._intern(recurrence))
+        self.cost.append(self._intern(cost))
+    
+    def extend(self, other: 'PatternTable'):
+        """Añade todas las filas de otra tabla"""
+        self.issues.extend(other.issues)
+        if not self.strings and not len(self):
+            # Caso habitual: la tabla está vacía y se pueden copiar las columnas tal cual
+            for name in self.COLUMNS:
+                getattr(self, name).extend(getattr(other, name))
+            self.strings = list(other.strings)
+            self._string_index = dict(other._string_index)
+            return
+        remap = [self._intern(text) for text in other.strings]
+        for name in self.COLUMNS:
+            column = getattr(other, name)
+            if name in self._STRING_COLUMNS:
+                column = array('i', (remap[i] if i >= 0 else -1 for i in column))
+            getattr(self, name).extend(column)
+    
+    def _intern(self, text: Optional[str]) -> int:
+        if text is None:
+            return -1
+        index = self._string_index.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(text)
+            self._string_index[text] = index
+        return index
+    
+    def _text(self, index: int) -> Optional[str]:
+        return self.strings[index] if index >= 0 else None
+    
+    def __len__(self) -> int:
+        return len(self.kind)
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[PatternRecord, List[PatternRecord]]:
+        if isinstance(index, slice):
+            return [self.record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.record(index)
+    
+    def __iter__(self) -> Iterator[PatternRecord]:
+        for i in range(len(self)):
+            yield self.record(i)
+    
+    def record(self, i: int) -> PatternRecord:
+        """Vista de una fila como PatternRecord"""
+        return PatternRecord(
+            _KINDS[self.kind[i]], self.line[i], end_line=self.end_line[i], depth=self.depth[i],
+            callee=self._text(self.callee[i]), bound=self._text(self.bound[i]),
+            construct=self._text(self.construct[i]), source=_SOURCES[self.source[i]],
+            match=self._text(self.match[i]), recurrence=self._text(self.recurrence[i]),
+            cost=self._text(self.cost[i])
+        )
+    
+    def kinds(self) -> List[PatternKind]:
+        """Columna de tipos sin materializar las filas"""
+        return [_KINDS[code] for code in self.kind]
+    
+    def as_dicts(self) -> Iterator[Dict]:
+        """Vista perezosa como diccionarios (formato anterior, con descripción)"""
+        return (record.to_dict() for record in self)
+    
+    def to_dict(self) -> Dict:
+        """Representación serializable por columnas"""
+        data = {name: getattr(self, name).tolist() for name in self.COLUMNS}
+        data['kind'] = [kind.value for kind in self.kinds()]
+        data['source'] = [_SOURCES[code] for code in self.source]
+        data['strings'] = list(self.strings)
+        data['issues'] = [issue.to_dict() for issue in self.issues]
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PatternTable':
+        """Reconstruye una tabla serializada con to_dict()"""
+        table = cls()
+        table.kind = array('B', (_KIND_CODES[PatternKind(kind)] for kind in data['kind']))
+        table.source = array('B', (_SOURCES.index(source) for source in data['source']))
+        for name in ('line', 'end_line', 'depth') + cls._STRING_COLUMNS:
+            # Las tablas serializadas antes de añadir una columna de texto la reciben vacía
+            values = data.get(name, [-1] * len(data['kind']))
+            setattr(table, name, array(getattr(table, name).typecode, values))
+        table.strings = list(data['strings'])
+        table._string_index = {text: i for i, text in enumerate(table.strings)}
+        table.issues = [PerformanceIssue(**issue) for issue in data.get('issues', [])]
+        return table
+    
+    def take(self, rows: List[int]) -> 'PatternTable':
+        """Nueva tabla independiente con las filas indicadas (copia la tabla de cadenas y los problemas)"""
+        table = PatternTable()
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, (column[i] for i in rows)))
+        table.strings = list(self.strings)
+        table._string_index = dict(self._string_index)
+        table.issues = list(self.issues)
+        return table
+    
+    def deduplicated(self) -> 'PatternTable':
+        """
+        Elimina los patrones repetidos
+        
+        - Un bucle que empieza donde empieza un bucle anidado, o dentro de su
+          tramo, ya está representado por él (el bucle interior de un par
+          aparece como bucle simple y el del medio de un triple como otro par).
+        - Los patrones del mismo tipo, origen y función cuyos tramos se solapan
+          se funden en uno (varias regex que casan la misma recursión).
+        """
+        loops = (_KIND_CODES[PatternKind.SIMPLE_LOOP], _KIND_CODES[PatternKind.NESTED_LOOP])
+        nested = _KIND_CODES[PatternKind.NESTED_LOOP]
+        starts, interior = set(), set()
+        for i in range(len(self)):
+            if self.kind[i] == nested:
+                starts.add((self.source[i], self.line[i]))
+                interior.update((self.source[i], line) for line in range(self.line[i] + 1, self.end_line[i] + 1))
+        
+        kept = []
+        for i in range(len(self)):
+            if self.kind[i] in loops:
+                key = (self.source[i], self.line[i])
+                if key in interior or (self.kind[i] != nested and key in starts):
+                    continue
+            kept.append(i)
+        
+        # Fusión de tramos solapados del mismo tipo
+        kept.sort(key=lambda i: (self.kind[i], self.source[i], self.callee[i], self.line[i], -self.end_line[i]))
+        rows, end_lines, depths = [], {}, {}
+        previous = None
+        for i in kept:
+            group = (self.kind[i], self.source[i], self.callee[i])
+            if previous is not None and group == previous[0] and self.line[i] <= end_lines[previous[1]]:
+                first = previous[1]
+                end_lines[first] = max(end_lines[first], self.end_line[i])
+                depths[first] = max(depths[first], self.depth[i])
+                continue
+            rows.append(i)
+            end_lines[i], depths[i] = self.end_line[i], self.depth[i]
+            previous = (group, i)
+        
+        rows.sort(key=lambda i: (self.line[i], self.kind[i]))
+        table = self.take(rows)
+        table.end_line = array('i', (end_lines[i] for i in rows))
+        table.depth = array('H', (depths[i] for i in rows))
+        return table
+    
+    def contains(self, column: str, value) -> bool:
+        """Indica si alguna fila tiene `value` en la columna, sin materializar filas"""
+        if column == 'kind':
+            return _KIND_CODES[value] in self.kind
+        if column == 'source':
+            return _SOURCES.index(value) in self.source
+        if column in self._STRING_COLUMNS:
+            index = self._string_index.get(value)
+            return index is not None and index in getattr(self, column)
+        return value in getattr(self, column)
+    
+    def counts(self) -> Dict[str, int]:
+        """Número de patrones por tipo"""
+        totals: Dict[str, int] = {}
+        for code in self.kind:
+            kind = _KINDS[code].value
+            totals[kind] = totals.get(kind, 0) + 1
+        return totals
+    
+    def _row_cost(self, i: int) -> Complexity:
+        """Coste de una fila: el analizado, el de su recurrencia o, sin ellos, n elevado a su profundidad"""
+        cost = self.strings[self.cost[i]] if self.cost[i] >= 0 else None
+        expression = parse_notation(cost) if cost else None
+        if expression is None and self.recurrence[i] >= 0:
+            expression = solve_recurrence(self.strings[self.recurrence[i]])
+        if expression is None and _KINDS[self.kind[i]] in (PatternKind.SIMPLE_LOOP, PatternKind.NESTED_LOOP):
+            expression = Complexity.poly('n', self.depth[i])
+        return expression if expression is not None else Complexity.constant()
+    
+    def top(self, k: int) -> 'PatternTable':
+        """
+        Los k patrones más costosos, en orden de línea
+        
+        Se ordenan por su coste y, a igual coste, por la relevancia del tipo
+        y la profundidad.
+        """
+        if len(self) <= k:
+            return self.take(list(range(len(self))))
+        costs = [self._row_cost(i).order_key() for i in range(len(self))]
+        ranked = sorted(range(len(self)), key=lambda i: (
+            costs[i], _SIGNIFICANCE[_KINDS[self.kind[i]]] + self.depth[i], -self.line[i]
+        ), reverse=True)
+        return self.take(sorted(ranked[:k], key=lambda i: self.line[i]))
+    
+    def __repr__(self) -> str:
+        return f"PatternTable({len(self)} patrones)"
+
+
+def _loop_bound(node: ast.AST) -> Optional[str]:
+    """Nombre de la variable que acota un bucle for/while, si es evidente"""
+    if isinstance(node, ast.For):
+        target = node.iter
+        if isinstance(target, ast.Call) and isinstance(target.func, ast.Name) and \
+                target.func.id == 'range' and target.args:
+            # range(n), range(a, n), range(len(arr)): el límite superior
+            target = target.args[1] if len(target.args) > 1 else target.args[0]
+        if isinstance(target, ast.Call) and isinstance(target.func, ast.Name) and \
+                target.func.id == 'len' and target.args:
+            target = target.args[0]
+    else:
+        target = node.test
+    for child in ast.walk(target):
+        if isinstance(child, ast.Name):
+            return child.id
+    return None
+
+
+def _loop_depth(node: ast.AST) -> int:
+    """Máxima profundidad de bucles anidados a partir de un bucle"""
+    deepest = 0
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, (ast.For, ast.While)):
+            deepest = max(deepest, _loop_depth(child))
+        else:
+            stack.extend(ast.iter_child_nodes(child))
+    return 1 + deepest
 
 
 class PatternDetector:
     """Detecta patrones en código fuente que indican complejidad temporal"""
     
-    def __init__(self):
+    def __init__(self, io_catalog: Optional[IOCatalog] = None):
         self.patterns = {
             'python': self._get_python_patterns(),
             'javascript': self._get_javascript_patterns(),
             'java': self._get_java_patterns(),
             'cpp': self._get_cpp_patterns()
         }
+        self.performance_rules = PerformanceRuleSet()
+        self.io_catalog = io_catalog if io_catalog is not None else IOCatalog()
     
-    def detect_patterns(self, code: str, language: str = 'python') -> List[Dict]:
+    def detect_patterns(self, code: str, language: str = 'python') -> PatternTable:
         """
         Detecta patrones en el código fuente
         
@@ -27,9 +414,9 @@ class PatternDetector:
             language: Lenguaje de programación
             
         Returns:
-            Lista de patrones detectados
+            Tabla de patrones detectados, sin repeticiones
         """
-        patterns = []
+        patterns = PatternTable()
         
         if language == 'python':
             patterns.extend(self._detect_python_patterns(code))
@@ -40,29 +427,29 @@ class PatternDetector:
         elif language == 'cpp':
             patterns.extend(self._detect_cpp_patterns(code))
         
-        return patterns
+        return patterns.deduplicated()
     
     def _get_python_patterns(self) -> Dict:
         """Patrones específicos para Python"""
         return {
-            'nested_loops': [
+            PatternKind.NESTED_LOOP: [
                 r'for\s+\w+\s+in\s+.*:\s*\n.*for\s+\w+\s+in\s+.*:',
                 r'while\s+.*:\s*\n.*while\s+.*:'
             ],
-            'simple_loops': [
+            PatternKind.SIMPLE_LOOP: [
                 r'for\s+\w+\s+in\s+.*:',
                 r'while\s+.*:'
             ],
-            'recursion': [
+            PatternKind.RECURSION: [
                 r'def\s+\w+\s*\(.*\):\s*\n.*\w+\s*\(.*\)',
                 r'return\s+\w+\s*\(.*\)'
             ],
-            'sorting': [
+            PatternKind.SORTING: [
                 r'sort\s*\(',
                 r'sorted\s*\(',
                 r'\.sort\s*\('
             ],
-            'binary_search': [
+            PatternKind.BINARY_SEARCH: [
                 r'//\s*2',
                 r'\/\s*2',
                 r'mid\s*=',
@@ -73,20 +460,20 @@ class PatternDetector:
     def _get_javascript_patterns(self) -> Dict:
         """Patrones específicos para JavaScript"""
         return {
-            'nested_loops': [
+            PatternKind.NESTED_LOOP: [
                 r'for\s*\(.*\)\s*{\s*\n.*for\s*\(.*\)\s*{',
                 r'while\s*\(.*\)\s*{\s*\n.*while\s*\(.*\)\s*{'
             ],
-            'simple_loops': [
+            PatternKind.SIMPLE_LOOP: [
                 r'for\s*\(.*\)\s*{',
                 r'while\s*\(.*\)\s*{',
                 r'forEach\s*\('
             ],
-            'recursion': [
+            PatternKind.RECURSION: [
                 r'function\s+\w+\s*\(.*\)\s*{\s*\n.*\w+\s*\(.*\)',
                 r'return\s+\w+\s*\(.*\)'
             ],
-            'sorting': [
+            PatternKind.SORTING: [
                 r'\.sort\s*\(',
                 r'sort\s*\('
             ]
@@ -95,20 +482,20 @@ class PatternDetector:
     def _get_java_patterns(self) -> Dict:
         """Patrones específicos para Java"""
         return {
-            'nested_loops': [
+            PatternKind.NESTED_LOOP: [
                 r'for\s*\(.*\)\s*{\s*\n.*for\s*\(.*\)\s*{',
                 r'while\s*\(.*\)\s*{\s*\n.*while\s*\(.*\)\s*{'
             ],
-            'simple_loops': [
+            PatternKind.SIMPLE_LOOP: [
                 r'for\s*\(.*\)\s*{',
                 r'while\s*\(.*\)\s*{',
                 r'for\s*\(.*:\s*.*\)'
             ],
-            'recursion': [
+            PatternKind.RECURSION: [
                 r'public\s+.*\s+\w+\s*\(.*\)\s*{\s*\n.*\w+\s*\(.*\)',
                 r'return\s+\w+\s*\(.*\)'
             ],
-            'sorting': [
+            PatternKind.SORTING: [
                 r'\.sort\s*\(',
                 r'Arrays\.sort',
                 r'Collections\.sort'
@@ -118,27 +505,27 @@ class PatternDetector:
     def _get_cpp_patterns(self) -> Dict:
         """Patrones específicos para C++"""
         return {
-            'nested_loops': [
+            PatternKind.NESTED_LOOP: [
                 r'for\s*\(.*\)\s*{\s*\n.*for\s*\(.*\)\s*{',
                 r'while\s*\(.*\)\s*{\s*\n.*while\s*\(.*\)\s*{'
             ],
-            'simple_loops': [
+            PatternKind.SIMPLE_LOOP: [
                 r'for\s*\(.*\)\s*{',
                 r'while\s*\(.*\)\s*{'
             ],
-            'recursion': [
+            PatternKind.RECURSION: [
                 r'\w+\s+\w+\s*\(.*\)\s*{\s*\n.*\w+\s*\(.*\)',
                 r'return\s+\w+\s*\(.*\)'
             ],
-            'sorting': [
+            PatternKind.SORTING: [
                 r'sort\s*\(',
                 r'std::sort'
             ]
         }
     
-    def _detect_python_patterns(self, code: str) -> List[Dict]:
+    def _detect_python_patterns(self, code: str) -> PatternTable:
         """Detecta patrones específicos de Python"""
-        patterns = []
+        patterns = PatternTable()
         
         try:
             # Análisis AST para Python
@@ -150,90 +537,206 @@ class PatternDetector:
         
         return patterns
     
-    def _analyze_python_ast(self, tree: ast.AST) -> List[Dict]:
+    def _analyze_python_ast(self, tree: ast.AST) -> PatternTable:
         """Analiza el AST de Python para detectar patrones"""
-        patterns = []
+        patterns = PatternTable()
+        helpers = None
+        types = infer_types(tree)
+        costs = {}
+        # Bucle más interior que contiene cada nodo (ast.walk visita antes los exteriores)
+        loops: Dict[int, LoopContext] = {}
+        in_loops = set()
+        # Función recursiva más interior que contiene cada nodo: (línea, invocaciones o None)
+        recursive: Dict[int, tuple] = {}
         
         for node in ast.walk(tree):
-            if isinstance(node, ast.For):
-                patterns.append({
-                    'type': 'simple_loop',
-                    'description': f'Bucle for en línea {node.lineno}',
-                    'line': node.lineno
-                })
-            elif isinstance(node, ast.While):
-                patterns.append({
-                    'type': 'simple_loop',
-                    'description': f'Bucle while en línea {node.lineno}',
-                    'line': node.lineno
-                })
+            loop = loops.get(id(node))
+            if loop is not None:
+                patterns.issues.extend(self.performance_rules.check(node, loop, types))
+            if isinstance(node, ast.Call) and (loop is not None or id(node) in recursive):
+                self._report_io_call(patterns, node, loop, recursive.get(id(node)))
+            
+            if isinstance(node, (ast.For, ast.While)):
+                patterns.add(
+                    PatternKind.SIMPLE_LOOP, node.lineno,
+                    construct='for' if isinstance(node, ast.For) else 'while',
+                    bound=_loop_bound(node), cost=nest_cost(node, tree, types, costs).notation
+                )
+                # Las llamadas dentro del bucle ya cuentan en su coste; el iterable
+                # de un for se evalúa una vez y pertenece al bucle exterior, y la
+                # expresión de un return sale del bucle y cuenta una sola vez
+                context = self.performance_rules.loop_context(node, loop, tree)
+                header = {id(child) for child in ast.walk(node.iter)} if isinstance(node, ast.For) else set()
+                exits = {id(child) for statement in ast.walk(node) if isinstance(statement, ast.Return)
+                         for child in ast.walk(statement)}
+                for child in ast.walk(node):
+                    if child is not node and id(child) not in exits:
+                        in_loops.add(id(child))
+                        if id(child) not in header:
+                            loops[id(child)] = context
+            elif isinstance(node, (ast.Call, ast.Compare, ast.Subscript)) and id(node) not in in_loops:
+                known = call_cost(node, types)
+                if known is not None and known[1] is not Complexity.constant():
+                    patterns.add(PatternKind.LIBRARY_CALL, node.lineno, callee=known[0], cost=known[1].notation)
             elif isinstance(node, ast.FunctionDef):
                 # Buscar recursión
                 for child in ast.walk(node):
                     if isinstance(child, ast.Call) and isinstance(child.func, ast.Name):
                         if child.func.id == node.name:
-                            patterns.append({
-                                'type': 'recursion',
-                                'description': f'Función recursiva {node.name} en línea {node.lineno}',
-                                'line': node.lineno
-                            })
+                            if helpers is None:
+                                helpers = function_costs(tree)
+                            recurrence = extract_recurrence(node, helpers)
+                            # Con @lru_cache o una tabla propia cuesta lo que sus estados distintos
+                            memoized = memoized_cost(node, recurrence, helpers) if is_memoized(node) else None
+                            patterns.add(
+                                PatternKind.RECURSION, node.lineno,
+                                end_line=getattr(node, 'end_lineno', None), callee=node.name,
+                                recurrence=recurrence, cost=memoized.notation if memoized else None
+                            )
+                            if memoized is not None:
+                                # Cota de las invocaciones: cada estado se calcula una vez
+                                calls = memoized
+                            else:
+                                calls = recursive_calls(recurrence) if recurrence else None
+                            self._report_memoization(patterns, node, recurrence, helpers)
+                            for descendant in ast.walk(node):
+                                recursive[id(descendant)] = (node.lineno, calls)
                             break
         
         # Detectar bucles anidados
-        nested_loops = self._detect_nested_loops_ast(tree)
+        nested_loops = self._detect_nested_loops_ast(tree, types, costs)
         patterns.extend(nested_loops)
         
         return patterns
     
-    def _detect_nested_loops_ast(self, tree: ast.AST) -> List[Dict]:
+    def _report_io_call(self, patterns: PatternTable, node: ast.Call, loop: Optional[LoopContext],
+                        recursion: Optional[tuple]):
+        """
+        Registra una llamada de E/S que se repite por estar en un bucle o una recursión
+        
+        El multiplicador son las iteraciones de los bucles que la rodean por
+        las invocaciones de la función recursiva; si la recurrencia no se ha
+        resuelto se registra sin coste.
+        """
+        name = dotted_name(node)
+        found = self.io_catalog.match('python', name)
+        if found is None:
+            return
+        receiver = node.func.value if isinstance(node.func, ast.Attribute) else None
+        if isinstance(receiver, ast.Call) and self.io_catalog.match('python', dotted_name(receiver)):
+            # requests.get(url).json(): la E/S es la llamada interior, que se registra aparte
+            return
+        category = found[0]
+        times = loop.iterations if loop is not None else Complexity.constant()
+        if recursion is not None:
+            times = times * recursion[1] if recursion[1] is not None else None
+        if times is Complexity.constant():
+            # Bucle de vueltas fijas: no crece con la entrada
+            return
+        
+        notation = times.notation if times is not None else None
+        patterns.add(PatternKind.IO_CALL, node.lineno, callee=name, construct=category, cost=notation)
+        if loop is not None:
+            rule, outer, where = 'io_in_loop', loop.node.lineno, 'un bucle'
+        else:
+            rule, outer, where = 'io_in_recursion', recursion[0], 'una función recursiva'
+        patterns.issues.append(PerformanceIssue(
+            rule, node.lineno, outer, 'O(1)', notation or 'desconocido',
+            f"Llamada de E/S ({category}) `{name}` dentro de {where}", IO_SUGGESTIONS.get(category, _IO_SUGGESTION)
+        ))
+    
+    def _report_memoization(self, patterns: PatternTable, func: ast.FunctionDef, recurrence: Optional[str],
+                            helpers: Dict[str, Complexity]):
+        """Sugiere memoizar una función recursiva pura cuyos subproblemas se solapan"""
+        improved = memoization_opportunity(func, recurrence, self.io_catalog, helpers)
+        if improved is None:
+            return
+        solved = solve_recurrence(recurrence) if recurrence else None
+        current = solved.notation if solved is not None else 'desconocido'
+        change = f"de {current} a {improved.notation}" if solved is not None else f"a {improved.notation}"
+        patterns.issues.append(PerformanceIssue(
+            'memoization', func.lineno, func.lineno, current, current,
+            f"`{func.name}` repite los mismos subproblemas en sus llamadas recursivas",
+            f"Memoízala con @functools.lru_cache(maxsize=None) o usa una tabla de programación dinámica: "
+            f"pasaría {change}",
+            improved_cost=improved.notation
+        ))
+    
+    def _detect_nested_loops_ast(self, tree: ast.AST, types: Optional[Dict[str, str]] = None,
+                                 costs: Optional[Dict] = None) -> PatternTable:
         """Detecta bucles anidados usando AST"""
-        patterns = []
+        patterns = PatternTable()
+        costs = {} if costs is None else costs
         
         for node in ast.walk(tree):
             if isinstance(node, (ast.For, ast.While)):
                 # Buscar bucles anidados dentro de este bucle
                 for child in ast.walk(node):
                     if isinstance(child, (ast.For, ast.While)) and child != node:
-                        patterns.append({
-                            'type': 'nested_loop',
-                            'description': f'Bucles anidados en líneas {node.lineno}-{child.lineno}',
-                            'line': node.lineno
-                        })
+                        patterns.add(
+                            PatternKind.NESTED_LOOP, node.lineno, end_line=child.lineno,
+                            depth=_loop_depth(node),
+                            construct='for' if isinstance(node, ast.For) else 'while',
+                            bound=_loop_bound(node), cost=nest_cost(node, tree, types, costs).notation
+                        )
                         break
         
         return patterns
     
-    def _detect_javascript_patterns(self, code: str) -> List[Dict]:
+    def _detect_javascript_patterns(self, code: str) -> PatternTable:
         """Detecta patrones específicos de JavaScript"""
         return self._analyze_regex_patterns(code, 'javascript')
     
-    def _detect_java_patterns(self, code: str) -> List[Dict]:
+    def _detect_java_patterns(self, code: str) -> PatternTable:
         """Detecta patrones específicos de Java"""
         return self._analyze_regex_patterns(code, 'java')
     
-    def _detect_cpp_patterns(self, code: str) -> List[Dict]:
+    def _detect_cpp_patterns(self, code: str) -> PatternTable:
         """Detecta patrones específicos de C++"""
         return self._analyze_regex_patterns(code, 'cpp')
     
-    def _analyze_regex_patterns(self, code: str, language: str) -> List[Dict]:
+    def _analyze_regex_patterns(self, code: str, language: str) -> PatternTable:
         """Analiza patrones usando expresiones regulares"""
-        patterns = []
+        patterns = PatternTable()
         lang_patterns = self.patterns.get(language, {})
         
-        for pattern_type, regex_list in lang_patterns.items():
+        for kind, regex_list in lang_patterns.items():
             for regex in regex_list:
                 matches = re.finditer(regex, code, re.MULTILINE | re.DOTALL)
                 for match in matches:
-                    patterns.append({
-                        'type': pattern_type,
-                        'description': f'Patrón {pattern_type} detectado',
-                        'line': code[:match.start()].count('\n') + 1,
-                        'match': match.group()
-                    })
+                    line = code.count('\n', 0, match.start()) + 1
+                    patterns.add(
+                        kind, line,
+                        end_line=line + match.group().count('\n'),
+                        # Los bucles anidados por regex solo reconocen dos niveles
+                        depth=2 if kind is PatternKind.NESTED_LOOP else 1,
+                        source='regex', match=match.group()
+                    )
+        
+        # Llamadas de biblioteca, multiplicadas por los bucles que las rodean
+        for callee, line, cost in regex_call_costs(code, language):
+            patterns.add(PatternKind.LIBRARY_CALL, line, callee=callee, cost=cost.notation, source='regex')
+        
+        # Llamadas de E/S dentro de bucles
+        if language != 'python':
+            nesting = None
+            for name, category, position in self.io_catalog.find_calls(code, language):
+                if nesting is None:
+                    nesting = loop_nesting(code)
+                depth, start = nesting[position]
+                if not depth:
+                    continue
+                line = code.count('\n', 0, position) + 1
+                times = (Complexity.poly('n') ** depth).notation
+                patterns.add(PatternKind.IO_CALL, line, callee=name, construct=category, cost=times, source='regex')
+                patterns.issues.append(PerformanceIssue(
+                    'io_in_loop', line, code.count('\n', 0, start) + 1, 'O(1)', times,
+                    f"Llamada de E/S ({category}) `{name}` dentro de un bucle", IO_SUGGESTIONS.get(category, _IO_SUGGESTION)
+                ))
         
         return patterns
     
-    def get_pattern_summary(self, patterns: List[Dict]) -> str:
+    def get_pattern_summary(self, patterns: List[PatternRecord]) -> str:
         """Genera un resumen de los patrones detectados"""
         if not patterns:
             return "No se detectaron patrones específicos"
@@ -242,7 +745,7 @@ class PatternDetector:
         
         pattern_counts = {}
         for pattern in patterns:
-            pattern_type = pattern['type']
+            pattern_type = pattern.kind.value
             pattern_counts[pattern_type] = pattern_counts.get(pattern_type, 0) + 1
         
         for pattern_type, count in pattern_counts.items():
@@ -0,0 +1,395 @@
+"""
+Recurrencias de funciones recursivas
+Extrae del AST la forma T(n) = Σ aᵢ·T(bᵢ·n) + f(n) (o T(n - c) para las que
+reducen la entrada de uno en uno) y la resuelve con el teorema maestro en su
+forma general de Akra–Bazzi. Las soluciones se memorizan por firma
+"""
+
+import ast
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from .call_costs import call_cost, infer_types
+from .symbolic import Complexity, parse_notation
+
+
+# Reducción de la entrada en una llamada: ('divide', fracción) o ('subtract', c)
+Shrink = Tuple[str, Fraction]
+
+_CALL_TERM = re.compile(r'^(?P<loop>n·)?(?P<count>\d*)T\((?:(?P<num>\d*)n/(?P<den>\d+)|n-(?P<dec>\d+))\)$')
+
+
+def halving_factor(node: ast.AST) -> Optional[Fraction]:
+    """Fracción de la entrada que conserva una expresión como n // 2, lo + hi >> 1 o 2 * n // 3"""
+    for child in ast.walk(node):
+        if not isinstance(child, ast.BinOp) or not isinstance(child.right, ast.Constant):
+            continue
+        divisor = child.right.value
+        if not isinstance(divisor, (int, float)) or isinstance(divisor, bool):
+            continue
+        if isinstance(child.op, (ast.FloorDiv, ast.Div)) and divisor > 1:
+            numerator = 1
+            if isinstance(child.left, ast.BinOp) and isinstance(child.left.op, ast.Mult) and \
+                    isinstance(child.left.left, ast.Constant) and isinstance(child.left.left.value, int):
+                numerator = child.left.left.value
+            if numerator < divisor:
+                return Fraction(numerator) / Fraction(str(divisor))
+        if isinstance(child.op, ast.RShift) and isinstance(divisor, int) and divisor >= 1:
+            return Fraction(1, 2 ** divisor)
+    return None
+
+
+def _doubling_factor(node: ast.AST) -> Optional[Fraction]:
+    """Índice que se multiplica (2 * i + 1 en un montículo): lo que queda por recorrer se divide"""
+    for child in ast.walk(node):
+        if not isinstance(child, ast.BinOp) or not isinstance(child.op, ast.Mult):
+            continue
+        for factor, operand in ((child.left, child.right), (child.right, child.left)):
+            if isinstance(factor, ast.Constant) and isinstance(factor.value, int) and \
+                    not isinstance(factor.value, bool) and factor.value > 1 and isinstance(operand, ast.Name):
+                return Fraction(1, factor.value)
+    return None
+
+
+def halving_names(scope: ast.AST) -> Dict[str, Fraction]:
+    """Variables asignadas a partir de una división de la entrada (mid = (lo + hi) // 2, left = 2 * i + 1...)"""
+    names: Dict[str, Fraction] = {}
+    # Dos pasadas: left = arr[:mid] depende de mid
+    for _ in range(2):
+        for node in ast.walk(scope):
+            if not isinstance(node, ast.Assign):
+                continue
+            factor = halving_factor(node.value) or _doubling_factor(node.value) or _named_factor(node.value, names)
+            if factor is None:
+                continue
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    names[target.id] = factor
+    return names
+
+
+def _named_factor(node: ast.AST, names: Dict[str, Fraction]) -> Optional[Fraction]:
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and child.id in names:
+            return names[child.id]
+    return None
+
+
+# Funciones cuyo resultado es una medida de la entrada, no un punto de corte
+_SIZE_CALLS = {'len', 'int', 'abs', 'min', 'max', 'sum', 'round'}
+
+
+def _is_partition(node: ast.AST, parts: Set[str]) -> bool:
+    """
+    Parte de la entrada de tamaño desconocido
+
+    Comprensiones filtradas ([x for x in arr if x < p]), porciones con
+    límites variables (arr[:p], arr[p + 1:]) y su concatenación, índices
+    junto a un punto de corte (p - 1 con p = partition(...)) o variables
+    asignadas con ellas.
+    """
+    if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
+        return any(generator.ifs for generator in node.generators)
+    if isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice):
+        bounds = [b for b in (node.slice.lower, node.slice.upper) if b is not None]
+        return any(isinstance(child, ast.Name) for bound in bounds for child in ast.walk(bound))
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add) and \
+            _is_partition(node.left, parts) and _is_partition(node.right, parts):
+        # arr[:i] + arr[i + 1:]: la entrada sin un elemento
+        return True
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Sub, ast.Add)) and \
+            isinstance(node.right, ast.Constant):
+        node = node.left
+    return isinstance(node, ast.Name) and node.id in parts
+
+
+def partition_names(func: ast.FunctionDef) -> Set[str]:
+    """Partes de la entrada (left = [x for x in arr if x < p]) y puntos de corte (p = partition(...))"""
+    names: Set[str] = set()
+    for node in ast.walk(func):
+        if not isinstance(node, ast.Assign):
+            continue
+        value = node.value
+        split = isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and \
+            value.func.id not in _SIZE_CALLS and value.func.id != func.name
+        if split or (isinstance(value, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.Subscript, ast.BinOp)) and
+                     _is_partition(value, names)):
+            names.update(target.id for target in node.targets if isinstance(target, ast.Name))
+    return names
+
+
+def _argument_shrink(arg: ast.AST, names: Dict[str, Fraction], parts: Set[str]) -> Optional[Shrink]:
+    """Cómo reduce la entrada un argumento de la llamada recursiva; None si no la reduce"""
+    factor = halving_factor(arg) or _doubling_factor(arg) or _named_factor(arg, names)
+    if factor is not None:
+        return ('divide', factor)
+    if _is_partition(arg, parts):
+        return ('partition', Fraction(1))
+    if isinstance(arg, ast.Subscript) and isinstance(arg.slice, ast.Slice):
+        # arr[1:], arr[:-1]: un elemento menos
+        return ('subtract', Fraction(1))
+    if isinstance(arg, ast.BinOp) and isinstance(arg.op, (ast.Sub, ast.Add)) and \
+            isinstance(arg.right, ast.Constant) and isinstance(arg.right.value, int) and arg.right.value > 0:
+        # n - 1 reduce la entrada; i + 1 avanza un índice hacia el final
+        return ('subtract', Fraction(arg.right.value))
+    return None
+
+
+def _call_shrink(call: ast.Call, names: Dict[str, Fraction], parts: Set[str]) -> Optional[Shrink]:
+    shrinks = [_argument_shrink(arg, names, parts) for arg in list(call.args) + [kw.value for kw in call.keywords]]
+    # Preferencia: división, resta (n - 1) y, por último, partición
+    for mode in ('divide', 'subtract', 'partition'):
+        found = [s for s in shrinks if s and s[0] == mode]
+        if found:
+            return max(found, key=lambda s: s[1]) if mode == 'divide' else min(found, key=lambda s: s[1])
+    return None
+
+
+def _calls_in(node: ast.AST, name: str) -> List[ast.Call]:
+    """Llamadas a `name` dentro de un nodo, sin entrar en funciones anidadas"""
+    calls = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, ast.Call) and isinstance(current.func, ast.Name) and current.func.id == name:
+            calls.append(current)
+        for child in ast.iter_child_nodes(current):
+            if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                stack.append(child)
+    return calls
+
+
+def _terminates(statements: List[ast.stmt]) -> bool:
+    return bool(statements) and isinstance(statements[-1], (ast.Return, ast.Raise))
+
+
+def _constant_iterations(loop: ast.AST) -> Optional[int]:
+    """Vueltas de un bucle de tamaño fijo (range(4), un literal); None si dependen de la entrada"""
+    if not isinstance(loop, ast.For):
+        return None
+    iterable = loop.iter
+    if isinstance(iterable, (ast.List, ast.Tuple, ast.Set)):
+        return max(len(iterable.elts), 1)
+    if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Name) and iterable.func.id == 'range' and \
+            iterable.args and not iterable.keywords and \
+            all(isinstance(a, ast.Constant) and isinstance(a.value, int) for a in iterable.args):
+        try:
+            return max(len(range(*(a.value for a in iterable.args))), 1)
+        except ValueError:
+            return None
+    return None
+
+
+def _path_calls(statements: List[ast.stmt], name: str) -> List[Tuple[ast.Call, Optional[int]]]:
+    """
+    Llamadas recursivas del camino de ejecución con más llamadas
+
+    Las ramas de un if son alternativas (cuenta la que más llama); si una rama
+    termina con return, el resto del bloque es la alternativa. Cada llamada va
+    acompañada de las veces que se repite: 1 fuera de bucles, las vueltas de
+    los bucles de tamaño fijo que la rodean o None si un bucle depende de la
+    entrada.
+    """
+    calls: List[Tuple[ast.Call, Optional[int]]] = []
+    for i, statement in enumerate(statements):
+        if isinstance(statement, ast.If):
+            calls.extend((call, 1) for call in _calls_in(statement.test, name))
+            body = _path_calls(statement.body, name)
+            if _terminates(statement.body):
+                rest = _path_calls(statement.orelse + statements[i + 1:], name)
+                return calls + max(body, rest, key=len)
+            orelse = _path_calls(statement.orelse, name)
+            calls.extend(max(body, orelse, key=len))
+        elif isinstance(statement, (ast.For, ast.While)):
+            header = statement.iter if isinstance(statement, ast.For) else statement.test
+            calls.extend((call, 1) for call in _calls_in(header, name))
+            iterations = _constant_iterations(statement)
+            for call, times in _path_calls(statement.body + statement.orelse, name):
+                calls.append((call, None if iterations is None or times is None else iterations * times))
+        elif isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        else:
+            calls.extend((call, 1) for call in _calls_in(statement, name))
+    return calls
+
+
+def _body_loop_depth(node: ast.AST) -> int:
+    """Profundidad máxima de bucles en el cuerpo, sin entrar en funciones anidadas"""
+    deepest = 0
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            continue
+        depth = _body_loop_depth(child)
+        if isinstance(child, (ast.For, ast.While, ast.comprehension)):
+            depth += 1
+        deepest = max(deepest, depth)
+    return deepest
+
+
+def function_costs(tree: ast.AST) -> Dict[str, Complexity]:
+    """Coste no recursivo de cada función del módulo según sus bucles (para funciones auxiliares)"""
+    return {
+        node.name: Complexity.poly('n', _body_loop_depth(node))
+        for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    }
+
+
+def _work(func: ast.FunctionDef, helpers: Dict[str, Complexity]) -> Complexity:
+    """Trabajo no recursivo f(n): bucles propios, copias de la entrada, funciones auxiliares y de biblioteca"""
+    work = Complexity.poly('n', _body_loop_depth(func))
+    types = infer_types(func)
+    for node in ast.walk(func):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and \
+                node.func.id != func.name and node.func.id in helpers:
+            work = work + helpers[node.func.id]
+        elif isinstance(node, (ast.Call, ast.Compare, ast.Subscript)):
+            # Incluye las porciones: pasar arr[1:] a la llamada copia la entrada
+            known = call_cost(node, types)
+            if known is not None:
+                work = work + known[1]
+    return work
+
+
+def _term_order(item) -> Tuple:
+    # Orden canónico: divisiones de mayor a menor fracción, luego restas de menor a mayor
+    (in_loop, (mode, amount)), _ = item
+    return (mode, -amount if mode == 'divide' else amount, in_loop)
+
+
+def extract_recurrence(func: ast.FunctionDef, helpers: Optional[Dict[str, Complexity]] = None) -> Optional[str]:
+    """
+    Firma canónica de la recurrencia de una función recursiva
+
+    Args:
+        func: Definición de la función
+        helpers: Coste de las demás funciones del módulo (ver function_costs)
+
+    Returns:
+        Firma como 'T(n) = 2T(n/2) + O(n)', o None si alguna llamada no
+        reduce la entrada de forma reconocible
+    """
+    path = _path_calls(func.body, func.name)
+    if not path:
+        return None
+
+    names = halving_names(func)
+    partitions = partition_names(func)
+    terms: Dict[Tuple[bool, Shrink], int] = {}
+    partitioned = False
+    for call, times in path:
+        shrink = _call_shrink(call, names, partitions)
+        if shrink is None:
+            return None
+        in_loop = times is None
+        if shrink[0] == 'partition':
+            # Las partes suman a lo sumo n - 1 elementos: en el peor caso una
+            # los tiene todos y las demás están vacías (quicksort con mal pivote)
+            shrink = ('subtract', Fraction(1))
+            if not in_loop:
+                if partitioned:
+                    continue
+                partitioned, times = True, 1
+        key = (in_loop, shrink)
+        terms[key] = terms.get(key, 0) + (times or 1)
+
+    parts = []
+    for (in_loop, (mode, amount)), count in sorted(terms.items(), key=_term_order):
+        prefix = ('n·' if in_loop else '') + (str(count) if count > 1 else '')
+        if mode == 'divide':
+            numerator = str(amount.numerator) if amount.numerator > 1 else ''
+            parts.append(f'{prefix}T({numerator}n/{amount.denominator})')
+        else:
+            parts.append(f'{prefix}T(n-{amount.numerator})')
+
+    work = _work(func, helpers or {})
+    return f"T(n) = {' + '.join(parts)} + {work.notation}"
+
+
+def _critical_exponent(terms: List[Tuple[int, Fraction]]) -> float:
+    """Exponente p de Akra–Bazzi: Σ aᵢ·bᵢᵖ = 1"""
+    low, high = 0.0, 1.0
+    while sum(a * float(b) ** high for a, b in terms) > 1:
+        high *= 2
+    for _ in range(60):
+        middle = (low + high) / 2
+        if sum(a * float(b) ** middle for a, b in terms) > 1:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+def _exponent(value: float):
+    nearest = round(value)
+    if abs(value - nearest) < 1e-6:
+        return nearest
+    return Fraction(str(round(value, 2)))
+
+
+@lru_cache(maxsize=1024)
+def solve_recurrence(signature: str) -> Optional[Complexity]:
+    """
+    Resuelve una recurrencia con la firma de extract_recurrence
+
+    - T(n) = a·T(bn) + Θ(nᵈ logᵏ n) (Akra–Bazzi, que incluye el teorema
+      maestro): con p tal que Σ aᵢ·bᵢᵖ = 1, el resultado es nᵈ logᵏ n si d > p,
+      nᵖ logᵏ⁺¹ n si d = p y nᵖ si d < p.
+    - T(n) = T(n - c) + f(n): n·f(n).
+    - T(n) = a·T(n - c) + f(n) con a > 1: aⁿ.
+    - Llamadas dentro de un bucle que depende de la entrada: cada nivel
+      multiplica las ramas por sus n vueltas. Si reducen de uno en uno, n!;
+      si dividen, n^Θ(log n), que supera cualquier polinomio y se acota con 2ⁿ.
+
+    Returns:
+        La complejidad, o None si la firma mezcla formas que no se resuelven
+    """
+    _, _, rhs = signature.partition(' = ')
+    parts = rhs.split(' + ')
+    work = parse_notation(parts[-1])
+    if work is None or len(work.terms) != 1:
+        return None
+
+    divides: List[Tuple[int, Fraction]] = []
+    subtracts = 0
+    loop_modes = set()
+    for part in parts[:-1]:
+        match = _CALL_TERM.match(part)
+        if not match:
+            return None
+        count = int(match.group('count') or 1)
+        mode = 'divide' if match.group('den') else 'subtract'
+        if match.group('loop'):
+            loop_modes.add(mode)
+        elif mode == 'divide':
+            divides.append((count, Fraction(int(match.group('num') or 1), int(match.group('den')))))
+        else:
+            subtracts += count
+
+    if 'subtract' in loop_modes:
+        return Complexity.factorial('n')
+    if loop_modes:
+        return Complexity.exp('n')
+    if divides and subtracts:
+        return None
+    if subtracts:
+        if subtracts == 1:
+            return work * Complexity.poly('n')
+        return Complexity.exp('n', subtracts)
+
+    _, _, power, logs = work.terms[0].growth('n')
+    p = _critical_exponent(divides)
+    if power > p + 1e-6:
+        return work
+    if abs(power - p) <= 1e-6:
+        return work * Complexity.log('n')
+    return Complexity.poly('n', _exponent(p))
+
+
+def recursive_calls(signature: str) -> Optional[Complexity]:
+    """Número total de invocaciones de una función recursiva: su recurrencia con trabajo O(1)"""
+    calls, separator, _ = signature.rpartition(' + ')
+    if not separator:
+        return None
+    return solve_recurrence(f"{calls} + O(1)")
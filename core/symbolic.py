@@ -0,0 +1,318 @@
+"""
+Álgebra simbólica de complejidades
+Una complejidad es una suma de monomios; cada monomio es un producto de
+factores polinómicos, logarítmicos, exponenciales y factoriales sobre
+variables con nombre. Las formas canónicas se internan (dos expresiones
+iguales son el mismo objeto) y las operaciones se memorizan
+"""
+
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+
+Number = Union[int, Fraction]
+
+_SUPERSCRIPTS = {'2': '²', '3': '³'}
+
+
+class Monomial:
+    """
+    Producto de factores por variable: v! ^ f · b^v · v^p · log(v)^l
+
+    Cada variable tiene una clave de crecimiento (f, b, p, l) que se compara
+    lexicográficamente: un factorial domina a cualquier exponencial, una
+    exponencial de base mayor a una menor, y así sucesivamente.
+    """
+
+    __slots__ = ('factors', '_hash')
+
+    _interned: Dict[Tuple, 'Monomial'] = {}
+
+    def __new__(cls, factors: Tuple[Tuple[str, Tuple[Number, Number, Number, Number]], ...]):
+        monomial = cls._interned.get(factors)
+        if monomial is None:
+            monomial = super().__new__(cls)
+            monomial.factors = factors
+            monomial._hash = hash(factors)
+            cls._interned[factors] = monomial
+        return monomial
+
+    @classmethod
+    def of(cls, variables: Dict[str, Tuple[Number, Number, Number, Number]]) -> 'Monomial':
+        """Monomio canónico: variables ordenadas y sin factores nulos"""
+        return cls(tuple(sorted((v, key) for v, key in variables.items() if any(key))))
+
+    def growth(self, variable: str) -> Tuple[Number, Number, Number, Number]:
+        for name, key in self.factors:
+            if name == variable:
+                return key
+        return (0, 0, 0, 0)
+
+    def variables(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.factors)
+
+    def dominated_by(self, other: 'Monomial') -> bool:
+        """Orden parcial: crece como mucho igual que `other` en todas las variables"""
+        names = set(self.variables()) | set(other.variables())
+        return all(self.growth(v) <= other.growth(v) for v in names)
+
+    def order_key(self) -> Tuple:
+        """Clave del orden total: crecimientos por variable de mayor a menor"""
+        return tuple(sorted((key for _, key in self.factors), reverse=True))
+
+    def __mul__(self, other: 'Monomial') -> 'Monomial':
+        return _multiply_monomials(self, other)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    def __repr__(self) -> str:
+        return f"Monomial({self.render()})"
+
+    def render(self) -> str:
+        if not self.factors:
+            return '1'
+        parts = []
+        for name, (fact, base, power, logs) in self.factors:
+            if fact:
+                parts.append(f"{name}!" if fact == 1 else f"({name}!)^{_number(fact)}")
+            if base:
+                parts.append(f"{_number(base)}ⁿ" if name == 'n' else f"{_number(base)}^{name}")
+            if power:
+                parts.append(name + _exponent(power))
+            if logs:
+                parts.append(f"log {name}" if logs == 1 else f"log{_exponent(logs)} {name}")
+        return ' '.join(parts) if len(self.factors) == 1 else '·'.join(parts)
+
+
+def _number(value: Number) -> str:
+    if isinstance(value, Fraction) and value.denominator != 1:
+        return f"{float(value):g}"
+    return str(int(value))
+
+
+def _exponent(power: Number) -> str:
+    if power == 1:
+        return ''
+    text = _number(power)
+    return _SUPERSCRIPTS.get(text, f"^{text}")
+
+
+@lru_cache(maxsize=4096)
+def _multiply_monomials(a: Monomial, b: Monomial) -> Monomial:
+    variables: Dict[str, Tuple[Number, Number, Number, Number]] = dict(a.factors)
+    for name, (fact, base, power, logs) in b.factors:
+        f0, b0, p0, l0 = variables.get(name, (0, 0, 0, 0))
+        # Las exponenciales de la misma variable multiplican sus bases
+        combined_base = (b0 or 1) * (base or 1)
+        variables[name] = (f0 + fact, combined_base if (b0 or base) else 0, p0 + power, l0 + logs)
+    return Monomial.of(variables)
+
+
+class Complexity:
+    """
+    Complejidad asintótica en forma canónica
+
+    La suma (código secuencial) conserva solo los monomios no dominados; el
+    producto (código anidado) multiplica monomio a monomio. Las instancias
+    están internadas: la igualdad es identidad y el hash es inmediato.
+    """
+
+    __slots__ = ('terms', '_hash', '_notation')
+
+    _interned: Dict[Tuple[Monomial, ...], 'Complexity'] = {}
+
+    def __new__(cls, terms: Tuple[Monomial, ...]):
+        complexity = cls._interned.get(terms)
+        if complexity is None:
+            complexity = super().__new__(cls)
+            complexity.terms = terms
+            complexity._hash = hash(terms)
+            complexity._notation = None
+            cls._interned[terms] = complexity
+        return complexity
+
+    # Constructores
+
+    @classmethod
+    def of(cls, monomials: Iterable[Monomial]) -> 'Complexity':
+        """Forma canónica: sin monomios dominados y en orden decreciente"""
+        return _simplify(tuple(set(monomials)))
+
+    @classmethod
+    def constant(cls) -> 'Complexity':
+        return cls.of([Monomial.of({})])
+
+    @classmethod
+    def poly(cls, variable: str = 'n', power: Number = 1) -> 'Complexity':
+        return cls.of([Monomial.of({variable: (0, 0, power, 0)})])
+
+    @classmethod
+    def log(cls, variable: str = 'n', power: Number = 1) -> 'Complexity':
+        return cls.of([Monomial.of({variable: (0, 0, 0, power)})])
+
+    @classmethod
+    def exp(cls, variable: str = 'n', base: Number = 2) -> 'Complexity':
+        if base <= 1:
+            return cls.constant()
+        return cls.of([Monomial.of({variable: (0, base, 0, 0)})])
+
+    @classmethod
+    def factorial(cls, variable: str = 'n') -> 'Complexity':
+        return cls.of([Monomial.of({variable: (1, 0, 0, 0)})])
+
+    # Composición
+
+    def __add__(self, other: 'Complexity') -> 'Complexity':
+        """Secuencia: O(f) + O(g) = O(max(f, g)) por monomios"""
+        return _add(self, other)
+
+    def __mul__(self, other: 'Complexity') -> 'Complexity':
+        """Anidamiento: O(f) · O(g)"""
+        return _multiply(self, other)
+
+    def __pow__(self, exponent: int) -> 'Complexity':
+        result = Complexity.constant()
+        for _ in range(exponent):
+            result = result * self
+        return result
+
+    # Orden
+
+    def order_key(self) -> Tuple:
+        """Clave del orden total entre complejidades (mayor = crece más rápido)"""
+        return tuple(term.order_key() for term in self.terms)
+
+    def dominates(self, other: 'Complexity') -> bool:
+        """Orden parcial: cada monomio de `other` está dominado por alguno de este"""
+        return all(any(term.dominated_by(mine) for mine in self.terms) for term in other.terms)
+
+    def __lt__(self, other: 'Complexity') -> bool:
+        return self.order_key() < other.order_key()
+
+    def __le__(self, other: 'Complexity') -> bool:
+        return self is other or self < other
+
+    def __gt__(self, other: 'Complexity') -> bool:
+        return other < self
+
+    def __ge__(self, other: 'Complexity') -> bool:
+        return self is other or other < self
+
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    # Presentación
+
+    @property
+    def notation(self) -> str:
+        """Notación O(...) con el formato de las etiquetas del analizador"""
+        if self._notation is None:
+            self._notation = f"O({' + '.join(term.render() for term in self.terms)})"
+        return self._notation
+
+    def variables(self) -> Tuple[str, ...]:
+        return tuple(sorted({v for term in self.terms for v in term.variables()}))
+
+    def __repr__(self) -> str:
+        return f"Complexity({self.notation})"
+
+    def __str__(self) -> str:
+        return self.notation
+
+
+@lru_cache(maxsize=4096)
+def _simplify(monomials: Tuple[Monomial, ...]) -> Complexity:
+    kept = [m for m in monomials
+            if not any(other is not m and m.dominated_by(other) for other in monomials)]
+    kept.sort(key=lambda m: (m.order_key(), m.factors), reverse=True)
+    return Complexity(tuple(kept))
+
+
+@lru_cache(maxsize=4096)
+def _add(a: Complexity, b: Complexity) -> Complexity:
+    if a.dominates(b):
+        return a
+    if b.dominates(a):
+        return b
+    return _simplify(tuple(set(a.terms) | set(b.terms)))
+
+
+@lru_cache(maxsize=4096)
+def _multiply(a: Complexity, b: Complexity) -> Complexity:
+    return _simplify(tuple({x * y for x in a.terms for y in b.terms}))
+
+
+def dominant(complexities: Iterable[Complexity]) -> Complexity:
+    """Complejidad de mayor crecimiento según el orden total"""
+    return max(complexities, key=Complexity.order_key, default=Complexity.constant())
+
+
+def total(complexities: Iterable[Complexity]) -> Complexity:
+    """Suma (composición secuencial) de varias complejidades"""
+    result = Complexity.constant()
+    for complexity in complexities:
+        result = result + complexity
+    return result
+
+
+_NOTATION_FACTOR = re.compile(
+    r"\s*(?:(?P<fact>[A-Za-z_][A-Za-z0-9_]*)!"
+    r"|(?P<base>\d+(?:\.\d+)?)(?:ⁿ|\^(?P<expvar>[A-Za-z_][A-Za-z0-9_]*))"
+    r"|log(?P<logpow>²|³|\^\d+(?:\.\d+)?)? (?P<logvar>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<var>[A-Za-z_][A-Za-z0-9_]*)(?P<pow>²|³|\^\d+(?:\.\d+)?)?"
+    r"|(?P<one>1))\s*·?"
+)
+
+
+def _parse_power(text: Optional[str]) -> Number:
+    if not text:
+        return 1
+    power = {'²': 2, '³': 3}.get(text) or Fraction(text[1:])
+    return int(power) if power.denominator == 1 else power
+
+
+def _parse_term(text: str) -> Optional[Complexity]:
+    result = Complexity.constant()
+    position = 0
+    while position < len(text):
+        match = _NOTATION_FACTOR.match(text, position)
+        if not match or match.end() == position:
+            return None
+        position = match.end()
+        if match.group('fact'):
+            result = result * Complexity.factorial(match.group('fact'))
+        elif match.group('base'):
+            base = _parse_power('^' + match.group('base'))
+            result = result * Complexity.exp(match.group('expvar') or 'n', base)
+        elif match.group('logvar'):
+            result = result * Complexity.log(match.group('logvar'), _parse_power(match.group('logpow')))
+        elif match.group('var'):
+            result = result * Complexity.poly(match.group('var'), _parse_power(match.group('pow')))
+    return result
+
+
+def parse_notation(notation: str) -> Optional[Complexity]:
+    """
+    Convierte una notación ('O(n log n)', 'O(2ⁿ)', 'O(n + m)'...) a Complexity
+
+    Acepta el formato que produce Complexity.notation.
+
+    Returns:
+        La complejidad, o None si la notación no tiene un formato reconocido
+    """
+    inner = notation.strip()
+    if inner.startswith('O(') and inner.endswith(')'):
+        inner = inner[2:-1]
+    terms = [_parse_term(term.strip()) for term in inner.split(' + ')]
+    if not terms or any(term is None for term in terms):
+        return None
+    return total(terms)
@@ -143,6 +143,12 @@ class AlgorithmAnalyzerGUI:
                 output += "🔍 PATRONES DETECTADOS:\n"
                 for pattern in result['patterns']:
                     output += f"• {pattern['type']}: {pattern['description']}\n"
+            
+            if result.get('performance_issues'):
+                output += "\n⚠️ PROBLEMAS DE RENDIMIENTO:\n"
+                for issue in result['performance_issues']:
+                    output += f"• Línea {issue['line']}: {issue['message']} ({issue['total_cost']})\n"
+                    output += f"  💡 {issue['suggestion']}\n"
         else:
             output = f"❌ ERROR EN EL ANÁLISIS\n\n"
             output += f"Error: {result.get('error', 'Error desconocido')}"
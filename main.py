@@ -30,6 +30,7 @@ Ejemplos de uso:
   python main.py --file algoritmo.py     # Analizar archivo
   python main.py --code "for i in range(n): print(i)"  # Analizar código directo
   python main.py --telegram-bot          # Ejecutar chatbot de Telegram
+  python main.py --file algoritmo.py --profile   # Perfilar el análisis
         """
     )
     
@@ -52,6 +53,9 @@ Ejemplos de uso:
                       help='Mostrar información detallada')
     parser.add_argument('--output', '-o', type=str,
                       help='Archivo de salida para resultados')
+    parser.add_argument('--profile', type=str, nargs='?', const='profiles',
+                      metavar='DIR',
+                      help='Perfilar el análisis y guardar .pstats y pilas colapsadas en DIR (default: profiles)')
     
     args = parser.parse_args()
     
@@ -65,7 +69,7 @@ Ejemplos de uso:
             run_telegram_bot()
         else:
             # Usar interfaz de línea de comandos
-            cli = CLIHandler()
+            cli = CLIHandler(profile_dir=args.profile)
             
             if args.file:
                 cli.analyze_file(args.file, args.language, args.verbose, args.output)
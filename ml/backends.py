@@ -0,0 +1,557 @@
+"""
+Backends intercambiables del clasificador de complejidad
+Keras, scikit-learn (regresión logística, gradient boosting, random forest)
+y un perceptrón multicapa en NumPy comparten la misma interfaz
+"""
+
+import json
+import pickle
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# (época, función que retorna el estado completo del entrenamiento)
+EpochCallback = Callable[[int, Callable[[], Dict]], None]
+
+
+class TrainingHistory:
+    """Historial de entrenamiento con la misma forma que keras.callbacks.History"""
+
+    def __init__(self, history: Optional[Dict[str, List[float]]] = None):
+        self.history = history or {'accuracy': [], 'val_accuracy': [], 'loss': [], 'val_loss': []}
+
+    def record(self, accuracy: float, val_accuracy: float, loss: float, val_loss: float):
+        self.history['accuracy'].append(float(accuracy))
+        self.history['val_accuracy'].append(float(val_accuracy))
+        self.history['loss'].append(float(loss))
+        self.history['val_loss'].append(float(val_loss))
+
+
+def _log_loss(probabilities: np.ndarray, y: np.ndarray) -> float:
+    if len(y) == 0:
+        return 0.0
+    picked = probabilities[np.arange(len(y)), y]
+    return float(-np.mean(np.log(np.clip(picked, 1e-12, 1.0))))
+
+
+def _accuracy(probabilities: np.ndarray, y: np.ndarray) -> float:
+    if len(y) == 0:
+        return 0.0
+    return float(np.mean(np.argmax(probabilities, axis=1) == y))
+
+
+class ClassifierBackend(ABC):
+    """Interfaz común: entrenar, predecir probabilidades y persistir el modelo"""
+
+    name = ''
+    # Sufijo del archivo del modelo junto a <ruta>_metadata.json
+    file_suffix = ''
+    # Modelo entrenado (None hasta llamar a fit o load)
+    model = None
+
+    def __init__(self, num_features: int, num_classes: int, **params):
+        self.num_features = num_features
+        self.num_classes = num_classes
+        self.params = params
+
+    # Indica si fit() guarda checkpoints por época y puede reanudarse
+    supports_checkpoints = False
+    # Indica si partial_fit() continúa el entrenamiento sin empezar de cero
+    supports_incremental = False
+
+    @abstractmethod
+    def fit(self, X_train: np.ndarray, y_train: np.ndarray, X_val: np.ndarray, y_val: np.ndarray,
+            epochs: int = 100, batch_size: int = 32, checkpoint: Optional[EpochCallback] = None,
+            resume_state: Optional[Dict] = None) -> TrainingHistory:
+        """
+        Entrena el modelo
+
+        Args:
+            checkpoint: Función (época, obtener_estado) llamada al final de cada época
+            resume_state: Estado de un checkpoint anterior desde el que continuar
+        """
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray, epochs: int = 5,
+                    batch_size: int = 16) -> TrainingHistory:
+        """Ajusta el modelo ya entrenado con unos pocos lotes adicionales"""
+        raise NotImplementedError(f"El backend {self.name} no admite ajuste incremental")
+
+    @abstractmethod
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Probabilidad de cada clase para cada fila"""
+
+    @abstractmethod
+    def save(self, model_path: str):
+        """Guarda el modelo en model_file(model_path)"""
+
+    @abstractmethod
+    def load(self, model_path: str):
+        """Carga el modelo de model_file(model_path)"""
+
+    @abstractmethod
+    def feature_importance(self) -> np.ndarray:
+        """Importancia de cada característica de entrada"""
+
+    def model_file(self, model_path: str) -> Path:
+        return Path(f"{model_path}{self.file_suffix}")
+
+
+def _resumable_early_stopping(patience: int, state: Optional[Dict]):
+    """EarlyStopping de Keras que conserva su progreso al reanudar"""
+    import keras
+
+    class ResumableEarlyStopping(keras.callbacks.EarlyStopping):
+        def on_train_begin(self, logs=None):
+            super().on_train_begin(logs)
+            if state:
+                self.wait = state['wait']
+                self.best = state['best']
+                self.best_weights = state['best_weights']
+                self.best_epoch = state['best_epoch']
+
+    return ResumableEarlyStopping(monitor='val_loss', patience=patience, restore_best_weights=True)
+
+
+def _checkpoint_callback(backend: 'KerasBackend', checkpoint: EpochCallback, early_stopping,
+                         previous_history: Dict[str, List[float]]):
+    """Callback de Keras que entrega el estado del entrenamiento al gestor de checkpoints"""
+    import keras
+
+    class CheckpointCallback(keras.callbacks.Callback):
+        def on_train_begin(self, logs=None):
+            self.history = {k: list(v) for k, v in previous_history.items()}
+
+        def on_epoch_end(self, epoch, logs=None):
+            for key, value in (logs or {}).items():
+                self.history.setdefault(key, []).append(float(value))
+            checkpoint(epoch, lambda: backend.training_state(epoch, early_stopping, self.history))
+
+    return CheckpointCallback()
+
+
+class KerasBackend(ClassifierBackend):
+    """Red neuronal densa de Keras (modelo original del clasificador)"""
+
+    name = 'keras'
+    file_suffix = '_model.h5'
+    supports_checkpoints = True
+    supports_incremental = True
+
+    def build(self):
+        # TensorFlow se importa bajo demanda para que la extracción de
+        # características y el análisis tradicional no dependan de él
+        import keras
+        from keras import layers
+
+        units = self.params.get('units', (128, 64, 32))
+        dropout = self.params.get('dropout', (0.3, 0.2, 0.0))
+        stack = [keras.Input(shape=(self.num_features,))]
+        for i, width in enumerate(units):
+            stack.append(layers.Dense(width, activation='relu'))
+            if i < len(dropout) and dropout[i]:
+                stack.append(layers.Dropout(dropout[i]))
+        stack.append(layers.Dense(self.num_classes, activation='softmax'))
+
+        model = keras.Sequential(stack)
+        model.compile(
+            optimizer=keras.optimizers.Adam(learning_rate=self.params.get('learning_rate', 1e-3)),
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        return model
+
+    def fit(self, X_train, y_train, X_val, y_val, epochs=100, batch_size=32,
+            checkpoint=None, resume_state=None):
+        import keras
+
+        self.model = self.build()
+        initial_epoch = 0
+        previous_history: Dict[str, List[float]] = {}
+        if resume_state is not None:
+            self.model.set_weights(resume_state['weights'])
+            # Las variables del optimizador (momentos de Adam, iteraciones) se crean al construirlo
+            self.model.optimizer.build(self.model.trainable_variables)
+            for variable, value in zip(self.model.optimizer.variables, resume_state['optimizer']):
+                variable.assign(value)
+            keras.utils.set_random_seed(resume_state['seed'])
+            initial_epoch = resume_state['epoch'] + 1
+            previous_history = resume_state['history']
+
+        early_stopping = _resumable_early_stopping(
+            patience=self.params.get('patience', 10),
+            state=resume_state.get('early_stopping') if resume_state else None
+        )
+        callbacks = [early_stopping] + list(self.params.get('callbacks', []))
+        if checkpoint is not None:
+            callbacks.append(_checkpoint_callback(self, checkpoint, early_stopping, previous_history))
+
+        history = self.model.fit(
+            X_train, y_train,
+            epochs=epochs,
+            initial_epoch=initial_epoch,
+            batch_size=batch_size,
+            validation_data=(X_val, y_val),
+            callbacks=callbacks,
+            verbose="1" if self.params.get('verbose', True) else "0"
+        )
+        for key, values in previous_history.items():
+            history.history[key] = list(values) + list(history.history.get(key, []))
+        return history
+
+    def training_state(self, epoch: int, early_stopping, history: Dict[str, List[float]]) -> Dict:
+        """Estado completo para reanudar tras la época indicada"""
+        return {
+            'epoch': epoch,
+            'weights': self.model.get_weights(),
+            'optimizer': [np.array(v) for v in self.model.optimizer.variables],
+            'early_stopping': {
+                'wait': early_stopping.wait,
+                'best': float(early_stopping.best),
+                'best_weights': early_stopping.best_weights,
+                'best_epoch': early_stopping.best_epoch,
+            },
+            'history': {k: list(v) for k, v in history.items()},
+            'seed': int(np.random.randint(0, 2 ** 31 - 1)),
+        }
+
+    def partial_fit(self, X, y, epochs=5, batch_size=16):
+        # Un modelo cargado de disco conserva el optimizador con el que se compiló
+        return self.model.fit(X, y, epochs=epochs, batch_size=batch_size, shuffle=True,
+                              verbose="1" if self.params.get('verbose', True) else "0")
+
+    def predict_proba(self, X):
+        return self.model.predict(X, verbose="0")
+
+    def save(self, model_path):
+        self.model.save(str(self.model_file(model_path)))
+
+    def load(self, model_path):
+        import keras
+        self.model = keras.models.load_model(str(self.model_file(model_path)))
+
+    def feature_importance(self):
+        # Pesos de la primera capa como medida de importancia
+        weights = self.model.layers[0].get_weights()[0]
+        return np.mean(np.abs(weights), axis=1)
+
+
+class SklearnBackend(ClassifierBackend):
+    """Modelos de scikit-learn para las características tabulares"""
+
+    file_suffix = '_model.pkl'
+
+    @abstractmethod
+    def build(self):
+        """Estimador de scikit-learn sin entrenar"""
+
+    def fit(self, X_train, y_train, X_val, y_val, epochs=100, batch_size=32,
+            checkpoint=None, resume_state=None):
+        # Se entrenan de una vez: no hay épocas que guardar ni reanudar
+        self.model = self.build()
+        self.model.fit(X_train, y_train)
+        self._importance = self._compute_importance(X_val, y_val)
+
+        history = TrainingHistory()
+        train_proba = self.predict_proba(X_train)
+        val_proba = self.predict_proba(X_val)
+        history.record(_accuracy(train_proba, y_train), _accuracy(val_proba, y_val),
+                       _log_loss(train_proba, y_train), _log_loss(val_proba, y_val))
+        return history
+
+    def predict_proba(self, X):
+        # Las clases ausentes del entrenamiento reciben probabilidad 0
+        proba = self.model.predict_proba(X)
+        full = np.zeros((len(proba), self.num_classes), dtype=np.float64)
+        full[:, self.model.classes_] = proba
+        return full
+
+    def save(self, model_path):
+        with open(self.model_file(model_path), 'wb') as f:
+            pickle.dump({'model': self.model, 'importance': self._importance}, f)
+
+    def load(self, model_path):
+        with open(self.model_file(model_path), 'rb') as f:
+            state = pickle.load(f)
+        self.model = state['model']
+        self._importance = state['importance']
+
+    def feature_importance(self):
+        return self._importance
+
+    def _compute_importance(self, X_val, y_val) -> np.ndarray:
+        estimator = self.model[-1] if hasattr(self.model, 'steps') else self.model
+        if hasattr(estimator, 'feature_importances_'):
+            return np.asarray(estimator.feature_importances_)
+        if hasattr(estimator, 'coef_'):
+            return np.mean(np.abs(estimator.coef_), axis=0)
+        if len(y_val) == 0:
+            return np.zeros(self.num_features)
+        from sklearn.inspection import permutation_importance
+        result = permutation_importance(self.model, X_val, y_val, n_repeats=3, random_state=42)
+        return np.clip(result.importances_mean, 0, None)
+
+
+class LogisticRegressionBackend(SklearnBackend):
+    name = 'logistic'
+
+    def build(self):
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        return make_pipeline(
+            StandardScaler(),
+            LogisticRegression(C=self.params.get('C', 1.0), max_iter=self.params.get('max_iter', 2000))
+        )
+
+
+class GradientBoostingBackend(SklearnBackend):
+    name = 'gradient_boosting'
+
+    def build(self):
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        return HistGradientBoostingClassifier(
+            learning_rate=self.params.get('learning_rate', 0.1),
+            max_iter=self.params.get('max_iter', 200),
+            max_depth=self.params.get('max_depth'),
+            early_stopping='auto',
+            random_state=42
+        )
+
+
+class RandomForestBackend(SklearnBackend):
+    name = 'random_forest'
+
+    def build(self):
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(
+            n_estimators=self.params.get('n_estimators', 200),
+            max_depth=self.params.get('max_depth'),
+            n_jobs=self.params.get('n_jobs'),
+            random_state=42
+        )
+
+
+class NumpyMLPBackend(ClassifierBackend):
+    """Perceptrón multicapa en NumPy: ReLU, softmax, Adam y parada temprana"""
+
+    name = 'numpy_mlp'
+    file_suffix = '_model.npz'
+    supports_checkpoints = True
+    supports_incremental = True
+
+    def __init__(self, num_features, num_classes, **params):
+        super().__init__(num_features, num_classes, **params)
+        self.hidden: Sequence[int] = tuple(params.get('hidden', (64, 32)))
+        self.learning_rate = params.get('learning_rate', 1e-3)
+        self.l2 = params.get('l2', 1e-4)
+        self.patience = params.get('patience', 10)
+        self.seed = params.get('seed', 42)
+        self.weights: List[np.ndarray] = []
+        self.biases: List[np.ndarray] = []
+        self.mean = np.zeros(num_features, dtype=np.float32)
+        self.std = np.ones(num_features, dtype=np.float32)
+
+    @property
+    def model(self):
+        # El MLP guarda sus pesos directamente en el backend
+        return self if self.weights else None
+
+    def fit(self, X_train, y_train, X_val, y_val, epochs=100, batch_size=32,
+            checkpoint=None, resume_state=None):
+        X_train = np.asarray(X_train, dtype=np.float32)
+        y_train = np.asarray(y_train, dtype=np.int64)
+        rng = np.random.RandomState(self.seed)
+
+        if resume_state is not None:
+            self._restore_state(resume_state, rng)
+            start_epoch = resume_state['epoch'] + 1
+        else:
+            self.mean = X_train.mean(axis=0)
+            std = X_train.std(axis=0)
+            self.std = np.where(std > 0, std, 1.0).astype(np.float32)
+            self._init_params(rng)
+            # Estado de Adam y de la parada temprana
+            self._moments = [np.zeros_like(p) for p in self.weights + self.biases]
+            self._velocities = [np.zeros_like(p) for p in self.weights + self.biases]
+            self._step = 0
+            self._history = TrainingHistory()
+            self._best_loss, self._best_params, self._waited = np.inf, None, 0
+            start_epoch = 0
+
+        Xn = self._normalize(X_train)
+        for epoch in range(start_epoch, epochs):
+            if self._waited >= self.patience:
+                break
+            self._run_epoch(Xn, y_train, batch_size, rng)
+
+            train_proba = self.predict_proba(X_train)
+            val_proba = self.predict_proba(X_val) if len(y_val) else train_proba
+            val_y = y_val if len(y_val) else y_train
+            val_loss = _log_loss(val_proba, val_y)
+            self._history.record(_accuracy(train_proba, y_train), _accuracy(val_proba, val_y),
+                                 _log_loss(train_proba, y_train), val_loss)
+
+            if val_loss < self._best_loss - 1e-6:
+                self._best_loss, self._waited = val_loss, 0
+                self._best_params = ([w.copy() for w in self.weights], [b.copy() for b in self.biases])
+            else:
+                self._waited += 1
+
+            if checkpoint is not None:
+                checkpoint(epoch, lambda: self.training_state(epoch, rng))
+
+        if self._best_params is not None:
+            self.weights = [w.copy() for w in self._best_params[0]]
+            self.biases = [b.copy() for b in self._best_params[1]]
+        return self._history
+
+    def partial_fit(self, X, y, epochs=5, batch_size=16):
+        # La normalización se mantiene: los datos nuevos se ven con la escala del corpus base
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.int64)
+        if not hasattr(self, '_moments'):
+            # Modelo cargado de disco: Adam empieza con momentos nuevos
+            self._moments = [np.zeros_like(p) for p in self.weights + self.biases]
+            self._velocities = [np.zeros_like(p) for p in self.weights + self.biases]
+            self._step = 0
+        rng = np.random.RandomState(self.seed + self._step)
+
+        history = TrainingHistory()
+        Xn = self._normalize(X)
+        for _ in range(epochs):
+            self._run_epoch(Xn, y, batch_size, rng)
+            proba = self.predict_proba(X)
+            history.record(_accuracy(proba, y), _accuracy(proba, y), _log_loss(proba, y), _log_loss(proba, y))
+        return history
+
+    def _run_epoch(self, Xn: np.ndarray, y: np.ndarray, batch_size: int, rng: np.random.RandomState):
+        """Una pasada de Adam por los datos normalizados en lotes barajados"""
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        order = rng.permutation(len(Xn))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            grads = self._gradients(Xn[batch], y[batch])
+            self._step += 1
+            for i, (param, grad) in enumerate(zip(self.weights + self.biases, grads)):
+                self._moments[i] = beta1 * self._moments[i] + (1 - beta1) * grad
+                self._velocities[i] = beta2 * self._velocities[i] + (1 - beta2) * grad * grad
+                m_hat = self._moments[i] / (1 - beta1 ** self._step)
+                v_hat = self._velocities[i] / (1 - beta2 ** self._step)
+                param -= self.learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+
+    def training_state(self, epoch: int, rng: np.random.RandomState) -> Dict:
+        """Estado completo para reanudar tras la época indicada"""
+        return {
+            'epoch': epoch,
+            'weights': [w.copy() for w in self.weights],
+            'biases': [b.copy() for b in self.biases],
+            'mean': self.mean.copy(),
+            'std': self.std.copy(),
+            'optimizer': {
+                'moments': [m.copy() for m in self._moments],
+                'velocities': [v.copy() for v in self._velocities],
+                'step': self._step,
+            },
+            'early_stopping': {
+                'best_loss': self._best_loss,
+                'best_params': self._best_params,
+                'waited': self._waited,
+            },
+            'history': {k: list(v) for k, v in self._history.history.items()},
+            'rng': rng.get_state(),
+        }
+
+    def _restore_state(self, state: Dict, rng: np.random.RandomState):
+        self.weights = [w.copy() for w in state['weights']]
+        self.biases = [b.copy() for b in state['biases']]
+        self.mean, self.std = state['mean'], state['std']
+        self._moments = [m.copy() for m in state['optimizer']['moments']]
+        self._velocities = [v.copy() for v in state['optimizer']['velocities']]
+        self._step = state['optimizer']['step']
+        self._best_loss = state['early_stopping']['best_loss']
+        self._best_params = state['early_stopping']['best_params']
+        self._waited = state['early_stopping']['waited']
+        self._history = TrainingHistory({k: list(v) for k, v in state['history'].items()})
+        rng.set_state(state['rng'])
+
+    def predict_proba(self, X):
+        activations = self._forward(self._normalize(np.asarray(X, dtype=np.float32)))
+        return activations[-1]
+
+    def save(self, model_path):
+        arrays = {'mean': self.mean, 'std': self.std}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'W{i}'] = w
+            arrays[f'b{i}'] = b
+        arrays['config'] = np.array(json.dumps({'hidden': list(self.hidden), 'layers': len(self.weights)}))
+        with open(self.model_file(model_path), 'wb') as f:
+            np.savez(f, **arrays)
+
+    def load(self, model_path):
+        with np.load(self.model_file(model_path)) as data:
+            config = json.loads(str(data['config']))
+            self.hidden = tuple(config['hidden'])
+            self.mean, self.std = data['mean'], data['std']
+            self.weights = [data[f'W{i}'] for i in range(config['layers'])]
+            self.biases = [data[f'b{i}'] for i in range(config['layers'])]
+
+    def feature_importance(self):
+        return np.mean(np.abs(self.weights[0]), axis=1)
+
+    def _init_params(self, rng: np.random.RandomState):
+        sizes = [self.num_features] + list(self.hidden) + [self.num_classes]
+        # Inicialización de He para capas ReLU
+        self.weights = [
+            (rng.randn(fan_in, fan_out) * np.sqrt(2.0 / fan_in)).astype(np.float32)
+            for fan_in, fan_out in zip(sizes[:-1], sizes[1:])
+        ]
+        self.biases = [np.zeros(fan_out, dtype=np.float32) for fan_out in sizes[1:]]
+
+    def _normalize(self, X: np.ndarray) -> np.ndarray:
+        return (X - self.mean) / self.std
+
+    def _forward(self, X: np.ndarray) -> List[np.ndarray]:
+        activations = [X]
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            z = activations[-1] @ w + b
+            if i < len(self.weights) - 1:
+                activations.append(np.maximum(z, 0))
+            else:
+                z = z - z.max(axis=1, keepdims=True)
+                exp = np.exp(z)
+                activations.append(exp / exp.sum(axis=1, keepdims=True))
+        return activations
+
+    def _gradients(self, X: np.ndarray, y: np.ndarray) -> List[np.ndarray]:
+        """Retropropagación de la entropía cruzada con regularización L2"""
+        activations = self._forward(X)
+        delta = activations[-1].copy()
+        delta[np.arange(len(y)), y] -= 1.0
+        delta /= len(y)
+
+        grad_w: List[np.ndarray] = [None] * len(self.weights)
+        grad_b: List[np.ndarray] = [None] * len(self.biases)
+        for i in range(len(self.weights) - 1, -1, -1):
+            grad_w[i] = activations[i].T @ delta + self.l2 * self.weights[i]
+            grad_b[i] = delta.sum(axis=0)
+            if i > 0:
+                delta = (delta @ self.weights[i].T) * (activations[i] > 0)
+        return grad_w + grad_b
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (KerasBackend, LogisticRegressionBackend, GradientBoostingBackend,
+                    RandomForestBackend, NumpyMLPBackend)
+}
+DEFAULT_BACKEND = 'keras'
+
+
+def create_backend(name: str, num_features: int, num_classes: int, **params) -> ClassifierBackend:
+    """Instancia un backend por nombre"""
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {name} (disponibles: {', '.join(BACKENDS)})")
+    return BACKENDS[name](num_features, num_classes, **params)
@@ -0,0 +1,123 @@
+"""
+Checkpoints periódicos del entrenamiento
+Guarda pesos, estado del optimizador, época, generadores aleatorios y la
+identidad del dataset para poder reanudar un entrenamiento interrumpido
+"""
+
+import json
+import os
+import pickle
+import random
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+CHECKPOINT_VERSION = 1
+LATEST_FILE = 'latest.json'
+
+
+class CheckpointManager:
+    """Escribe checkpoints atómicos cada N épocas y conserva los K más recientes"""
+
+    def __init__(self, directory: str, every: int = 1, keep: int = 3,
+                 metadata: Optional[Dict] = None):
+        if every < 1 or keep < 1:
+            raise ValueError("every y keep deben ser al menos 1")
+        self.directory = Path(directory)
+        self.every = every
+        self.keep = keep
+        # Datos fijos del entrenamiento: backend, parámetros, clave del dataset...
+        self.metadata = dict(metadata or {})
+        self.saved = 0
+
+    def on_epoch_end(self, epoch: int, get_state: Callable[[], Dict]) -> Optional[Path]:
+        """
+        Llamado por el backend al terminar cada época (empezando en 0)
+
+        `get_state` solo se invoca si toca guardar, para no copiar los pesos
+        en cada época.
+        """
+        if (epoch + 1) % self.every:
+            return None
+        return self.save(epoch, get_state())
+
+    def save(self, epoch: int, state: Dict) -> Path:
+        """Guarda un checkpoint de forma atómica y elimina los antiguos"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'epoch': epoch,
+            'metadata': self.metadata,
+            'state': state,
+            'rng': {
+                'python': random.getstate(),
+                'numpy': np.random.get_state(),
+            },
+        }
+
+        path = self.directory / f"checkpoint-{epoch:06d}.pkl"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        # El puntero se actualiza después: nunca apunta a un checkpoint incompleto
+        tmp_latest = self.directory / f"{LATEST_FILE}.{os.getpid()}.tmp"
+        with open(tmp_latest, 'w', encoding='utf-8') as f:
+            json.dump({'file': path.name, 'epoch': epoch}, f)
+        os.replace(tmp_latest, self.directory / LATEST_FILE)
+
+        self.saved += 1
+        self._prune()
+        return path
+
+    def latest(self) -> Optional[Dict]:
+        """Último checkpoint completo, o None si no hay ninguno"""
+        pointer = self.directory / LATEST_FILE
+        if pointer.exists():
+            with open(pointer, 'r', encoding='utf-8') as f:
+                path = self.directory / json.load(f)['file']
+        else:
+            checkpoints = self.checkpoints()
+            if not checkpoints:
+                return None
+            path = checkpoints[-1]
+
+        if not path.exists():
+            return None
+        with open(path, 'rb') as f:
+            checkpoint = pickle.load(f)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada: {checkpoint.get('version')}")
+        return checkpoint
+
+    def checkpoints(self) -> List[Path]:
+        """Checkpoints existentes ordenados por época"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob('checkpoint-*.pkl'))
+
+    def clear(self):
+        """Elimina todos los checkpoints del directorio"""
+        for path in self.checkpoints():
+            path.unlink()
+        pointer = self.directory / LATEST_FILE
+        if pointer.exists():
+            pointer.unlink()
+
+    def _prune(self):
+        for path in self.checkpoints()[:-self.keep]:
+            path.unlink()
+
+
+def restore_rng(checkpoint: Dict):
+    """Restaura los generadores aleatorios globales guardados en un checkpoint"""
+    rng = checkpoint.get('rng', {})
+    if 'python' in rng:
+        random.setstate(rng['python'])
+    if 'numpy' in rng:
+        np.random.set_state(rng['numpy'])
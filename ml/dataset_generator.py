@@ -3,18 +3,45 @@
 Generador de dataset para entrenamiento de la red neuronal
 """
 
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 import random
 
+from .mutations import ASTMutator
+
 
 class AlgorithmDatasetGenerator:
     """Genera ejemplos de algoritmos para entrenar la red neuronal"""
     
     def __init__(self):
         self.algorithms = self._create_algorithm_examples()
+        self.mutator = ASTMutator()
     
-    def generate_training_dataset(self, samples_per_class: int = 50) -> List[Tuple[str, str]]:
-        """Genera el dataset de entrenamiento con múltiples variaciones"""
+    def generate_training_dataset(self, samples_per_class: int = 50,
+                                  seed: Optional[int] = None,
+                                  workers: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        Genera el dataset de entrenamiento con múltiples variaciones
+        
+        Args:
+            samples_per_class: Muestras por clase de complejidad
+            seed: Semilla para un dataset reproducible; sin semilla se usa
+                  el estado global de `random`
+            workers: Procesos para generar las variaciones (solo con semilla)
+        """
+        if seed is not None:
+            plan = list(self._plan_samples(samples_per_class, seed))
+            pending = [i for i, (_, _, key) in enumerate(plan) if key is not None]
+            variations = self.mutator.mutate_many(
+                [plan[i][1] for i in pending],
+                [f"{plan[i][2]}:mutations" for i in pending],
+                workers=workers
+            )
+            training_data = [(code, complexity) for complexity, code, _ in plan]
+            for i, variation in zip(pending, variations):
+                training_data[i] = (variation, plan[i][0])
+            random.Random(seed).shuffle(training_data)
+            return training_data
+        
         training_data = []
         
         for complexity, examples in self.algorithms.items():
@@ -32,43 +59,76 @@ class AlgorithmDatasetGenerator:
         random.shuffle(training_data)
         return training_data
     
-    def _create_variation(self, code: str) -> str:
-        """Crea variaciones del código para aumentar el dataset"""
-        variations = [
-            # Cambiar nombres de variables
-            lambda c: c.replace('arr', random.choice(['data', 'list', 'nums', 'elements', 'array'])),
-            lambda c: c.replace('target', random.choice(['item', 'element', 'search_value', 'key'])),
-            lambda c: c.replace('n', random.choice(['size', 'length', 'count', 'len'])),
-            
-            # Cambiar nombres de funciones
-            lambda c: c.replace('def ', 'def ' + random.choice(['algorithm_', 'sort_', 'search_', 'find_'])),
-            
-            # Agregar comentarios
-            lambda c: c + f"\n# {random.choice(['Algorithm implementation', 'Sorting function', 'Search function', 'Complexity analysis'])}",
-            
-            # Cambiar estructura de control
-            lambda c: c.replace('for i in range', 'for index in range'),
-            lambda c: c.replace('for j in range', 'for j_index in range'),
-            
-            # Agregar espacios extra
-            lambda c: c.replace(' = ', '  =  '),
-            lambda c: c.replace('if ', 'if  '),
-            
-            # Cambiar operadores
-            lambda c: c.replace(' > ', ' > '),
-            lambda c: c.replace(' < ', ' < '),
+    def iter_samples(self, samples_per_class: int = 50, seed: int = 0,
+                     shard_index: int = 0, num_shards: int = 1) -> Iterator[Tuple[str, str]]:
+        """
+        Genera muestras de forma perezosa y determinista
+        
+        Cada muestra usa su propio generador aleatorio derivado de
+        (semilla, clase, posición), así que el resultado no depende del
+        número de shards ni del orden en que se generen. Las clases se
+        intercalan para que cualquier prefijo del flujo esté balanceado.
+        
+        Args:
+            samples_per_class: Muestras por clase de complejidad
+            seed: Semilla global del dataset
+            shard_index: Índice del shard a generar
+            num_shards: Número total de shards
             
-            # Agregar variables extra
-            lambda c: c.replace('def ', 'def ').replace(':', ':\n    # Initialize variables'),
-        ]
+        Yields:
+            Pares (código, complejidad)
+        """
+        for complexity, code, key in self._plan_samples(samples_per_class, seed, shard_index, num_shards):
+            if key is None:
+                yield code, complexity
+            else:
+                yield self._create_variation(code, random.Random(f"{key}:mutations")), complexity
+    
+    def _plan_samples(self, samples_per_class: int, seed: int, shard_index: int = 0,
+                      num_shards: int = 1) -> Iterator[Tuple[str, str, Optional[str]]]:
+        """
+        Decide cada muestra sin generarla: (complejidad, código base, semilla)
+        
+        La semilla es None para los ejemplos originales, que no se mutan.
+        """
+        if not 0 <= shard_index < num_shards:
+            raise ValueError(f"Shard inválido: {shard_index} de {num_shards}")
         
-        # Aplicar 1-3 variaciones aleatorias
-        num_variations = random.randint(1, 3)
-        for _ in range(num_variations):
-            variation_func = random.choice(variations)
-            code = variation_func(code)
+        per_class = {
+            complexity: max(samples_per_class, len(examples))
+            for complexity, examples in self.algorithms.items()
+        }
+        position = 0
+        
+        for k in range(max(per_class.values(), default=0)):
+            for complexity, examples in self.algorithms.items():
+                if k >= per_class[complexity]:
+                    continue
+                position += 1
+                if (position - 1) % num_shards != shard_index:
+                    continue
+                
+                if k < len(examples):
+                    yield complexity, examples[k], None
+                else:
+                    key = f"{seed}:{complexity}:{k}"
+                    yield complexity, random.Random(key).choice(examples), key
+    
+    def count_samples(self, samples_per_class: int = 50) -> int:
+        """Número total de muestras que genera `iter_samples`"""
+        return sum(max(samples_per_class, len(examples)) for examples in self.algorithms.values())
+    
+    def _create_variation(self, code: str, rng: Optional[random.Random] = None) -> str:
+        """
+        Crea una variación del código para aumentar el dataset
         
-        return code
+        Las mutaciones se aplican sobre el AST (renombrado consistente,
+        reordenación de sentencias independientes, for/while, funciones
+        auxiliares), así que la variación siempre es código válido con la
+        misma complejidad que el original.
+        """
+        # Sin generador explícito se usa el estado global del módulo random
+        return self.mutator.mutate(code, rng if rng is not None else random)
     
     def _create_algorithm_examples(self) -> dict:
         """Crea ejemplos de algoritmos para cada clase de complejidad"""
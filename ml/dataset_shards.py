@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Dataset en shards comprimidos con índice de acceso aleatorio
+Genera los shards en paralelo a partir de AlgorithmDatasetGenerator.iter_samples
+"""
+
+import argparse
+import bisect
+import gzip
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Permitir ejecutar como script
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml.dataset_generator import AlgorithmDatasetGenerator
+
+
+INDEX_FILE = 'index.json'
+SHARD_FORMATS = ('jsonl', 'npz')
+SHARD_FORMAT_VERSION = 1
+
+
+def _shard_filename(shard_index: int, fmt: str) -> str:
+    extension = 'jsonl.gz' if fmt == 'jsonl' else 'npz'
+    return f"shard-{shard_index:05d}.{extension}"
+
+
+def _write_shard(output_dir: str, shard_index: int, num_shards: int,
+                 samples_per_class: int, seed: int, fmt: str) -> Dict:
+    """Genera y escribe un shard (se ejecuta en un proceso hijo)"""
+    generator = AlgorithmDatasetGenerator()
+    samples = generator.iter_samples(samples_per_class, seed, shard_index, num_shards)
+    filename = _shard_filename(shard_index, fmt)
+    path = Path(output_dir) / filename
+    tmp_path = path.with_name(f"{filename}.tmp")
+    label_counts: Dict[str, int] = {}
+    count = 0
+
+    if fmt == 'jsonl':
+        # Escritura en streaming: el shard nunca se materializa completo
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for code, label in samples:
+                f.write(json.dumps({'code': code, 'label': label}) + '\n')
+                label_counts[label] = label_counts.get(label, 0) + 1
+                count += 1
+    else:
+        codes, labels = [], []
+        for code, label in samples:
+            codes.append(code)
+            labels.append(label)
+            label_counts[label] = label_counts.get(label, 0) + 1
+        count = len(codes)
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, codes=np.array(codes, dtype=str), labels=np.array(labels, dtype=str))
+
+    os.replace(tmp_path, path)
+    return {'file': filename, 'count': count, 'labels': label_counts}
+
+
+class ShardedDatasetWriter:
+    """Escribe un dataset generado en N shards comprimidos con índice"""
+
+    def __init__(self, output_dir: str, num_shards: int = 8, fmt: str = 'jsonl',
+                 workers: Optional[int] = None):
+        if fmt not in SHARD_FORMATS:
+            raise ValueError(f"Formato no soportado: {fmt}")
+        self.output_dir = Path(output_dir)
+        self.num_shards = num_shards
+        self.fmt = fmt
+        self.workers = workers or os.cpu_count() or 1
+
+    def write(self, samples_per_class: int, seed: int = 0) -> Dict:
+        """
+        Genera todos los shards y escribe el índice
+
+        Args:
+            samples_per_class: Muestras por clase de complejidad
+            seed: Semilla global del dataset
+
+        Returns:
+            Contenido del índice
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        args = [
+            (str(self.output_dir), i, self.num_shards, samples_per_class, seed, self.fmt)
+            for i in range(self.num_shards)
+        ]
+
+        if self.workers <= 1 or self.num_shards == 1:
+            shards = [_write_shard(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, self.num_shards)) as executor:
+                shards = list(executor.map(_write_shard, *zip(*args)))
+
+        labels: Dict[str, int] = {}
+        for shard in shards:
+            for label, count in shard['labels'].items():
+                labels[label] = labels.get(label, 0) + count
+
+        index = {
+            'version': SHARD_FORMAT_VERSION,
+            'format': self.fmt,
+            'seed': seed,
+            'samples_per_class': samples_per_class,
+            'num_shards': self.num_shards,
+            'total': sum(shard['count'] for shard in shards),
+            'labels': labels,
+            'shards': shards
+        }
+
+        # El índice se escribe al final: su presencia indica un dataset completo
+        tmp_index = self.output_dir / f"{INDEX_FILE}.tmp"
+        with open(tmp_index, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_index, self.output_dir / INDEX_FILE)
+        return index
+
+
+class ShardedDataset:
+    """Lectura secuencial o aleatoria de un dataset en shards"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        with open(self.directory / INDEX_FILE, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.shards = self.index['shards']
+        self.fmt = self.index['format']
+
+        # Posición global inicial de cada shard para localizar muestras
+        self._offsets: List[int] = []
+        total = 0
+        for shard in self.shards:
+            self._offsets.append(total)
+            total += shard['count']
+        self._total = total
+        self._cached_shard: Optional[int] = None
+        self._cached_samples: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, position: int) -> Tuple[str, str]:
+        if position < 0:
+            position += self._total
+        if not 0 <= position < self._total:
+            raise IndexError(position)
+        shard_index = bisect.bisect_right(self._offsets, position) - 1
+        if self._cached_shard != shard_index:
+            self._cached_samples = list(self.iter_shard(shard_index))
+            self._cached_shard = shard_index
+        return self._cached_samples[position - self._offsets[shard_index]]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for shard_index in range(len(self.shards)):
+            yield from self.iter_shard(shard_index)
+
+    def iter_shard(self, shard_index: int) -> Iterator[Tuple[str, str]]:
+        """Itera las muestras de un shard sin cargar el resto"""
+        path = self.shard_path(shard_index)
+        if self.fmt == 'jsonl':
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    yield record['code'], record['label']
+        else:
+            with np.load(path) as data:
+                for code, label in zip(data['codes'], data['labels']):
+                    yield str(code), str(label)
+
+    def shard_path(self, shard_index: int) -> Path:
+        return self.directory / self.shards[shard_index]['file']
+
+    def fingerprint(self) -> str:
+        """Identificador del contenido: parámetros de generación y estado de los archivos"""
+        params = {
+            key: self.index[key]
+            for key in ('version', 'format', 'seed', 'samples_per_class', 'num_shards', 'total')
+        }
+        files = []
+        for shard_index in range(len(self.shards)):
+            stat = self.shard_path(shard_index).stat()
+            files.append([self.shards[shard_index]['file'], stat.st_size, stat.st_mtime_ns])
+        return json.dumps({'params': params, 'files': files}, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generar dataset en shards comprimidos")
+    parser.add_argument('--output', '-o', type=str, required=True,
+                       help='Directorio de salida')
+    parser.add_argument('--samples', type=int, default=1000,
+                       help='Muestras por clase (default: 1000)')
+    parser.add_argument('--shards', type=int, default=8,
+                       help='Número de shards (default: 8)')
+    parser.add_argument('--seed', type=int, default=0,
+                       help='Semilla del dataset (default: 0)')
+    parser.add_argument('--format', choices=SHARD_FORMATS, default='jsonl',
+                       help='Formato de los shards (default: jsonl)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Procesos en paralelo (default: núcleos disponibles)')
+
+    args = parser.parse_args()
+
+    writer = ShardedDatasetWriter(args.output, num_shards=args.shards, fmt=args.format,
+                                  workers=args.workers)
+    index = writer.write(args.samples, seed=args.seed)
+    print(f"✅ {index['total']} muestras en {index['num_shards']} shards ({args.output})")
+
+
+if __name__ == "__main__":
+    main()
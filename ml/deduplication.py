@@ -0,0 +1,234 @@
+"""
+Eliminación de duplicados y casi duplicados del corpus de entrenamiento
+Usa huellas del AST normalizado (independientes de los identificadores) y
+MinHash sobre los subárboles con bandas LSH para encontrar casi duplicados
+"""
+
+import ast
+import builtins
+import hashlib
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+# Primo de Mersenne 2^61 - 1 para el hashing universal de MinHash
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_SHINGLE = (1 << 32) - 1
+
+
+def _hash32(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class _IdentifierNormalizer(ast.NodeTransformer):
+    """Sustituye los nombres ligados por marcadores según su orden de aparición"""
+
+    def __init__(self, bound: Set[str]):
+        self.bound = bound
+        self.mapping: Dict[str, str] = {}
+
+    def _placeholder(self, name: str) -> str:
+        if name not in self.bound:
+            # Builtins y nombres libres (len, range, math...) conservan su significado
+            return name
+        if name not in self.mapping:
+            self.mapping[name] = f"_v{len(self.mapping)}"
+        return self.mapping[name]
+
+    def visit_Name(self, node):
+        node.id = self._placeholder(node.id)
+        return node
+
+    def visit_arg(self, node):
+        node.arg = self._placeholder(node.arg)
+        node.annotation = None
+        return node
+
+    def _visit_definition(self, node):
+        node.name = self._placeholder(node.name)
+        node.body = self._without_docstring(node.body)
+        self.generic_visit(node)
+        return node
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _visit_definition
+
+    def visit_Module(self, node):
+        node.body = self._without_docstring(node.body)
+        self.generic_visit(node)
+        return node
+
+    @staticmethod
+    def _without_docstring(body: List[ast.stmt]) -> List[ast.stmt]:
+        if (body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant)
+                and isinstance(body[0].value.value, str)):
+            return body[1:] or [ast.Pass()]
+        return body
+
+
+def normalized_tree(code: str) -> Optional[ast.AST]:
+    """
+    AST sin docstrings ni anotaciones y con los identificadores ligados
+    renombrados; None si el código no es Python válido
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+
+    bound: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            bound.add(node.id)
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+    bound -= set(dir(builtins))
+    return _IdentifierNormalizer(bound).visit(tree)
+
+
+def ast_fingerprint(code: str) -> str:
+    """
+    Huella exacta independiente de nombres, comentarios, docstrings y formato
+
+    Si el código no se puede analizar se usa el texto sin espacios.
+    """
+    tree = normalized_tree(code)
+    if tree is None:
+        canonical = ' '.join(code.split())
+    else:
+        canonical = ast.dump(tree, annotate_fields=False, include_attributes=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:20]
+
+
+def subtree_shingles(code: str) -> FrozenSet[int]:
+    """Conjunto de hashes de los subárboles (sentencias y expresiones) del AST normalizado"""
+    tree = normalized_tree(code)
+    if tree is None:
+        # Sin AST: trigramas de tokens como aproximación
+        tokens = code.split()
+        return frozenset(_hash32(' '.join(tokens[i:i + 3])) for i in range(max(1, len(tokens) - 2)))
+
+    shingles: Set[int] = set()
+
+    def visit(node: ast.AST) -> str:
+        parts = [type(node).__name__]
+        for field, value in ast.iter_fields(node):
+            if isinstance(value, ast.AST):
+                parts.append(visit(value))
+            elif isinstance(value, list):
+                parts.append('[' + ','.join(visit(v) if isinstance(v, ast.AST) else repr(v) for v in value) + ']')
+            elif field not in ('ctx', 'type_comment', 'kind'):
+                parts.append(repr(value))
+        digest = f"{_hash32('|'.join(parts)):08x}"
+        if isinstance(node, (ast.stmt, ast.expr)):
+            shingles.add(int(digest, 16))
+        return digest
+
+    visit(tree)
+    return frozenset(shingles)
+
+
+class MinHasher:
+    """Firmas MinHash con hashing universal (a*x + b) mod p"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # a < 2^31 y x < 2^32: el producto cabe en 63 bits sin desbordar uint64
+        self.a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, shingles: Iterable[int]) -> np.ndarray:
+        values = np.fromiter(shingles, dtype=np.uint64)
+        if values.size == 0:
+            return np.full(self.num_perm, _MAX_SHINGLE, dtype=np.uint64)
+        hashed = (self.a[:, None] * values[None, :] + self.b[:, None]) % _MERSENNE_PRIME
+        return hashed.min(axis=1)
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class CorpusDeduplicator:
+    """
+    Elimina muestras duplicadas y casi duplicadas
+
+    Se conserva la primera aparición con su etiqueta: las copias posteriores
+    se descartan aunque tengan otra etiqueta (se cuentan como conflictos),
+    para que un mismo programa no acabe en entrenamiento y en prueba. Los
+    duplicados exactos se detectan por huella del AST normalizado; los casi
+    duplicados, con MinHash + LSH y una verificación final de la similitud de
+    Jaccard sobre los subárboles.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 16,
+                 near_duplicates: bool = True, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm debe ser múltiplo de bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.near_duplicates = near_duplicates
+        self.hasher = MinHasher(num_perm, seed)
+
+    def deduplicate(self, dataset: Iterable[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], Dict]:
+        """
+        Filtra el dataset
+
+        Args:
+            dataset: Pares (código, complejidad); puede ser un iterador
+
+        Returns:
+            Tupla (muestras conservadas, estadísticas)
+        """
+        kept: List[Tuple[str, str]] = []
+        fingerprints: Dict[str, str] = {}
+        buckets: Dict[Tuple, List[int]] = {}
+        kept_shingles: List[FrozenSet[int]] = []
+        kept_labels: List[str] = []
+        stats = {'total': 0, 'exact_duplicates': 0, 'near_duplicates': 0, 'label_conflicts': 0}
+
+        for code, label in dataset:
+            stats['total'] += 1
+            fingerprint = ast_fingerprint(code)
+            if fingerprint in fingerprints:
+                if fingerprints[fingerprint] == label:
+                    stats['exact_duplicates'] += 1
+                else:
+                    # Mismo programa con otra etiqueta: prevalece la primera
+                    stats['label_conflicts'] += 1
+                continue
+            fingerprints[fingerprint] = label
+
+            if self.near_duplicates:
+                shingles = subtree_shingles(code)
+                keys = self._band_keys(self.hasher.signature(shingles))
+                candidates = {i for key in keys for i in buckets.get(key, ())}
+                match = next((i for i in sorted(candidates)
+                              if jaccard(shingles, kept_shingles[i]) >= self.threshold), None)
+                if match is not None:
+                    stats['near_duplicates'] += 1
+                    if kept_labels[match] != label:
+                        stats['label_conflicts'] += 1
+                    continue
+                for key in keys:
+                    buckets.setdefault(key, []).append(len(kept_shingles))
+                kept_shingles.append(shingles)
+                kept_labels.append(label)
+
+            kept.append((code, label))
+
+        stats['kept'] = len(kept)
+        return kept, stats
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple]:
+        """Claves LSH: una por banda, sin distinguir clases"""
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
@@ -0,0 +1,181 @@
+"""
+Construcción en paralelo y caché de la matriz de características
+Guarda X/y como .npy mapeados en memoria, indexados por el hash del dataset
+y la versión del extractor
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .features import FeatureExtractor, FEATURE_NAMES, FEATURE_EXTRACTOR_VERSION
+from .dataset_shards import ShardedDataset
+
+
+def _extract_chunk(codes: List[str], language: str) -> np.ndarray:
+    """Extrae las características de un bloque de fragmentos (en un proceso hijo)"""
+    extractor = FeatureExtractor()
+    matrix = np.empty((len(codes), len(FEATURE_NAMES)), dtype=np.float32)
+    for i, code in enumerate(codes):
+        matrix[i] = extractor.extract(code, language)
+    return matrix
+
+
+def _extract_shard(directory: str, shard_index: int, language: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Lee un shard y extrae sus características (en un proceso hijo)"""
+    dataset = ShardedDataset(directory)
+    codes, labels = [], []
+    for code, label in dataset.iter_shard(shard_index):
+        codes.append(code)
+        labels.append(label)
+    return _extract_chunk(codes, language), np.array(labels, dtype=str)
+
+
+class FeatureMatrixBuilder:
+    """Construye la matriz de características con procesos paralelos y caché en disco"""
+
+    def __init__(self, cache_dir: Optional[str] = 'models/feature_cache',
+                 workers: Optional[int] = None, chunk_size: int = 256,
+                 language: str = 'python'):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.language = language
+
+    def dataset_key(self, training_data: Sequence[Tuple[str, str]]) -> str:
+        """Hash del dataset, del lenguaje y de la versión del extractor"""
+        digest = hashlib.sha256()
+        digest.update(f"v{FEATURE_EXTRACTOR_VERSION}|{self.language}|{','.join(FEATURE_NAMES)}".encode('utf-8'))
+        if isinstance(training_data, ShardedDataset):
+            # Evita releer los shards: parámetros de generación más tamaño y fecha de cada archivo
+            digest.update(training_data.fingerprint().encode('utf-8'))
+            return digest.hexdigest()[:24]
+        for code, label in training_data:
+            digest.update(b'\x00')
+            digest.update(code.encode('utf-8'))
+            digest.update(b'\x01')
+            digest.update(str(label).encode('utf-8'))
+        return digest.hexdigest()[:24]
+
+    def build(self, training_data: Sequence[Tuple[str, str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Obtiene la matriz de características y las etiquetas del dataset
+
+        Args:
+            training_data: Lista de pares (código, complejidad)
+
+        Returns:
+            Tupla (X, y); si hay caché, ambos arrays están mapeados en memoria
+        """
+        if isinstance(training_data, ShardedDataset):
+            return self._build_from_shards(training_data)
+
+        if self.cache_dir is None:
+            return self._extract(training_data), self._labels(training_data)
+
+        key = self.dataset_key(training_data)
+        x_path, y_path = self.cache_paths(key)
+
+        if x_path.exists() and y_path.exists():
+            print(f"📦 Características cargadas desde caché ({key})")
+            return np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+
+        X = self._extract(training_data)
+        y = self._labels(training_data)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._atomic_save(x_path, X)
+        self._atomic_save(y_path, y)
+        print(f"💾 Características guardadas en caché ({key})")
+
+        return np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+
+    def _build_from_shards(self, dataset: ShardedDataset) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extrae las características shard por shard sin cargar todo el código
+
+        Cada proceso lee y procesa un shard completo; el proceso principal
+        solo escribe los bloques resultantes en una matriz mapeada en memoria.
+        """
+        num_shards = len(dataset.shards)
+        directory = str(dataset.directory)
+
+        if self.cache_dir is None:
+            parts = [_extract_shard(directory, i, self.language) for i in range(num_shards)]
+            if not parts:
+                return _extract_chunk([], self.language), np.array([], dtype=str)
+            return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+        key = self.dataset_key(dataset)
+        x_path, y_path = self.cache_paths(key)
+        if x_path.exists() and y_path.exists():
+            print(f"📦 Características cargadas desde caché ({key})")
+            return np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_x = x_path.with_name(f"{x_path.name}.{os.getpid()}.tmp")
+        X = np.lib.format.open_memmap(tmp_x, mode='w+', dtype=np.float32,
+                                      shape=(len(dataset), len(FEATURE_NAMES)))
+        label_parts: List[np.ndarray] = [np.array([], dtype=str)] * num_shards
+        offsets = [0]
+        for shard in dataset.shards:
+            offsets.append(offsets[-1] + shard['count'])
+
+        def store(shard_index: int, matrix: np.ndarray, labels: np.ndarray):
+            X[offsets[shard_index]:offsets[shard_index] + len(matrix)] = matrix
+            label_parts[shard_index] = labels
+
+        if self.workers <= 1 or num_shards < 2:
+            for i in range(num_shards):
+                store(i, *_extract_shard(directory, i, self.language))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, num_shards)) as executor:
+                futures = {
+                    executor.submit(_extract_shard, directory, i, self.language): i
+                    for i in range(num_shards)
+                }
+                for future, shard_index in futures.items():
+                    store(shard_index, *future.result())
+
+        X.flush()
+        del X
+        os.replace(tmp_x, x_path)
+        y = np.concatenate(label_parts) if label_parts else np.array([], dtype=str)
+        self._atomic_save(y_path, y)
+        print(f"💾 Características de {num_shards} shards guardadas en caché ({key})")
+
+        return np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
+
+    def cache_paths(self, key: str) -> Tuple[Path, Path]:
+        """Rutas de los archivos X/y para una clave de dataset"""
+        if self.cache_dir is None:
+            raise ValueError("El constructor no tiene directorio de caché")
+        return self.cache_dir / f"X_{key}.npy", self.cache_dir / f"y_{key}.npy"
+
+    def _extract(self, training_data: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """Extrae las características, en paralelo si el dataset lo justifica"""
+        codes = [code for code, _ in training_data]
+        if not codes:
+            return np.empty((0, len(FEATURE_NAMES)), dtype=np.float32)
+
+        chunks = [codes[i:i + self.chunk_size] for i in range(0, len(codes), self.chunk_size)]
+        if self.workers <= 1 or len(chunks) < 2:
+            return _extract_chunk(codes, self.language)
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+            parts = list(executor.map(_extract_chunk, chunks, [self.language] * len(chunks)))
+        return np.concatenate(parts)
+
+    def _labels(self, training_data: Sequence[Tuple[str, str]]) -> np.ndarray:
+        return np.array([str(label) for _, label in training_data])
+
+    def _atomic_save(self, path: Path, array: np.ndarray):
+        """Escribe el array en un temporal y lo renombra para evitar cachés corruptas"""
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
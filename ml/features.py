@@ -0,0 +1,247 @@
+"""
+Extracción de características en una sola pasada
+Recorre un flujo de tokens del código y calcula las 15 características
+del clasificador sin contar palabras dentro de cadenas ni comentarios
+"""
+
+import re
+from typing import Dict, List
+
+import numpy as np
+
+
+# Versión del extractor: cambia cuando cambia la semántica de alguna característica
+FEATURE_EXTRACTOR_VERSION = 2
+
+FEATURE_NAMES = [
+    'num_loops', 'num_nested_loops', 'max_nesting_level',
+    'num_recursive_calls', 'num_conditionals', 'num_assignments',
+    'num_function_calls', 'code_length', 'num_variables',
+    'has_sorting', 'has_search', 'has_math_operations',
+    'complexity_keywords', 'loop_patterns', 'recursion_patterns'
+]
+
+# Lexer compartido: una única expresión regular compilada por familia de lenguajes.
+# El espacio en blanco se consume como prefijo de cada token; los comentarios y
+# cadenas se reconocen como tokens propios y se descartan.
+_TOKEN_TEMPLATE = r'''
+    (?:[ \t\r\f]|\\\n)*
+    (?:
+        (?P<name>[A-Za-z_]\w*(?!["'\w]))
+      | (?P<newline>\n[ \t]*)
+      | (?P<comment>{comment})
+      | (?P<op>\*\*=?|{floor_division}[-+*/%&|^]=|==|!=|<=|>=|&&|\|\||->|::|[^\w\s"'`\#]|/)
+      | (?P<number>\d[\w.]*)
+      | (?P<string>[rRbBuUfF]{{0,2}}(?:"""(?:.|\n)*?(?:"""|\Z)|\'\'\'(?:.|\n)*?(?:\'\'\'|\Z)
+                   |"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?|`(?:\\.|[^`\\])*`?))
+    )
+'''
+
+_PYTHON_TOKENS = re.compile(
+    _TOKEN_TEMPLATE.format(comment=r'\#[^\n]*', floor_division=r'//=?|'),
+    re.VERBOSE | re.DOTALL
+)
+# En C, C++, Java y JavaScript '//' abre un comentario y '#' una directiva del preprocesador
+_BRACED_TOKENS = re.compile(
+    _TOKEN_TEMPLATE.format(comment=r'//[^\n]*|/\*.*?(?:\*/|\Z)|\#[^\n]*', floor_division=''),
+    re.VERBOSE | re.DOTALL
+)
+
+LOOP_KEYWORDS = frozenset({'for', 'while'})
+CONDITIONAL_KEYWORDS = frozenset({'if', 'elif', 'else', 'switch', 'case'})
+DEFINITION_KEYWORDS = frozenset({'def', 'function'})
+DECLARATION_KEYWORDS = frozenset({'var', 'let', 'const', 'int', 'float', 'string'})
+ASSIGNMENT_OPERATORS = frozenset({'=', '+=', '-=', '*=', '/='})
+MATH_OPERATORS = frozenset({'+', '-', '*', '/', '%', '**'})
+OPENING_BRACKETS = frozenset({'(', '[', '{'})
+CLOSING_BRACKETS = frozenset({')', ']', '}'})
+
+# Palabras que preceden a un nombre seguido de '(' sin que sea una definición
+NON_TYPE_KEYWORDS = frozenset({
+    'return', 'new', 'else', 'throw', 'await', 'yield', 'in', 'not', 'and',
+    'or', 'is', 'if', 'elif', 'while', 'for', 'case', 'typeof', 'delete'
+})
+KEYWORDS = (LOOP_KEYWORDS | CONDITIONAL_KEYWORDS | DEFINITION_KEYWORDS |
+            NON_TYPE_KEYWORDS | {'catch', 'sizeof'})
+
+SORTING_WORDS = ('sort', 'sorted', 'bubble', 'quick', 'merge', 'heap',
+                 'selection', 'insertion', 'radix', 'counting')
+SEARCH_WORDS = ('search', 'find', 'binary', 'linear', 'sequential')
+MATH_WORDS = ('sqrt', 'log', 'exp')
+COMPLEXITY_WORDS = ('complexity', 'time', 'space')
+
+
+class FeatureExtractor:
+    """Calcula el vector de características recorriendo los tokens una sola vez"""
+
+    feature_names = FEATURE_NAMES
+    version = FEATURE_EXTRACTOR_VERSION
+
+    def extract(self, code: str, language: str = 'python') -> np.ndarray:
+        """
+        Extrae las características del código fuente
+
+        Args:
+            code: Código fuente
+            language: Lenguaje de programación
+
+        Returns:
+            Vector de 15 características (float32)
+        """
+        indentation_blocks = language == 'python'
+
+        identifiers: Dict[str, int] = {}
+        calls: Dict[str, int] = {}
+        defined_functions: List[str] = []
+
+        num_loops = num_nested_loops = max_depth = 0
+        num_conditionals = num_assignments = num_function_calls = num_variables = 0
+        has_math = False
+        loop_in_range = loop_with_if = False
+
+        # Estado de bloques: profundidad actual y pila de profundidades de bucles
+        depth = 0
+        indent_stack = [0]
+        bracket_depth = 0
+        loop_stack: List[int] = []
+
+        # Ventana de tokens significativos anteriores
+        prev_kind = prev_value = ''
+        prev2_kind = prev2_value = ''
+        in_for_header = False
+
+        token_regex = _PYTHON_TOKENS if indentation_blocks else _BRACED_TOKENS
+        for match in token_regex.finditer(code):
+            kind = match.lastgroup
+            if kind is None:
+                # Espacio en blanco final sin token
+                continue
+            value = match.group(kind)
+
+            if kind == 'comment' or kind == 'string':
+                if kind == 'string':
+                    prev2_kind, prev2_value = prev_kind, prev_value
+                    prev_kind, prev_value = 'string', ''
+                continue
+
+            if kind == 'newline':
+                # En Python la indentación define los bloques (salvo entre paréntesis)
+                if indentation_blocks and bracket_depth == 0:
+                    end = match.end()
+                    if end < len(code) and code[end] not in '\n#':
+                        width = len(value) - 1 - value.count('\t') + value.count('\t') * 8
+                        if width > indent_stack[-1]:
+                            indent_stack.append(width)
+                        else:
+                            while len(indent_stack) > 1 and width < indent_stack[-1]:
+                                indent_stack.pop()
+                        depth = len(indent_stack) - 1
+                        if depth > max_depth:
+                            max_depth = depth
+                in_for_header = False
+                continue
+
+            if kind == 'name':
+                if value in LOOP_KEYWORDS:
+                    num_loops += 1
+                    while loop_stack and loop_stack[-1] >= depth:
+                        loop_stack.pop()
+                    if loop_stack:
+                        num_nested_loops += 1
+                    loop_stack.append(depth)
+                    in_for_header = value == 'for'
+                elif value in CONDITIONAL_KEYWORDS:
+                    num_conditionals += 1
+                    if value == 'if' and loop_stack and loop_stack[-1] == depth - 1:
+                        loop_with_if = True
+                elif value in DEFINITION_KEYWORDS:
+                    if value == 'def':
+                        num_variables += 1
+                elif prev_kind == 'name' and prev_value in DECLARATION_KEYWORDS:
+                    num_variables += 1
+                elif in_for_header and value == 'range' and prev_value == 'in':
+                    loop_in_range = True
+
+                identifiers[value] = identifiers.get(value, 0) + 1
+
+            elif kind == 'op':
+                if value == '(':
+                    if prev_kind == 'name' and prev_value not in KEYWORDS:
+                        is_definition = prev2_value in DEFINITION_KEYWORDS or (
+                            not indentation_blocks and prev2_kind == 'name'
+                            and prev2_value not in NON_TYPE_KEYWORDS
+                        )
+                        if is_definition:
+                            defined_functions.append(prev_value)
+                        else:
+                            num_function_calls += 1
+                            calls[prev_value] = calls.get(prev_value, 0) + 1
+                if value in OPENING_BRACKETS:
+                    bracket_depth += 1
+                    if value == '{' and not indentation_blocks:
+                        depth += 1
+                        if depth > max_depth:
+                            max_depth = depth
+                elif value in CLOSING_BRACKETS:
+                    bracket_depth = max(0, bracket_depth - 1)
+                    if value == '}' and not indentation_blocks:
+                        depth = max(0, depth - 1)
+                elif value in ASSIGNMENT_OPERATORS:
+                    num_assignments += 1
+                elif value in MATH_OPERATORS:
+                    has_math = True
+
+            prev2_kind, prev2_value = prev_kind, prev_value
+            prev_kind, prev_value = kind, value
+
+        # Tablas de frecuencia de identificadores: recursión y palabras clave
+        recursive_calls = 0
+        recursion_score = 0.0
+        for name in set(defined_functions):
+            count = calls.get(name, 0)
+            recursive_calls += count
+            if count > 0:
+                recursion_score += 3.0
+
+        has_sorting = has_search = False
+        mentions_fibonacci = mentions_factorial = False
+        complexity_keywords = 0
+        for identifier, count in identifiers.items():
+            name = identifier.lower()
+            if not has_sorting and any(word in name for word in SORTING_WORDS):
+                has_sorting = True
+            if not has_search and any(word in name for word in SEARCH_WORDS):
+                has_search = True
+            if not has_math and (name in ('math', 'np') or any(word in name for word in MATH_WORDS)):
+                has_math = True
+            if any(word in name for word in COMPLEXITY_WORDS):
+                complexity_keywords += count
+            if 'fibonacci' in name:
+                mentions_fibonacci = True
+            if 'factorial' in name:
+                mentions_factorial = True
+
+        if mentions_fibonacci:
+            recursion_score += 1.0
+        if mentions_factorial:
+            recursion_score += 1.0
+
+        loop_score = 0.0
+        if loop_in_range:
+            loop_score += 1.0
+        if num_nested_loops:
+            loop_score += 2.0
+        if loop_with_if:
+            loop_score += 0.5
+
+        return np.array([
+            num_loops, num_nested_loops, max_depth,
+            recursive_calls, num_conditionals, num_assignments,
+            num_function_calls, len(code), num_variables,
+            1 if has_sorting else 0, 1 if has_search else 0, 1 if has_math else 0,
+            complexity_keywords, loop_score, recursion_score
+        ], dtype=np.float32)
+
+    def describe(self, code: str, language: str = 'python') -> Dict[str, float]:
+        """Retorna las características como diccionario {nombre: valor}"""
+        return dict(zip(self.feature_names, self.extract(code, language).tolist()))
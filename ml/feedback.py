@@ -0,0 +1,140 @@
+"""
+Almacén de correcciones de los usuarios
+Guarda cada valoración de un análisis en un archivo JSONL de solo anexado y
+mantiene un cursor con lo que ya consumió el ajuste incremental
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Notaciones que un usuario puede indicar como correctas
+FEEDBACK_NOTATIONS = ['O(1)', 'O(log n)', 'O(n)', 'O(n log n)', 'O(n²)', 'O(n³)', 'O(2ⁿ)', 'O(n!)']
+
+
+def code_fingerprint(code: str) -> str:
+    return hashlib.sha1(code.strip().encode('utf-8')).hexdigest()[:16]
+
+
+class FeedbackStore:
+    """Registro persistente de valoraciones (correcto / incorrecto + notación)"""
+
+    def __init__(self, path: str = 'data/feedback.jsonl'):
+        self.path = Path(path)
+        self.cursor_path = self.path.with_name(f"{self.path.name}.cursor")
+        self._lock = threading.Lock()
+
+    def record(self, code: str, language: str, predicted: str, correct: bool,
+               label: Optional[str] = None, user_id: Optional[int] = None,
+               source: str = 'telegram') -> Dict:
+        """
+        Añade una valoración
+
+        Args:
+            code: Código analizado
+            language: Lenguaje del código
+            predicted: Notación que dio el analizador
+            correct: Si el usuario confirmó el resultado
+            label: Notación correcta indicada por el usuario (si fue incorrecto)
+            user_id: Identificador del usuario que valora
+            source: Origen de la valoración
+
+        Returns:
+            Registro guardado
+        """
+        if label is not None and label not in FEEDBACK_NOTATIONS:
+            raise ValueError(f"Notación no válida: {label}")
+
+        entry = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'fingerprint': code_fingerprint(code),
+            'code': code,
+            'language': language,
+            'predicted': predicted,
+            'correct': bool(correct),
+            'label': predicted if correct else label,
+            'user_id': user_id,
+            'source': source,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Una sola escritura en modo anexado: las líneas no se mezclan entre procesos
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        return entry
+
+    def iter_records(self, start: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """Recorre los registros desde un desplazamiento en bytes; retorna (fin_de_línea, registro)"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            for raw in f:
+                start += len(raw)
+                if not raw.endswith(b'\n'):
+                    # Línea a medio escribir: se leerá en la próxima pasada
+                    break
+                try:
+                    yield start, json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+
+    def pending(self) -> Tuple[List[Dict], int]:
+        """Muestras etiquetadas aún no consumidas por el ajuste incremental"""
+        return self.labeled(self.cursor())
+
+    def labeled(self, start: int = 0) -> Tuple[List[Dict], int]:
+        """
+        Muestras etiquetadas a partir de un desplazamiento
+
+        Si el mismo código se valoró varias veces prevalece la última
+        valoración. Las marcadas como incorrectas sin notación se descartan.
+
+        Returns:
+            Tupla (registros, desplazamiento hasta el que se leyó)
+        """
+        offset = start
+        latest: Dict[Tuple[str, str], Dict] = {}
+        for end, entry in self.iter_records(offset):
+            offset = end
+            key = (entry['fingerprint'], entry.get('language', 'python'))
+            if entry.get('label'):
+                latest.pop(key, None)
+                latest[key] = entry
+            else:
+                latest.pop(key, None)
+        return list(latest.values()), offset
+
+    def cursor(self) -> int:
+        if not self.cursor_path.exists():
+            return 0
+        with open(self.cursor_path, 'r', encoding='utf-8') as f:
+            return int(json.load(f).get('offset', 0))
+
+    def commit(self, offset: int):
+        """Marca como consumido todo lo anterior a `offset`"""
+        self.cursor_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cursor_path.with_name(f"{self.cursor_path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'offset': offset, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}, f)
+        os.replace(tmp, self.cursor_path)
+
+    def stats(self) -> Dict[str, int]:
+        """Totales de valoraciones para informes"""
+        totals = {'total': 0, 'correct': 0, 'incorrect': 0, 'relabeled': 0}
+        for _, entry in self.iter_records():
+            totals['total'] += 1
+            if entry['correct']:
+                totals['correct'] += 1
+            else:
+                totals['incorrect'] += 1
+                if entry.get('label'):
+                    totals['relabeled'] += 1
+        return totals
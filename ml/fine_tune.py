@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Ajuste incremental del clasificador con las valoraciones de los usuarios
+Mezcla las correcciones nuevas con muestras del corpus base (replay) para no
+olvidar lo aprendido, y solo publica el modelo si no empeora en el corpus base
+
+Uso: python -m ml.fine_tune --model-path models/algorithm_classifier
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Agregar el directorio raíz al path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from ml.dataset_generator import AlgorithmDatasetGenerator
+from ml.feature_cache import FeatureMatrixBuilder
+from ml.feedback import FeedbackStore
+from ml.neural_network import AlgorithmClassifier
+
+
+class FineTuner:
+    """Ajusta un modelo guardado con lotes pequeños de correcciones y replay del corpus base"""
+
+    def __init__(self, model_path: str, store: FeedbackStore, replay_ratio: int = 4,
+                 min_samples: int = 8, epochs: int = 5, batch_size: int = 16,
+                 base_samples_per_class: int = 50, holdout: float = 0.2, seed: int = 42,
+                 max_regression: float = 0.02, feature_cache: Optional[str] = 'models/feature_cache'):
+        """
+        Args:
+            model_path: Ruta base del modelo a ajustar (se sobrescribe si se acepta)
+            store: Almacén de valoraciones
+            replay_ratio: Muestras del corpus base por cada corrección
+            min_samples: Correcciones nuevas necesarias para lanzar un ajuste
+            base_samples_per_class: Tamaño del corpus base regenerado con `seed`
+            holdout: Fracción del corpus base reservada para detectar regresiones
+            max_regression: Caída máxima de precisión en el holdout que se tolera
+        """
+        self.model_path = model_path
+        self.store = store
+        self.replay_ratio = replay_ratio
+        self.min_samples = min_samples
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.base_samples_per_class = base_samples_per_class
+        self.holdout = holdout
+        self.seed = seed
+        self.max_regression = max_regression
+        self.feature_cache = feature_cache
+
+    def run(self, force: bool = False) -> Dict:
+        """
+        Ejecuta un ciclo de ajuste
+
+        Args:
+            force: Publicar el modelo aunque empeore en el holdout
+
+        Returns:
+            Diccionario con el estado ('skipped', 'accepted' o 'rejected') y las métricas
+        """
+        feedback, offset = self.store.pending()
+        report: Dict = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'feedback_samples': len(feedback),
+        }
+        if len(feedback) < self.min_samples:
+            print(f"ℹ️  {len(feedback)} correcciones nuevas (mínimo {self.min_samples}): no se ajusta")
+            report['status'] = 'skipped'
+            return report
+
+        classifier = AlgorithmClassifier(self.model_path)
+        classes = [str(c) for c in classifier.label_encoder.classes_]
+        feedback = [entry for entry in feedback if entry['label'] in classes]
+        if len(feedback) < self.min_samples:
+            # Las etiquetas que el modelo no conoce no cuentan: sin bastantes válidas no se ajusta ni se confirma
+            print(f"ℹ️  {len(feedback)} correcciones con etiquetas conocidas (mínimo {self.min_samples}): no se ajusta")
+            report['status'] = 'skipped'
+            return report
+        X_new, y_new = self._feedback_matrix(classifier, feedback)
+
+        X_pool, y_pool, X_holdout, y_holdout = self._base_split(classifier)
+        X_replay, y_replay = self._replay(X_pool, y_pool, len(y_new))
+        before = self._accuracy(classifier, X_holdout, y_holdout)
+        before_new = self._accuracy(classifier, X_new, y_new)
+
+        X = np.concatenate([X_new, X_replay])
+        y = np.concatenate([y_new, y_replay])
+        backend = classifier.backend
+        if backend.supports_incremental:
+            print(f"🔁 Ajustando con {len(y_new)} correcciones + {len(y_replay)} de replay")
+            backend.partial_fit(X, y, epochs=self.epochs, batch_size=self.batch_size)
+        else:
+            # Los modelos de scikit-learn se reentrenan con el corpus base y todas las correcciones
+            all_feedback, _ = self.store.labeled()
+            X_all, y_all = self._feedback_matrix(classifier, [e for e in all_feedback if e['label'] in classes])
+            print(f"🔁 Reentrenando {classifier.backend_name} con {len(y_all)} correcciones acumuladas")
+            backend.fit(np.concatenate([X_all, X_pool]), np.concatenate([y_all, y_pool]),
+                        X_holdout, y_holdout, epochs=self.epochs, batch_size=self.batch_size)
+
+        after = self._accuracy(classifier, X_holdout, y_holdout)
+        after_new = self._accuracy(classifier, X_new, y_new)
+        report.update({
+            'backend': classifier.backend_name,
+            'used_samples': int(len(y_new)),
+            'replay_samples': int(len(y_replay)),
+            'holdout_accuracy_before': before,
+            'holdout_accuracy_after': after,
+            'feedback_accuracy_before': before_new,
+            'feedback_accuracy_after': after_new,
+        })
+
+        print(f"📈 Precisión en holdout base: {before:.4f} -> {after:.4f}")
+        print(f"📈 Precisión en correcciones: {before_new:.4f} -> {after_new:.4f}")
+
+        if after < before - self.max_regression and not force:
+            print(f"⚠️ El ajuste empeora el corpus base más de {self.max_regression:.2%}: se descarta")
+            report['status'] = 'rejected'
+        else:
+            self._publish(classifier)
+            self.store.commit(offset)
+            print(f"✅ Modelo actualizado en: {self.model_path}")
+            report['status'] = 'accepted'
+
+        self._append_log(report)
+        return report
+
+    def _feedback_matrix(self, classifier: AlgorithmClassifier,
+                         feedback: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        if not feedback:
+            return np.zeros((0, len(classifier.feature_names)), dtype=np.float32), np.zeros(0, dtype=np.int64)
+        X = np.stack([classifier.extract_features(e['code'], e.get('language', 'python')) for e in feedback])
+        y = classifier.label_encoder.transform([e['label'] for e in feedback])
+        return X.astype(np.float32), np.asarray(y, dtype=np.int64)
+
+    def _base_split(self, classifier: AlgorithmClassifier) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Corpus base dividido en reserva para replay y holdout fijo (misma semilla en cada ciclo)"""
+        from sklearn.model_selection import train_test_split
+
+        dataset = AlgorithmDatasetGenerator().generate_training_dataset(
+            self.base_samples_per_class, seed=self.seed
+        )
+        X, labels = FeatureMatrixBuilder(cache_dir=self.feature_cache).build(dataset)
+        known = np.isin(np.asarray(labels).astype(str), classifier.label_encoder.classes_)
+        X = np.asarray(X, dtype=np.float32)[known]
+        y = classifier.label_encoder.transform(np.asarray(labels)[known])
+
+        X_pool, X_holdout, y_pool, y_holdout = train_test_split(
+            X, y, test_size=self.holdout, random_state=self.seed, stratify=y
+        )
+        return X_pool, y_pool, X_holdout, y_holdout
+
+    def _replay(self, X_pool: np.ndarray, y_pool: np.ndarray, new_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Muestra del corpus base que acompaña a las correcciones; cambia en cada ciclo"""
+        rng = np.random.RandomState((self.seed + self.store.cursor()) % 2 ** 32)
+        size = min(len(y_pool), new_samples * self.replay_ratio)
+        picked = rng.choice(len(y_pool), size=size, replace=False)
+        return X_pool[picked], y_pool[picked]
+
+    @staticmethod
+    def _accuracy(classifier: AlgorithmClassifier, X: np.ndarray, y: np.ndarray) -> float:
+        if len(y) == 0:
+            return 0.0
+        return float(np.mean(np.argmax(classifier.backend.predict_proba(X), axis=1) == y))
+
+    def _publish(self, classifier: AlgorithmClassifier):
+        """Guarda en archivos temporales y los renombra: el bot nunca lee un modelo a medias"""
+        target = Path(self.model_path)
+        staging = str(target.with_name(f".{target.name}.finetune-{os.getpid()}"))
+        classifier.save_model(staging)
+        backend = classifier.backend
+        os.replace(backend.model_file(staging), backend.model_file(self.model_path))
+        # Los metadatos al final: un lector que los vea ya encuentra el modelo nuevo
+        os.replace(f"{staging}_metadata.json", f"{self.model_path}_metadata.json")
+
+    def _append_log(self, report: Dict):
+        log_path = Path(f"{self.model_path}_finetune.json")
+        log = []
+        if log_path.exists():
+            with open(log_path, 'r', encoding='utf-8') as f:
+                log = json.load(f)
+        log.append(report)
+        with open(log_path, 'w', encoding='utf-8') as f:
+            json.dump(log, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajustar el clasificador con las valoraciones de los usuarios")
+    parser.add_argument('--model-path', type=str, default='models/algorithm_classifier',
+                       help='Modelo a ajustar (default: models/algorithm_classifier)')
+    parser.add_argument('--feedback', type=str, default='data/feedback.jsonl',
+                       help='Archivo de valoraciones (default: data/feedback.jsonl)')
+    parser.add_argument('--min-samples', type=int, default=8,
+                       help='Correcciones nuevas necesarias para ajustar (default: 8)')
+    parser.add_argument('--replay-ratio', type=int, default=4,
+                       help='Muestras del corpus base por corrección (default: 4)')
+    parser.add_argument('--epochs', type=int, default=5,
+                       help='Épocas del ajuste (default: 5)')
+    parser.add_argument('--batch-size', type=int, default=16,
+                       help='Tamaño del lote (default: 16)')
+    parser.add_argument('--base-samples', type=int, default=50,
+                       help='Muestras por clase del corpus base (default: 50)')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Semilla del corpus base (default: 42)')
+    parser.add_argument('--max-regression', type=float, default=0.02,
+                       help='Caída de precisión tolerada en el corpus base (default: 0.02)')
+    parser.add_argument('--force', action='store_true',
+                       help='Publicar el modelo aunque empeore en el corpus base')
+
+    args = parser.parse_args()
+
+    tuner = FineTuner(args.model_path, FeedbackStore(args.feedback), replay_ratio=args.replay_ratio,
+                      min_samples=args.min_samples, epochs=args.epochs, batch_size=args.batch_size,
+                      base_samples_per_class=args.base_samples, seed=args.seed,
+                      max_regression=args.max_regression)
+    report = tuner.run(force=args.force)
+    sys.exit(0 if report['status'] != 'rejected' else 1)
+
+
+if __name__ == "__main__":
+    main()
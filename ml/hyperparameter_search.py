@@ -0,0 +1,253 @@
+"""
+Búsqueda de hiperparámetros con validación cruzada k-fold
+Los folds se evalúan en procesos paralelos que leen la misma matriz de
+características mapeada en memoria
+"""
+
+import itertools
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .backends import BACKENDS, create_backend
+
+
+# Espacio de búsqueda por defecto: backend -> parámetro -> valores candidatos
+DEFAULT_SEARCH_SPACE: Dict[str, Dict[str, List]] = {
+    'numpy_mlp': {
+        'hidden': [(16,), (32,), (64, 32), (128, 64, 32)],
+        'learning_rate': [1e-3, 3e-3],
+        'l2': [1e-4, 1e-3],
+    },
+    'keras': {
+        'units': [(32,), (64, 32), (128, 64, 32)],
+        'dropout': [(0.0, 0.0, 0.0), (0.3, 0.2, 0.0)],
+        'learning_rate': [1e-3],
+    },
+    'logistic': {
+        'C': [0.1, 1.0, 10.0],
+    },
+    'random_forest': {
+        'n_estimators': [25, 100, 200],
+        'max_depth': [None, 8],
+    },
+    'gradient_boosting': {
+        'max_iter': [50, 200],
+        'learning_rate': [0.05, 0.1],
+        'max_depth': [None, 4],
+    },
+}
+
+
+def search_candidates(space: Dict[str, Dict[str, List]], mode: str = 'grid',
+                      n_iter: int = 20, seed: int = 42) -> List[Tuple[str, Dict]]:
+    """
+    Enumera las configuraciones a evaluar
+
+    Args:
+        space: Espacio de búsqueda por backend
+        mode: 'grid' (producto cartesiano completo) o 'random' (muestra sin repetición)
+        n_iter: Configuraciones a muestrear en modo 'random'
+        seed: Semilla del muestreo
+
+    Returns:
+        Lista de pares (backend, parámetros)
+    """
+    if mode not in ('grid', 'random'):
+        raise ValueError(f"Modo de búsqueda no soportado: {mode}")
+
+    grid: List[Tuple[str, Dict]] = []
+    for backend, params in space.items():
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend}")
+        names = sorted(params)
+        for values in itertools.product(*(params[name] for name in names)):
+            grid.append((backend, dict(zip(names, values))))
+
+    if mode == 'random' and n_iter < len(grid):
+        grid = random.Random(seed).sample(grid, n_iter)
+    return grid
+
+
+def _evaluate_fold(x_path: str, y_path: str, classes: List[str], train_index: np.ndarray,
+                   val_index: np.ndarray, backend_name: str, params: Dict, epochs: int,
+                   batch_size: int, measure_size: bool) -> Dict:
+    """Entrena y valida una configuración en un fold (se ejecuta en un proceso hijo)"""
+    X = np.load(x_path, mmap_mode='r')
+    labels = np.load(y_path, mmap_mode='r')
+    y = np.searchsorted(np.asarray(classes), np.asarray(labels))
+
+    X_train, y_train = np.asarray(X[train_index], dtype=np.float32), y[train_index]
+    X_val, y_val = np.asarray(X[val_index], dtype=np.float32), y[val_index]
+
+    backend = create_backend(backend_name, X.shape[1], len(classes), verbose=False, **params)
+    start = time.perf_counter()
+    try:
+        history = backend.fit(X_train, y_train, X_val, y_val, epochs=epochs, batch_size=batch_size)
+    except ImportError as e:
+        # Backend opcional sin instalar (keras sin TensorFlow): se omite en la búsqueda
+        return {'skipped': f'dependencia no disponible: {e.name or e}'}
+    train_seconds = time.perf_counter() - start
+
+    predictions = np.argmax(backend.predict_proba(X_val), axis=1)
+    result = {
+        'accuracy': float(np.mean(predictions == y_val)),
+        'epochs': len(history.history.get('accuracy', [])),
+        'train_seconds': train_seconds,
+    }
+    if measure_size:
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = str(Path(tmp) / 'model')
+            backend.save(model_path)
+            result['model_bytes'] = backend.model_file(model_path).stat().st_size
+    return result
+
+
+class HyperparameterSearch:
+    """Evalúa configuraciones con k-fold y elige la mejor o la más pequeña suficiente"""
+
+    def __init__(self, space: Optional[Dict[str, Dict[str, List]]] = None, mode: str = 'grid',
+                 n_iter: int = 20, folds: int = 5, epochs: int = 100, batch_size: int = 32,
+                 patience: int = 10, workers: Optional[int] = None, seed: int = 42):
+        self.space = space if space is not None else DEFAULT_SEARCH_SPACE
+        self.mode = mode
+        self.n_iter = n_iter
+        self.folds = folds
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.patience = patience
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+
+    def run(self, X: np.ndarray, y: np.ndarray, target_accuracy: Optional[float] = None) -> Dict:
+        """
+        Ejecuta la búsqueda
+
+        Args:
+            X: Matriz de características (idealmente mapeada en memoria desde la caché)
+            y: Etiquetas de complejidad
+            target_accuracy: Precisión media mínima; si se indica se elige el
+                             modelo más pequeño que la alcanza
+
+        Returns:
+            Diccionario con los resultados por configuración y la selección
+        """
+        labels = np.asarray(y).astype(str)
+        classes = sorted(set(labels.tolist()))
+        splits = self.splits(labels)
+        folds = len(splits)
+        candidates = search_candidates(self.space, self.mode, self.n_iter, self.seed)
+        print(f"🔎 {len(candidates)} configuraciones × {folds} folds en {self.workers} procesos")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            x_path, y_path = self._shared_paths(X, labels, tmp)
+            jobs = []
+            for c, (backend, params) in enumerate(candidates):
+                fold_params = dict(params)
+                if backend in ('numpy_mlp', 'keras'):
+                    fold_params.setdefault('patience', self.patience)
+                for f, (train_index, val_index) in enumerate(splits):
+                    jobs.append((c, (x_path, y_path, classes, train_index, val_index, backend,
+                                     fold_params, self.epochs, self.batch_size, f == 0)))
+
+            fold_results: Dict[int, List[Dict]] = {c: [] for c in range(len(candidates))}
+            if self.workers <= 1:
+                for c, args in jobs:
+                    fold_results[c].append(_evaluate_fold(*args))
+            else:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+                    futures = [(c, executor.submit(_evaluate_fold, *args)) for c, args in jobs]
+                    for c, future in futures:
+                        fold_results[c].append(future.result())
+
+        results = []
+        skipped: Dict[str, str] = {}
+        for c, (backend, params) in enumerate(candidates):
+            folds_done = fold_results[c]
+            reason = next((r['skipped'] for r in folds_done if 'skipped' in r), None)
+            if reason is not None:
+                skipped[backend] = reason
+                continue
+            accuracies = [r['accuracy'] for r in folds_done]
+            results.append({
+                'backend': backend,
+                'params': params,
+                'accuracy_mean': float(np.mean(accuracies)),
+                'accuracy_std': float(np.std(accuracies)),
+                'epochs_mean': float(np.mean([r['epochs'] for r in folds_done])),
+                'train_seconds': float(np.mean([r['train_seconds'] for r in folds_done])),
+                'model_bytes': next((r['model_bytes'] for r in folds_done if 'model_bytes' in r), 0),
+            })
+        results.sort(key=lambda r: (-r['accuracy_mean'], r['model_bytes']))
+
+        return {
+            'folds': folds,
+            'mode': self.mode,
+            'target_accuracy': target_accuracy,
+            'results': results,
+            'skipped': skipped,
+            'selected': self.select(results, target_accuracy),
+        }
+
+    def splits(self, labels: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Pares (entrenamiento, validación) estratificados del k-fold
+
+        El número de folds se reduce si la clase más pequeña no tiene una
+        muestra para cada fold (mínimo 2)
+        """
+        from sklearn.model_selection import StratifiedKFold
+
+        labels = np.asarray(labels).astype(str)
+        min_count = min(int(np.sum(labels == c)) for c in set(labels.tolist()))
+        folds = max(2, min(self.folds, min_count))
+        if folds != self.folds:
+            print(f"⚠️ Solo hay {min_count} muestras en la clase más pequeña: se usan {folds} folds")
+
+        splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=self.seed)
+        return list(splitter.split(np.zeros(len(labels)), labels))
+
+    @staticmethod
+    def select(results: List[Dict], target_accuracy: Optional[float] = None) -> Optional[Dict]:
+        """El modelo más pequeño que cumple el objetivo; si ninguno lo cumple, el más preciso"""
+        if not results:
+            return None
+        if target_accuracy is not None:
+            passing = [r for r in results if r['accuracy_mean'] >= target_accuracy]
+            if passing:
+                return min(passing, key=lambda r: (r['model_bytes'], -r['accuracy_mean']))
+        return max(results, key=lambda r: (r['accuracy_mean'], -r['model_bytes']))
+
+    def _shared_paths(self, X: np.ndarray, labels: np.ndarray, tmp: str) -> Tuple[str, str]:
+        """Rutas .npy que leen los procesos; reutiliza la caché si X ya está en disco"""
+        x_file = getattr(X, 'filename', None)
+        if isinstance(X, np.memmap) and x_file and Path(x_file).exists():
+            x_path = str(x_file)
+        else:
+            x_path = str(Path(tmp) / 'X.npy')
+            np.save(x_path, np.asarray(X, dtype=np.float32))
+        y_path = str(Path(tmp) / 'y.npy')
+        np.save(y_path, labels)
+        return x_path, y_path
+
+
+def print_search_summary(search: Dict, limit: int = 15):
+    """Tabla resumen de la búsqueda ordenada por precisión"""
+    target = search.get('target_accuracy')
+    selected = search.get('selected')
+    print(f"\n{'#':>3}  {'Backend':<18}{'Parámetros':<44}{'acc':>14}{'épocas':>8}{'train s':>9}{'KB':>9}")
+    print("-" * 105)
+    for rank, result in enumerate(search['results'][:limit], 1):
+        params = ', '.join(f"{k}={v}" for k, v in sorted(result['params'].items()))
+        accuracy = f"{result['accuracy_mean']:.3f}±{result['accuracy_std']:.3f}"
+        marker = '◀' if result is selected else ('✓' if target is not None and result['accuracy_mean'] >= target else ' ')
+        print(f"{rank:>3}{marker} {result['backend']:<18}{params[:43]:<44}{accuracy:>14}"
+              f"{result['epochs_mean']:>8.1f}{result['train_seconds']:>9.2f}{result['model_bytes'] / 1024:>9.1f}")
+    for backend, reason in search.get('skipped', {}).items():
+        print(f"⏭️  {backend} omitido: {reason}")
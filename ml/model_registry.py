@@ -0,0 +1,167 @@
+"""
+Registro de modelos compartido por todo el proceso
+Cada versión de un modelo se carga una sola vez y la comparten todos los
+analizadores; un hilo vigila los archivos y cambia a la versión nueva sin
+reiniciar ni interrumpir los análisis en curso
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .neural_network import AlgorithmClassifier
+
+
+# Fragmento con el que se comprueba un modelo recién cargado antes de publicarlo
+SMOKE_TEST_CODE = "def total(arr):\n    s = 0\n    for x in arr:\n        s += x\n    return s\n"
+
+
+def model_signature(model_path: str) -> Optional[Tuple]:
+    """Tamaño y fecha de los archivos del modelo; None si aún no existe"""
+    path = Path(model_path)
+    metadata = Path(f"{model_path}_metadata.json")
+    if not metadata.exists():
+        return None
+    files = [metadata] + sorted(path.parent.glob(f"{path.name}_model*"))
+    signature = []
+    for file in files:
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        signature.append((file.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class ModelHandle:
+    """
+    Referencia estable a la versión vigente de un modelo
+
+    Los analizadores guardan el handle, no el clasificador: al publicar una
+    versión nueva solo cambia `classifier`, y quien ya lo había leído termina
+    su análisis con la versión anterior.
+    """
+
+    def __init__(self, model_path: str, classifier: AlgorithmClassifier, signature: Optional[Tuple]):
+        self.model_path = model_path
+        self.classifier = classifier
+        self.signature = signature
+        self.version = 1
+        self.loaded_at = time.time()
+
+    def swap(self, classifier: AlgorithmClassifier, signature: Optional[Tuple]):
+        # Una sola asignación de atributo: los lectores ven la versión vieja o la nueva
+        self.signature = signature
+        self.loaded_at = time.time()
+        self.version += 1
+        self.classifier = classifier
+
+
+class ModelRegistry:
+    """Carga cada modelo una vez por proceso y lo recarga en caliente cuando cambia"""
+
+    def __init__(self, poll_interval: float = 5.0):
+        self.poll_interval = poll_interval
+        self._handles: Dict[str, ModelHandle] = {}
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def get(self, model_path: str) -> ModelHandle:
+        """
+        Handle del modelo, cargándolo si es la primera vez
+
+        Raises:
+            Exception: Si el modelo no se puede cargar
+        """
+        key = self._key(model_path)
+        handle = self._handles.get(key)
+        if handle is not None:
+            return handle
+
+        # La carga se hace bajo el candado: peticiones simultáneas no duplican el modelo
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                signature = model_signature(model_path)
+                handle = ModelHandle(model_path, AlgorithmClassifier(model_path), signature)
+                self._handles[key] = handle
+        return handle
+
+    def reload(self, model_path: str, force: bool = False) -> bool:
+        """
+        Carga la versión en disco si cambió y la publica
+
+        La versión nueva se carga y se prueba aparte; si falla (por ejemplo,
+        archivos a medio escribir) se conserva la anterior y se reintenta en
+        la siguiente comprobación.
+
+        Returns:
+            True si se publicó una versión nueva
+        """
+        handle = self._handles.get(self._key(model_path))
+        if handle is None:
+            return False
+
+        signature = model_signature(model_path)
+        if signature is None or (signature == handle.signature and not force):
+            return False
+
+        try:
+            classifier = AlgorithmClassifier(model_path)
+            classifier.predict(SMOKE_TEST_CODE)
+        except Exception as e:
+            print(f"⚠️ No se pudo recargar el modelo {model_path}: {e}")
+            return False
+
+        # Si los archivos cambiaron durante la carga, se espera a la próxima comprobación
+        if model_signature(model_path) != signature:
+            return False
+
+        handle.swap(classifier, signature)
+        print(f"🔄 Modelo recargado: {model_path} (versión {handle.version})")
+        return True
+
+    def check(self) -> int:
+        """Comprueba todos los modelos registrados; retorna cuántos se recargaron"""
+        return sum(1 for handle in list(self._handles.values()) if self.reload(handle.model_path))
+
+    def watch(self, poll_interval: Optional[float] = None):
+        """Inicia (una sola vez) el hilo que vigila los modelos registrados"""
+        if poll_interval is not None:
+            self.poll_interval = poll_interval
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch_loop, name='model-registry', daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        """Detiene el hilo de vigilancia"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    @staticmethod
+    def _key(model_path: str) -> str:
+        return str(Path(model_path).resolve())
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """Registro único del proceso"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
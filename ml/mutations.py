@@ -0,0 +1,660 @@
+"""
+Mutaciones de código que preservan la semántica, basadas en el AST
+Cada transformación reescribe el árbol de sintaxis y solo se acepta si el
+código resultante vuelve a compilar, por lo que todas las muestras son válidas
+"""
+
+import ast
+import builtins
+import copy
+import keyword
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+
+MUTATIONS = ('rename', 'reorder', 'for_to_while', 'while_to_for', 'extract_helper', 'inline_helper')
+
+# Nombres alternativos por rol del identificador original
+NAME_POOLS = {
+    'sequence': ['data', 'items', 'values', 'nums', 'elements', 'seq', 'array', 'lst'],
+    'index': ['idx', 'pos', 'k', 'm', 'p', 'q', 'u', 'v'],
+    'size': ['size', 'length', 'count', 'num', 'limit', 'total_items'],
+    'key': ['key', 'item', 'value', 'needle', 'goal', 'wanted'],
+}
+ROLE_NAMES = {
+    'sequence': {'arr', 'array', 'data', 'lst', 'nums', 'items', 'elements', 'seq', 'values'},
+    'index': {'i', 'j', 'k', 'l', 'idx', 'pos'},
+    'size': {'n', 'size', 'length', 'count', 'num'},
+    'key': {'target', 'key', 'item', 'value', 'x'},
+}
+FUNCTION_PREFIXES = ['my_', 'do_', 'run_', 'compute_']
+# Sufijos de las funciones auxiliares extraídas (no se vuelven a dividir)
+HELPER_SUFFIXES = ('_step', '_block')
+FUNCTION_SUFFIXES = ['_impl', '_fn', '_v2', '_algo']
+
+# Métodos que cambian el tamaño del contenedor sobre el que se llaman
+MUTATING_METHODS = frozenset({
+    'append', 'extend', 'insert', 'pop', 'remove', 'clear',
+    'popleft', 'appendleft', 'add', 'discard', 'update'
+})
+# Funciones puras permitidas en los límites de un bucle
+PURE_FUNCTIONS = frozenset({'len', 'min', 'max', 'abs', 'int'})
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+# Nodos que impiden mover sentencias a otra función
+UNMOVABLE_NODES = (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp,
+                   ast.Yield, ast.YieldFrom, ast.Await, ast.NamedExpr)
+
+
+def _mutate_batch(pairs: List[Tuple[str, str]], mutations: Sequence[str],
+                  max_mutations: int) -> List[str]:
+    """Aplica las mutaciones a un bloque de (código, semilla) en un proceso hijo"""
+    mutator = ASTMutator(mutations, max_mutations)
+    return [mutator.mutate(code, random.Random(seed)) for code, seed in pairs]
+
+
+def _names(node: ast.AST, ctx: type) -> Set[str]:
+    """Identificadores con el contexto dado (ast.Load o ast.Store) dentro de un nodo"""
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ctx)}
+
+
+def _stored(nodes: Sequence[ast.AST]) -> Set[str]:
+    names: Set[str] = set()
+    for node in nodes:
+        names |= _names(node, ast.Store)
+    return names
+
+
+def _has_continue(body: Sequence[ast.stmt]) -> bool:
+    """Detecta 'continue' del bucle actual (sin entrar en bucles ni funciones internas)"""
+    pending = list(body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, ast.Continue):
+            return True
+        if isinstance(node, LOOP_NODES):
+            pending.extend(node.orelse)
+            continue
+        if isinstance(node, SCOPE_NODES):
+            continue
+        pending.extend(ast.iter_child_nodes(node))
+    return False
+
+
+def _int_constant(node: ast.AST) -> Optional[int]:
+    """Valor de una constante entera, incluidas las negativas"""
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    if (isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub)
+            and isinstance(node.operand, ast.Constant) and type(node.operand.value) is int):
+        return -node.operand.value
+    return None
+
+
+def _bound_is_stable(bound: ast.AST, body: Sequence[ast.stmt]) -> bool:
+    """
+    Comprueba que el límite de un bucle vale lo mismo en cada iteración
+
+    Solo se aceptan nombres, constantes, aritmética y llamadas puras cuyos
+    argumentos el cuerpo no reasigna ni cambia de tamaño.
+    """
+    for node in ast.walk(bound):
+        if isinstance(node, ast.Call):
+            if not (isinstance(node.func, ast.Name) and node.func.id in PURE_FUNCTIONS and not node.keywords):
+                return False
+        elif not isinstance(node, (ast.Name, ast.Constant, ast.BinOp, ast.UnaryOp,
+                                   ast.operator, ast.unaryop, ast.expr_context)):
+            return False
+
+    names = _names(bound, ast.Load)
+    if names & _stored(body):
+        return False
+    for statement in body:
+        for node in ast.walk(statement):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and node.func.attr in MUTATING_METHODS
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id in names):
+                return False
+    return True
+
+
+class ASTMutator:
+    """Genera variantes de un programa Python que conservan su comportamiento"""
+
+    def __init__(self, mutations: Sequence[str] = MUTATIONS, max_mutations: int = 3):
+        unknown = set(mutations) - set(MUTATIONS)
+        if unknown:
+            raise ValueError(f"Mutaciones desconocidas: {sorted(unknown)}")
+        self.mutations = tuple(mutations)
+        self.max_mutations = max_mutations
+
+    def mutate(self, code: str, rng=None) -> str:
+        """
+        Aplica entre 1 y `max_mutations` transformaciones aleatorias
+
+        Args:
+            code: Código fuente Python
+            rng: Generador aleatorio (random.Random o el módulo random)
+
+        Returns:
+            Código transformado; el original si no se pudo aplicar ninguna mutación
+        """
+        rng = rng if rng is not None else random
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return code
+
+        applied = 0
+        for _ in range(rng.randint(1, self.max_mutations)):
+            for name in rng.sample(self.mutations, len(self.mutations)):
+                candidate = copy.deepcopy(tree)
+                if not getattr(self, f'_{name}')(candidate, rng):
+                    continue
+                source = self._unparse(candidate)
+                if source is not None:
+                    tree = ast.parse(source)
+                    applied += 1
+                    break
+
+        if not applied:
+            return code
+        return ast.unparse(tree)
+
+    def mutate_many(self, codes: Sequence[str], seeds: Sequence[str],
+                    workers: Optional[int] = None, chunk_size: int = 64) -> List[str]:
+        """
+        Muta muchos fragmentos en procesos paralelos
+
+        Cada fragmento usa su propia semilla, así que el resultado es el mismo
+        que llamando a `mutate` en serie con random.Random(semilla).
+        """
+        pairs = list(zip(codes, seeds))
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(pairs) <= chunk_size:
+            return [self.mutate(code, random.Random(seed)) for code, seed in pairs]
+
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results: List[str] = []
+            for part in executor.map(_mutate_batch, chunks, [self.mutations] * len(chunks),
+                                     [self.max_mutations] * len(chunks)):
+                results.extend(part)
+        return results
+
+    def _unparse(self, tree: ast.Module) -> Optional[str]:
+        """Regenera el código y verifica que compila"""
+        ast.fix_missing_locations(tree)
+        try:
+            source = ast.unparse(tree)
+            compile(source, '<mutation>', 'exec')
+        except (SyntaxError, ValueError, RecursionError):
+            return None
+        return source
+
+    # ------------------------------------------------------------------
+    # Utilidades de recorrido
+    # ------------------------------------------------------------------
+
+    def _statement_lists(self, tree: ast.Module) -> Iterator[Tuple[List[ast.stmt], Optional[FunctionNode]]]:
+        """Recorre cada lista de sentencias junto con la función que la contiene"""
+        owners: Dict[int, FunctionNode] = {}
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # ast.walk es en anchura: las funciones internas sobrescriben a las externas
+                for child in ast.walk(node):
+                    if child is not node:
+                        owners[id(child)] = node
+
+        for node in ast.walk(tree):
+            for field in ('body', 'orelse', 'finalbody'):
+                statements = getattr(node, field, None)
+                if isinstance(statements, list) and statements and isinstance(statements[0], ast.stmt):
+                    owner = node if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else owners.get(id(node))
+                    yield statements, owner
+
+    def _used_outside(self, function: FunctionNode, name: str, inside: Sequence[ast.AST]) -> bool:
+        """Indica si un nombre aparece en la función fuera de los nodos dados"""
+        excluded = {id(n) for node in inside for n in ast.walk(node)}
+        for node in ast.walk(function):
+            if id(node) in excluded:
+                continue
+            if isinstance(node, ast.Name) and node.id == name:
+                return True
+            if isinstance(node, ast.arg) and node.arg == name:
+                return True
+        return False
+
+    def _all_identifiers(self, tree: ast.AST) -> Set[str]:
+        names: Set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name):
+                names.add(node.id)
+            elif isinstance(node, ast.arg):
+                names.add(node.arg)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.add(node.name)
+            elif isinstance(node, ast.Attribute):
+                names.add(node.attr)
+            elif isinstance(node, ast.alias):
+                names.add((node.asname or node.name).split('.')[0])
+        return names
+
+    def _fresh_name(self, candidates: Sequence[str], taken: Set[str], rng) -> str:
+        """Elige un nombre libre que no sea palabra clave ni builtin"""
+        for candidate in rng.sample(list(candidates), len(candidates)):
+            if candidate not in taken and not keyword.iskeyword(candidate) and not hasattr(builtins, candidate):
+                return candidate
+        base = rng.choice(list(candidates))
+        suffix = 2
+        while f"{base}{suffix}" in taken:
+            suffix += 1
+        return f"{base}{suffix}"
+
+    # ------------------------------------------------------------------
+    # Transformaciones: cada una retorna True si modificó el árbol
+    # ------------------------------------------------------------------
+
+    def _rename(self, tree: ast.Module, rng) -> bool:
+        """Renombra de forma consistente variables, parámetros y funciones"""
+        variables: Set[str] = set()
+        functions: Set[str] = set()
+        excluded: Set[str] = set()
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                # Los métodos se referencian por atributo: no se renombran
+                excluded.update(item.name for item in node.body
+                                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.add(node.name)
+                if node.decorator_list:
+                    excluded.add(node.name)
+            elif isinstance(node, ast.arg):
+                variables.add(node.arg)
+            elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                variables.add(node.id)
+            elif isinstance(node, ast.keyword) and node.arg:
+                # Renombrar un parámetro rompería las llamadas con argumentos nombrados
+                excluded.add(node.arg)
+            elif isinstance(node, ast.alias):
+                excluded.add((node.asname or node.name).split('.')[0])
+
+        candidates = sorted(
+            name for name in (variables | functions) - excluded
+            if not name.startswith('__') and name not in ('self', 'cls') and not hasattr(builtins, name)
+        )
+        if not candidates:
+            return False
+
+        chosen = rng.sample(candidates, rng.randint(1, len(candidates)))
+        taken = self._all_identifiers(tree)
+        mapping: Dict[str, str] = {}
+        for name in chosen:
+            if name in functions:
+                options = ([prefix + name for prefix in FUNCTION_PREFIXES] +
+                           [name + suffix for suffix in FUNCTION_SUFFIXES])
+            else:
+                role = next((r for r, names in ROLE_NAMES.items() if name in names), None)
+                options = NAME_POOLS[role] if role else [f"{name}_{s}" for s in ('val', 'tmp', 'var', 'ref')]
+            new_name = self._fresh_name([o for o in options if o != name], taken, rng)
+            mapping[name] = new_name
+            taken.add(new_name)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Name) and node.id in mapping:
+                node.id = mapping[node.id]
+            elif isinstance(node, ast.arg) and node.arg in mapping:
+                node.arg = mapping[node.arg]
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name in mapping:
+                node.name = mapping[node.name]
+            elif isinstance(node, (ast.Global, ast.Nonlocal)):
+                node.names = [mapping.get(name, name) for name in node.names]
+        return True
+
+    def _reorder(self, tree: ast.Module, rng) -> bool:
+        """Intercambia dos asignaciones adyacentes sin dependencias entre sí"""
+        pairs = []
+        for statements, _ in self._statement_lists(tree):
+            for i in range(len(statements) - 1):
+                if self._independent(statements[i], statements[i + 1]):
+                    pairs.append((statements, i))
+        if not pairs:
+            return False
+
+        statements, i = rng.choice(pairs)
+        statements[i], statements[i + 1] = statements[i + 1], statements[i]
+        return True
+
+    def _effects(self, statement: ast.stmt) -> Optional[Tuple[Set[str], Set[str]]]:
+        """Nombres leídos y escritos por una asignación sin llamadas; None si no aplica"""
+        if not isinstance(statement, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+            return None
+        if any(isinstance(n, (ast.Call, ast.Await, ast.Yield, ast.YieldFrom, ast.NamedExpr))
+               for n in ast.walk(statement)):
+            return None
+
+        reads = _names(statement, ast.Load)
+        writes = _names(statement, ast.Store)
+        targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+        for target in targets:
+            for node in ast.walk(target):
+                # Escribir en un elemento o atributo modifica el objeto base
+                if isinstance(node, (ast.Subscript, ast.Attribute)):
+                    writes |= _names(node.value, ast.Load)
+        if isinstance(statement, ast.AugAssign):
+            reads |= writes
+        return reads, writes
+
+    def _independent(self, first: ast.stmt, second: ast.stmt) -> bool:
+        a, b = self._effects(first), self._effects(second)
+        if a is None or b is None:
+            return False
+        (reads_a, writes_a), (reads_b, writes_b) = a, b
+        return not (writes_a & (reads_b | writes_b)) and not (writes_b & reads_a)
+
+    def _for_to_while(self, tree: ast.Module, rng) -> bool:
+        """Convierte 'for v in range(...)' en un bucle while equivalente"""
+        candidates = []
+        for statements, function in self._statement_lists(tree):
+            if function is None:
+                continue
+            for i, loop in enumerate(statements):
+                bounds = self._range_bounds(loop)
+                if bounds is None:
+                    continue
+                var = loop.target.id
+                if var in _stored(loop.body) or _has_continue(loop.body):
+                    continue
+                if var in _names(loop.iter, ast.Load):
+                    continue
+                if not all(_bound_is_stable(b, loop.body) for b in bounds[:2]):
+                    continue
+                # Tras el bucle la variable vale distinto en for y en while
+                if self._used_outside(function, var, [loop]):
+                    continue
+                candidates.append((statements, i, bounds))
+        if not candidates:
+            return False
+
+        statements, i, (start, stop, step) = rng.choice(candidates)
+        loop = statements[i]
+        var = loop.target.id
+        init = ast.Assign(targets=[ast.Name(id=var, ctx=ast.Store())], value=start)
+        test = ast.Compare(left=ast.Name(id=var, ctx=ast.Load()),
+                           ops=[ast.Lt() if step > 0 else ast.Gt()], comparators=[stop])
+        increment = ast.AugAssign(target=ast.Name(id=var, ctx=ast.Store()),
+                                  op=ast.Add() if step > 0 else ast.Sub(),
+                                  value=ast.Constant(value=abs(step)))
+        statements[i:i + 1] = [init, ast.While(test=test, body=loop.body + [increment], orelse=[])]
+        return True
+
+    def _range_bounds(self, loop: ast.stmt) -> Optional[Tuple[ast.expr, ast.expr, int]]:
+        """(inicio, fin, paso) de un 'for v in range(...)' simple"""
+        if not (isinstance(loop, ast.For) and isinstance(loop.target, ast.Name) and not loop.orelse):
+            return None
+        call = loop.iter
+        if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name)
+                and call.func.id == 'range' and not call.keywords and 1 <= len(call.args) <= 3):
+            return None
+        if any(isinstance(arg, ast.Starred) for arg in call.args):
+            return None
+
+        if len(call.args) == 1:
+            return ast.Constant(value=0), call.args[0], 1
+        step = _int_constant(call.args[2]) if len(call.args) == 3 else 1
+        if not step:
+            return None
+        return call.args[0], call.args[1], step
+
+    def _while_to_for(self, tree: ast.Module, rng) -> bool:
+        """Convierte 'v = a; while v < b: ...; v += c' en 'for v in range(a, b, c)'"""
+        candidates = []
+        for statements, function in self._statement_lists(tree):
+            if function is None:
+                continue
+            for i in range(1, len(statements)):
+                shape = self._counter_loop(statements[i - 1], statements[i])
+                if shape is None:
+                    continue
+                var, loop = shape[0], statements[i]
+                if self._used_outside(function, var, [statements[i - 1], loop]):
+                    continue
+                candidates.append((statements, i, shape))
+        if not candidates:
+            return False
+
+        statements, i, (var, start, stop, step) = rng.choice(candidates)
+        loop = statements[i]
+        if isinstance(start, ast.Constant) and start.value == 0 and step == 1:
+            args = [stop]
+        else:
+            args = [start, stop] + ([ast.Constant(value=step)] if step != 1 else [])
+        body = loop.body[:-1] or [ast.Pass()]
+        new_loop = ast.For(target=ast.Name(id=var, ctx=ast.Store()),
+                           iter=ast.Call(func=ast.Name(id='range', ctx=ast.Load()), args=args, keywords=[]),
+                           body=body, orelse=[])
+        statements[i - 1:i + 1] = [new_loop]
+        return True
+
+    def _counter_loop(self, init: ast.stmt, loop: ast.stmt) -> Optional[Tuple[str, ast.expr, ast.expr, int]]:
+        """Reconoce un bucle while con contador; retorna (variable, inicio, fin, paso)"""
+        if not (isinstance(loop, ast.While) and not loop.orelse and loop.body):
+            return None
+        if not (isinstance(init, ast.Assign) and len(init.targets) == 1 and isinstance(init.targets[0], ast.Name)):
+            return None
+        var = init.targets[0].id
+
+        test = loop.test
+        if not (isinstance(test, ast.Compare) and len(test.ops) == 1
+                and isinstance(test.ops[0], (ast.Lt, ast.LtE))
+                and isinstance(test.left, ast.Name) and test.left.id == var):
+            return None
+
+        last = loop.body[-1]
+        if not (isinstance(last, ast.AugAssign) and isinstance(last.op, ast.Add)
+                and isinstance(last.target, ast.Name) and last.target.id == var):
+            return None
+        step = _int_constant(last.value)
+        if not step or step < 0:
+            return None
+
+        body = loop.body[:-1]
+        stop = test.comparators[0]
+        if var in _stored(body) or var in _names(stop, ast.Load) or _has_continue(body):
+            return None
+        if not _bound_is_stable(stop, loop.body):
+            return None
+        if isinstance(test.ops[0], ast.LtE):
+            stop = ast.BinOp(left=stop, op=ast.Add(), right=ast.Constant(value=1))
+        return var, init.value, stop, step
+
+    def _extract_helper(self, tree: ast.Module, rng) -> bool:
+        """Mueve un bloque de sentencias simples a una función auxiliar"""
+        candidates = []
+        top_level = {id(node) for node in tree.body}
+        for statements, function in self._statement_lists(tree):
+            if function is None or id(function) not in top_level or not self._can_move_from(function):
+                continue
+            if any(suffix in function.name for suffix in HELPER_SUFFIXES):
+                continue
+            start = 0
+            while start < len(statements):
+                end = start
+                while end < len(statements) and self._is_movable(statements[end]):
+                    end += 1
+                if end > start:
+                    candidates.append((statements, function, start, end))
+                start = end + 1
+        if not candidates:
+            return False
+
+        statements, function, start, end = rng.choice(candidates)
+        first = rng.randrange(start, end)
+        last = rng.randrange(first, end) + 1
+        block = statements[first:last]
+
+        local_names = _stored([function]) | {a.arg for a in ast.walk(function.args) if isinstance(a, ast.arg)}
+        inputs: List[str] = []
+        written: Set[str] = set()
+        for statement in block:
+            reads = _names(statement, ast.Load)
+            if isinstance(statement, ast.AugAssign) and isinstance(statement.target, ast.Name):
+                reads.add(statement.target.id)
+            for name in sorted(reads - written):
+                if name in local_names and name not in inputs:
+                    inputs.append(name)
+            written |= _names(statement, ast.Store)
+        outputs = sorted(name for name in written if self._used_outside(function, name, block))
+
+        taken = self._all_identifiers(tree)
+        helper_name = self._fresh_name([function.name + suffix for suffix in HELPER_SUFFIXES], taken, rng)
+        if outputs:
+            value = (ast.Name(id=outputs[0], ctx=ast.Load()) if len(outputs) == 1 else
+                     ast.Tuple(elts=[ast.Name(id=o, ctx=ast.Load()) for o in outputs], ctx=ast.Load()))
+            body = block + [ast.Return(value=value)]
+        else:
+            body = block
+        helper = ast.FunctionDef(
+            name=helper_name,
+            args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=name) for name in inputs],
+                               kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=body, decorator_list=[], returns=None, type_comment=None
+        )
+
+        call = ast.Call(func=ast.Name(id=helper_name, ctx=ast.Load()),
+                        args=[ast.Name(id=name, ctx=ast.Load()) for name in inputs], keywords=[])
+        if outputs:
+            target = (ast.Name(id=outputs[0], ctx=ast.Store()) if len(outputs) == 1 else
+                      ast.Tuple(elts=[ast.Name(id=o, ctx=ast.Store()) for o in outputs], ctx=ast.Store()))
+            site: ast.stmt = ast.Assign(targets=[target], value=call)
+        else:
+            site = ast.Expr(value=call)
+
+        statements[first:last] = [site]
+        tree.body.insert(tree.body.index(function), helper)
+        return True
+
+    def _can_move_from(self, function: FunctionNode) -> bool:
+        """Las funciones con clausuras o declaraciones global/nonlocal no se dividen"""
+        for node in ast.walk(function):
+            if node is not function and isinstance(node, SCOPE_NODES):
+                return False
+            if isinstance(node, (ast.Global, ast.Nonlocal)):
+                return False
+        return True
+
+    def _is_movable(self, statement: ast.stmt) -> bool:
+        if isinstance(statement, ast.Expr):
+            if not isinstance(statement.value, ast.Call):
+                return False
+        elif not isinstance(statement, (ast.Assign, ast.AugAssign)):
+            return False
+        targets = getattr(statement, 'targets', [])
+        if not all(isinstance(t, (ast.Name, ast.Subscript, ast.Attribute, ast.Tuple, ast.List)) for t in targets):
+            return False
+        return not any(isinstance(n, UNMOVABLE_NODES) for n in ast.walk(statement))
+
+    def _inline_helper(self, tree: ast.Module, rng) -> bool:
+        """Sustituye la llamada a una función auxiliar simple por su cuerpo"""
+        helpers = {
+            node.name: node for node in tree.body
+            if isinstance(node, ast.FunctionDef) and self._is_inlinable(node)
+        }
+        if not helpers:
+            return False
+
+        candidates = []
+        top_level = {id(node) for node in tree.body}
+        for statements, function in self._statement_lists(tree):
+            if function is None or id(function) not in top_level or function.name in helpers:
+                continue
+            for i, statement in enumerate(statements):
+                call = self._helper_call(statement, helpers)
+                if call is not None and self._fits_in(helpers[call.func.id], statement, call, function):
+                    candidates.append((statements, i, call))
+        if not candidates:
+            return False
+
+        statements, i, call = rng.choice(candidates)
+        helper = helpers[call.func.id]
+        params = [a.arg for a in helper.args.args]
+        substitutions = dict(zip(params, call.args))
+
+        class _Substitute(ast.NodeTransformer):
+            def visit_Name(self, node):
+                if isinstance(node.ctx, ast.Load) and node.id in substitutions:
+                    return copy.deepcopy(substitutions[node.id])
+                return node
+
+        body = [_Substitute().visit(copy.deepcopy(s)) for s in helper.body]
+        result = body.pop().value
+        statement = statements[i]
+        if isinstance(statement, ast.Assign):
+            body.append(ast.Assign(targets=statement.targets, value=result or ast.Constant(value=None)))
+        elif result is not None and not all(isinstance(n, (ast.Name, ast.Constant, ast.Tuple, ast.expr_context))
+                                            for n in ast.walk(result)):
+            body.append(ast.Expr(value=result))
+        statements[i:i + 1] = body or [ast.Pass()]
+
+        # Eliminar la función auxiliar si ya nadie la usa
+        if not any(isinstance(n, ast.Name) and n.id == helper.name for n in ast.walk(tree)):
+            tree.body.remove(helper)
+        return True
+
+    def _is_inlinable(self, helper: ast.FunctionDef) -> bool:
+        """Cuerpo de sentencias simples terminado en un único return, sin recursión"""
+        args = helper.args
+        if (helper.decorator_list or args.posonlyargs or args.vararg or args.kwonlyargs
+                or args.kwarg or args.defaults or not helper.body):
+            return False
+        if not isinstance(helper.body[-1], ast.Return):
+            return False
+        if not all(self._is_movable(s) for s in helper.body[:-1]):
+            return False
+        if any(isinstance(n, UNMOVABLE_NODES + (ast.Return,)) for s in helper.body[:-1] for n in ast.walk(s)):
+            return False
+        if helper.body[-1].value is not None and any(
+                isinstance(n, UNMOVABLE_NODES) for n in ast.walk(helper.body[-1].value)):
+            return False
+        params = {a.arg for a in args.args}
+        if params & _stored(helper.body):
+            return False
+        return not any(isinstance(n, ast.Name) and n.id == helper.name for n in ast.walk(helper))
+
+    def _helper_call(self, statement: ast.stmt, helpers: Dict[str, ast.FunctionDef]) -> Optional[ast.Call]:
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+            call = statement.value
+        elif isinstance(statement, ast.Expr):
+            call = statement.value
+        else:
+            return None
+        if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id in helpers):
+            return None
+        if call.keywords or len(call.args) != len(helpers[call.func.id].args.args):
+            return None
+        # Solo argumentos triviales: sustituirlos no duplica efectos ni evaluaciones
+        if not all(isinstance(arg, (ast.Name, ast.Constant)) for arg in call.args):
+            return None
+        return call
+
+    def _fits_in(self, helper: ast.FunctionDef, statement: ast.stmt, call: ast.Call,
+                 function: FunctionNode) -> bool:
+        """Los nombres locales y globales del helper no deben chocar con los de la función"""
+        params = {a.arg for a in helper.args.args}
+        helper_locals = _stored(helper.body)
+        helper_globals = _names(helper, ast.Load) - params - helper_locals
+        arguments = {arg.id for arg in call.args if isinstance(arg, ast.Name)}
+        # Los destinos de la llamada se reasignan igualmente: pueden coincidir
+        targets = _stored(statement.targets) if isinstance(statement, ast.Assign) else set()
+
+        caller_names = {n.id for n in ast.walk(function) if isinstance(n, ast.Name)}
+        caller_names |= {a.arg for a in ast.walk(function.args) if isinstance(a, ast.arg)}
+        caller_locals = _stored([function]) | {a.arg for a in ast.walk(function.args) if isinstance(a, ast.arg)}
+        if (helper_locals - targets) & caller_names or helper_locals & arguments:
+            return False
+        return not helper_globals & caller_locals
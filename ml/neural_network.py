@@ -1,285 +1,77 @@
 """
 Red Neuronal para Clasificación de Complejidad de Algoritmos
+El modelo concreto lo aporta un backend de ml.backends
 """
 
 import numpy as np
-import tensorflow as tf
-import keras
-from keras import layers
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import classification_report, confusion_matrix
 import pickle
 import json
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-import re
+
+from .features import FeatureExtractor, FEATURE_NAMES, FEATURE_EXTRACTOR_VERSION
+from .feature_cache import FeatureMatrixBuilder
+from .backends import BACKENDS, DEFAULT_BACKEND, ClassifierBackend, create_backend
+from .checkpoints import CheckpointManager, restore_rng
 
 
 class AlgorithmClassifier:
-    """Clasificador de algoritmos usando red neuronal"""
-    
-    def __init__(self, model_path: Optional[str] = None):
-        self.model = None
+    """Clasificador de algoritmos con backend intercambiable (Keras por defecto)"""
+    
+    def __init__(self, model_path: Optional[str] = None, backend: str = DEFAULT_BACKEND,
+                 **backend_params):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend desconocido: {backend} (disponibles: {', '.join(BACKENDS)})")
+        self.backend_name = backend
+        self.backend_params = backend_params
+        self.backend: Optional[ClassifierBackend] = None
         self.label_encoder = LabelEncoder()
-        self.feature_names = [
-            'num_loops', 'num_nested_loops', 'max_nesting_level',
-            'num_recursive_calls', 'num_conditionals', 'num_assignments',
-            'num_function_calls', 'code_length', 'num_variables',
-            'has_sorting', 'has_search', 'has_math_operations',
-            'complexity_keywords', 'loop_patterns', 'recursion_patterns'
-        ]
+        self.feature_extractor = FeatureExtractor()
+        self.feature_names = list(FEATURE_NAMES)
         
         if model_path:
             self.load_model(model_path)
     
-    def extract_features(self, code: str, language: str = 'python') -> np.ndarray:
-        """Extrae características del código fuente"""
-        features = []
-        
-        # Características básicas
-        features.append(self._count_loops(code))
-        features.append(self._count_nested_loops(code))
-        features.append(self._get_max_nesting_level(code))
-        features.append(self._count_recursive_calls(code))
-        features.append(self._count_conditionals(code))
-        features.append(self._count_assignments(code))
-        features.append(self._count_function_calls(code))
-        features.append(len(code))
-        features.append(self._count_variables(code))
-        
-        # Características específicas
-        features.append(1 if self._has_sorting(code) else 0)
-        features.append(1 if self._has_search(code) else 0)
-        features.append(1 if self._has_math_operations(code) else 0)
-        features.append(self._count_complexity_keywords(code))
-        features.append(self._analyze_loop_patterns(code))
-        features.append(self._analyze_recursion_patterns(code))
-        
-        return np.array(features, dtype=np.float32)
-    
-    def _count_loops(self, code: str) -> int:
-        """Cuenta el número de bucles"""
-        patterns = [
-            r'\bfor\s+.*\s+in\s+',
-            r'\bwhile\s+.*:',
-            r'\bfor\s*\(.*\)',
-            r'\bwhile\s*\(.*\)'
-        ]
-        count = 0
-        for pattern in patterns:
-            count += len(re.findall(pattern, code, re.IGNORECASE))
-        return count
-    
-    def _count_nested_loops(self, code: str) -> int:
-        """Cuenta bucles anidados"""
-        lines = code.split('\n')
-        nested_count = 0
-        current_indent = 0
-        
-        for line in lines:
-            if re.search(r'\bfor\s+|while\s+', line):
-                indent = len(line) - len(line.lstrip())
-                if indent > current_indent:
-                    nested_count += 1
-                current_indent = indent
-            else:
-                indent = len(line) - len(line.lstrip())
-                current_indent = indent
-        
-        return nested_count
-    
-    def _get_max_nesting_level(self, code: str) -> int:
-        """Obtiene el nivel máximo de anidamiento"""
-        lines = code.split('\n')
-        max_level = 0
-        current_level = 0
-        
-        for line in lines:
-            if line.strip():
-                indent = len(line) - len(line.lstrip())
-                level = indent // 4  # Asumiendo 4 espacios por nivel
-                max_level = max(max_level, level)
-        
-        return max_level
-    
-    def _count_recursive_calls(self, code: str) -> int:
-        """Cuenta llamadas recursivas"""
-        # Buscar patrones de recursión
-        patterns = [
-            r'\b\w+\s*\([^)]*\)',  # Llamadas de función
-        ]
-        
-        # Extraer nombres de funciones definidas
-        func_pattern = r'def\s+(\w+)\s*\('
-        defined_functions = re.findall(func_pattern, code)
-        
-        recursive_calls = 0
-        for func_name in defined_functions:
-            call_pattern = rf'\b{func_name}\s*\('
-            recursive_calls += len(re.findall(call_pattern, code))
-        
-        return recursive_calls
-    
-    def _count_conditionals(self, code: str) -> int:
-        """Cuenta estructuras condicionales"""
-        patterns = [
-            r'\bif\s+',
-            r'\belif\s+',
-            r'\belse\s*:',
-            r'\bswitch\s*\(',
-            r'\bcase\s+'
-        ]
-        count = 0
-        for pattern in patterns:
-            count += len(re.findall(pattern, code, re.IGNORECASE))
-        return count
-    
-    def _count_assignments(self, code: str) -> int:
-        """Cuenta asignaciones"""
-        patterns = [
-            r'\w+\s*=',
-            r'\w+\s*\+=',
-            r'\w+\s*-=',
-            r'\w+\s*\*=',
-            r'\w+\s*/='
-        ]
-        count = 0
-        for pattern in patterns:
-            count += len(re.findall(pattern, code))
-        return count
-    
-    def _count_function_calls(self, code: str) -> int:
-        """Cuenta llamadas de función"""
-        pattern = r'\w+\s*\('
-        return len(re.findall(pattern, code))
-    
-    def _count_variables(self, code: str) -> int:
-        """Cuenta variables declaradas"""
-        patterns = [
-            r'\bvar\s+\w+',
-            r'\blet\s+\w+',
-            r'\bconst\s+\w+',
-            r'\bint\s+\w+',
-            r'\bfloat\s+\w+',
-            r'\bstring\s+\w+',
-            r'\bdef\s+\w+\s*\([^)]*\):'
-        ]
-        count = 0
-        for pattern in patterns:
-            count += len(re.findall(pattern, code, re.IGNORECASE))
-        return count
-    
-    def _has_sorting(self, code: str) -> bool:
-        """Verifica si el código contiene algoritmos de ordenamiento"""
-        sorting_keywords = [
-            'sort', 'sorted', 'bubble', 'quick', 'merge', 'heap',
-            'selection', 'insertion', 'radix', 'counting'
-        ]
-        code_lower = code.lower()
-        return any(keyword in code_lower for keyword in sorting_keywords)
-    
-    def _has_search(self, code: str) -> bool:
-        """Verifica si el código contiene algoritmos de búsqueda"""
-        search_keywords = [
-            'search', 'find', 'binary', 'linear', 'sequential'
-        ]
-        code_lower = code.lower()
-        return any(keyword in code_lower for keyword in search_keywords)
-    
-    def _has_math_operations(self, code: str) -> bool:
-        """Verifica si el código contiene operaciones matemáticas"""
-        math_patterns = [
-            r'\+', r'-', r'\*', r'/', r'%', r'\*\*',
-            r'math\.', r'np\.', r'sqrt', r'log', r'exp'
-        ]
-        return any(re.search(pattern, code) for pattern in math_patterns)
-    
-    def _count_complexity_keywords(self, code: str) -> int:
-        """Cuenta palabras clave relacionadas con complejidad"""
-        complexity_keywords = [
-            'o(n)', 'o(n²)', 'o(n³)', 'o(log n)', 'o(n log n)',
-            'o(2ⁿ)', 'o(n!)', 'complexity', 'time', 'space'
-        ]
-        code_lower = code.lower()
-        count = 0
-        for keyword in complexity_keywords:
-            count += code_lower.count(keyword)
-        return count
-    
-    def _analyze_loop_patterns(self, code: str) -> float:
-        """Analiza patrones de bucles"""
-        # Puntuación basada en patrones de bucles
-        score = 0.0
-        
-        # Bucles simples
-        if re.search(r'for\s+.*\s+in\s+range', code):
-            score += 1.0
-        
-        # Bucles anidados
-        nested_pattern = r'for\s+.*\s+in\s+.*:\s*\n.*for\s+.*\s+in\s+'
-        if re.search(nested_pattern, code, re.MULTILINE):
-            score += 2.0
-        
-        # Bucles con condiciones
-        if re.search(r'for\s+.*\s+in\s+.*:\s*\n.*if\s+', code, re.MULTILINE):
-            score += 0.5
-        
-        return score
-    
-    def _analyze_recursion_patterns(self, code: str) -> float:
-        """Analiza patrones de recursión"""
-        score = 0.0
-        
-        # Función recursiva
-        func_pattern = r'def\s+(\w+)\s*\([^)]*\):'
-        functions = re.findall(func_pattern, code)
-        
-        for func_name in functions:
-            # Buscar llamada recursiva
-            call_pattern = rf'\b{func_name}\s*\('
-            if len(re.findall(call_pattern, code)) > 1:  # Más de una llamada
-                score += 3.0
-        
-        # Patrones específicos de recursión
-        if 'fibonacci' in code.lower():
-            score += 1.0
-        if 'factorial' in code.lower():
-            score += 1.0
-        
-        return score
+    @property
+    def model(self):
+        """Modelo entrenado del backend activo (None si no hay)"""
+        return self.backend.model if self.backend is not None else None
     
-    def build_model(self, num_classes: int) -> keras.Model:
-        """Construye el modelo de red neuronal"""
-        model = keras.Sequential([
-            layers.Dense(128, activation='relu', input_shape=(len(self.feature_names),)),
-            layers.Dropout(0.3),
-            layers.Dense(64, activation='relu'),
-            layers.Dropout(0.2),
-            layers.Dense(32, activation='relu'),
-            layers.Dense(num_classes, activation='softmax')
-        ])
-        
-        model.compile(
-            optimizer='adam',
-            loss='sparse_categorical_crossentropy',
-            metrics=['accuracy']
-        )
+    def extract_features(self, code: str, language: str = 'python') -> np.ndarray:
+        """Extrae características del código fuente en una sola pasada"""
+        return self.feature_extractor.extract(code, language)
+    
+    def prepare_features(self, training_data: List[Tuple[str, str]],
+                         feature_builder: Optional[FeatureMatrixBuilder] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Construye la matriz de características X y el vector de etiquetas y
+        
+        Args:
+            training_data: Lista de pares (código, complejidad)
+            feature_builder: Constructor paralelo/cacheado; por defecto extrae sin caché
+        """
+        if feature_builder is None:
+            feature_builder = FeatureMatrixBuilder(cache_dir=None, workers=1)
+        return feature_builder.build(training_data)
+    
+    def train(self, training_data: List[Tuple[str, str]], epochs: int = 100, batch_size: int = 32,
+              feature_builder: Optional[FeatureMatrixBuilder] = None,
+              checkpoints: Optional[CheckpointManager] = None, resume: bool = False):
+        """
+        Entrena el modelo con datos de entrenamiento
+        
+        Args:
+            checkpoints: Gestor de checkpoints periódicos (solo backends por épocas)
+            resume: Continuar desde el último checkpoint de `checkpoints`
+        """
+        if feature_builder is None:
+            feature_builder = FeatureMatrixBuilder(cache_dir=None, workers=1)
         
-        return model
-    
-    def train(self, training_data: List[Tuple[str, str]], epochs: int = 100, batch_size: int = 32):
-        """Entrena el modelo con datos de entrenamiento"""
         # Preparar datos
-        X = []
-        y = []
-        
-        for code, complexity in training_data:
-            features = self.extract_features(code)
-            X.append(features)
-            y.append(complexity)
-        
-        X = np.array(X)
-        y = np.array(y)
+        X, y = self.prepare_features(training_data, feature_builder)
         
         # Codificar etiquetas
         y_encoded = self.label_encoder.fit_transform(y)
@@ -292,29 +84,53 @@ class AlgorithmClassifier:
         # Construir y entrenar modelo
         classes = self.label_encoder.classes_
         num_classes = len(classes) if classes is not None else 0
-        self.model = self.build_model(num_classes)
-        
-        # Callbacks
-        early_stopping = keras.callbacks.EarlyStopping(
-            monitor='val_loss', patience=10, restore_best_weights=True
-        )
-        
-        # Entrenar
-        history = self.model.fit(
-            X_train, y_train,
-            epochs=epochs,
-            batch_size=batch_size,
-            validation_data=(X_test, y_test),
-            callbacks=[early_stopping],
-            verbose="1"
-        )
+        self.backend = create_backend(self.backend_name, len(self.feature_names), num_classes,
+                                      **self.backend_params)
+        
+        on_epoch_end = None
+        resume_state = None
+        if checkpoints is not None and self.backend.supports_checkpoints:
+            checkpoints.metadata.update({
+                'backend': self.backend_name,
+                'backend_params': self.backend_params,
+                'dataset_key': feature_builder.dataset_key(training_data),
+                'classes': [str(c) for c in classes],
+                'feature_extractor_version': FEATURE_EXTRACTOR_VERSION,
+                'epochs': epochs,
+                'batch_size': batch_size
+            })
+            on_epoch_end = checkpoints.on_epoch_end
+            if resume:
+                resume_state = self._resume_state(checkpoints)
+        elif checkpoints is not None:
+            print(f"ℹ️  El backend {self.backend_name} se entrena de una vez: sin checkpoints por época")
+        
+        history = self.backend.fit(X_train, y_train, X_test, y_test,
+                                   epochs=epochs, batch_size=batch_size,
+                                   checkpoint=on_epoch_end, resume_state=resume_state)
         
         # Evaluar
-        test_loss, test_accuracy = self.model.evaluate(X_test, y_test, verbose="0")
+        test_accuracy = float(np.mean(np.argmax(self.backend.predict_proba(X_test), axis=1) == y_test))
         print(f"Precisión en test: {test_accuracy:.4f}")
         
         return history
     
+    def _resume_state(self, checkpoints: CheckpointManager) -> Optional[Dict]:
+        """Carga el último checkpoint si corresponde al mismo entrenamiento"""
+        checkpoint = checkpoints.latest()
+        if checkpoint is None:
+            print("ℹ️  No hay checkpoints: el entrenamiento empieza desde cero")
+            return None
+        
+        saved = checkpoint['metadata']
+        for key in ('backend', 'backend_params', 'dataset_key', 'classes', 'feature_extractor_version'):
+            if saved.get(key) != checkpoints.metadata.get(key):
+                raise ValueError(f"El checkpoint no corresponde a este entrenamiento ({key} distinto)")
+        
+        restore_rng(checkpoint)
+        print(f"♻️  Reanudando tras la época {checkpoint['epoch'] + 1}")
+        return checkpoint['state']
+    
     def predict(self, code: str) -> Tuple[str, float]:
         """Predice la complejidad de un algoritmo"""
         if self.model is None:
@@ -323,7 +139,7 @@ class AlgorithmClassifier:
         features = self.extract_features(code)
         features = features.reshape(1, -1)
         
-        prediction = self.model.predict(features, verbose="0")
+        prediction = self.backend.predict_proba(features)
         predicted_class = np.argmax(prediction[0])
         confidence = np.max(prediction[0])
         
@@ -337,13 +153,16 @@ class AlgorithmClassifier:
             raise ValueError("No hay modelo para guardar")
         
         # Guardar modelo
-        self.model.save(f"{model_path}_model.h5")
+        Path(model_path).parent.mkdir(parents=True, exist_ok=True)
+        self.backend.save(model_path)
         
         # Guardar encoder y metadatos
         classes = self.label_encoder.classes_
         metadata = {
             'label_encoder': list(classes) if classes is not None else [],
-            'feature_names': self.feature_names
+            'feature_names': self.feature_names,
+            'feature_extractor_version': FEATURE_EXTRACTOR_VERSION,
+            'backend': self.backend_name
         }
         
         with open(f"{model_path}_metadata.json", 'w') as f:
@@ -351,23 +170,28 @@ class AlgorithmClassifier:
     
     def load_model(self, model_path: str):
         """Carga un modelo entrenado"""
-        # Cargar modelo
-        self.model = keras.models.load_model(f"{model_path}_model.h5")
-        
-        # Cargar metadatos
+        # Cargar metadatos (los modelos anteriores a los backends son de Keras)
         with open(f"{model_path}_metadata.json", 'r') as f:
             metadata = json.load(f)
         
         self.label_encoder.classes_ = np.array(metadata['label_encoder'])
         self.feature_names = metadata['feature_names']
+        
+        # Cargar modelo
+        self.backend_name = metadata.get('backend', 'keras')
+        self.backend = create_backend(self.backend_name, len(self.feature_names),
+                                      len(self.label_encoder.classes_), **self.backend_params)
+        self.backend.load(model_path)
+        
+        version = metadata.get('feature_extractor_version', 1)
+        if version != FEATURE_EXTRACTOR_VERSION:
+            print(f"⚠️ El modelo se entrenó con el extractor de características v{version} "
+                  f"(actual: v{FEATURE_EXTRACTOR_VERSION}); conviene reentrenarlo")
     
     def get_feature_importance(self) -> Dict[str, float]:
         """Obtiene la importancia de las características"""
         if self.model is None:
             raise ValueError("Modelo no entrenado")
         
-        # Usar los pesos de la primera capa como medida de importancia
-        weights = self.model.layers[0].get_weights()[0]
-        importance = np.mean(np.abs(weights), axis=1)
-        
-        return dict(zip(self.feature_names, importance)) 
\ No newline at end of file
+        importance = self.backend.feature_importance()
+        return dict(zip(self.feature_names, importance))
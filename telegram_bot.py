@@ -5,9 +5,13 @@ Chatbot de Telegram para el Analizador de Algoritmos
 
 import logging
 import os
+import secrets
+from collections import OrderedDict
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
 from core.analyzer import AlgorithmAnalyzer
+from ml.feedback import FEEDBACK_NOTATIONS, FeedbackStore
+from config import FEEDBACK_PATH, IO_CATALOG_PATH, MODEL_PATH, MODEL_RELOAD_INTERVAL
 import json
 
 # Configurar logging
@@ -22,8 +26,17 @@ class AlgorithmAnalyzerBot:
     
     def __init__(self, token: str):
         self.token = token
-        self.analyzer = AlgorithmAnalyzer()
+        # El modelo se comparte mediante el registro del proceso y se recarga al reentrenarlo
+        model_path = MODEL_PATH if os.path.exists(f"{MODEL_PATH}_metadata.json") else None
+        self.analyzer = AlgorithmAnalyzer(model_path=model_path, io_catalog=IO_CATALOG_PATH)
+        if self.analyzer.model_handle is not None:
+            from ml.model_registry import get_registry
+            get_registry().watch(MODEL_RELOAD_INTERVAL)
         self.user_sessions = {}  # Para almacenar estado de usuarios
+        self.feedback_store = FeedbackStore(FEEDBACK_PATH)
+        # Análisis recientes pendientes de valoración: id -> (código, lenguaje, notación)
+        self.pending_feedback: OrderedDict = OrderedDict()
+        self.max_pending_feedback = 500
         
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando /start"""
@@ -258,8 +271,12 @@ def merge_sort(arr):
             # Formatear resultado
             response = self._format_analysis_result(result, code)
             
-            # Enviar resultado
-            await processing_msg.edit_text(response, parse_mode='Markdown')
+            # Enviar resultado con los botones de valoración
+            reply_markup = None
+            if result.get('success'):
+                feedback_id = self._remember_analysis(code, language, result.get('notation', ''))
+                reply_markup = self._feedback_keyboard(feedback_id)
+            await processing_msg.edit_text(response, parse_mode='Markdown', reply_markup=reply_markup)
             
         except Exception as e:
             error_msg = f"❌ Error al analizar el código:\n{str(e)}"
@@ -280,6 +297,67 @@ def merge_sort(arr):
         else:
             return 'python'  # Por defecto
     
+    def _remember_analysis(self, code: str, language: str, notation: str) -> str:
+        """Guarda el análisis para asociarlo a la valoración que llegue después"""
+        feedback_id = secrets.token_hex(4)
+        self.pending_feedback[feedback_id] = (code, language, notation)
+        while len(self.pending_feedback) > self.max_pending_feedback:
+            self.pending_feedback.popitem(last=False)
+        return feedback_id
+    
+    def _feedback_keyboard(self, feedback_id: str) -> InlineKeyboardMarkup:
+        """Botones ✅ / ❌ bajo el resultado"""
+        return InlineKeyboardMarkup([[
+            InlineKeyboardButton("✅ Correcto", callback_data=f"fb:{feedback_id}:ok"),
+            InlineKeyboardButton("❌ Incorrecto", callback_data=f"fb:{feedback_id}:bad")
+        ]])
+    
+    def _notation_keyboard(self, feedback_id: str) -> InlineKeyboardMarkup:
+        """Botones para indicar la notación correcta"""
+        buttons = [
+            InlineKeyboardButton(notation, callback_data=f"fb:{feedback_id}:set:{i}")
+            for i, notation in enumerate(FEEDBACK_NOTATIONS)
+        ]
+        keyboard = [buttons[i:i + 4] for i in range(0, len(buttons), 4)]
+        keyboard.append([InlineKeyboardButton("🤷 No lo sé", callback_data=f"fb:{feedback_id}:skip")])
+        return InlineKeyboardMarkup(keyboard)
+    
+    async def feedback_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Registra la valoración del usuario sobre un análisis"""
+        query = update.callback_query
+        if not query or not query.data:
+            return
+        
+        parts = query.data.split(':')
+        feedback_id, action = parts[1], parts[2]
+        analysis = self.pending_feedback.get(feedback_id)
+        if analysis is None:
+            await query.answer("⌛ Este análisis ya no admite valoraciones")
+            await query.edit_message_reply_markup(reply_markup=None)
+            return
+        
+        code, language, notation = analysis
+        user_id = query.from_user.id if query.from_user else None
+        
+        if action == 'bad':
+            await query.answer()
+            await query.edit_message_reply_markup(reply_markup=self._notation_keyboard(feedback_id))
+            return
+        
+        if action == 'ok':
+            self.feedback_store.record(code, language, notation, correct=True, user_id=user_id)
+        elif action == 'set':
+            label = FEEDBACK_NOTATIONS[int(parts[3])]
+            self.feedback_store.record(code, language, notation, correct=label == notation,
+                                       label=label, user_id=user_id)
+        else:
+            # Incorrecto sin notación: se guarda, pero no sirve para entrenar
+            self.feedback_store.record(code, language, notation, correct=False, user_id=user_id)
+        
+        del self.pending_feedback[feedback_id]
+        await query.answer("🙏 ¡Gracias por tu valoración!")
+        await query.edit_message_reply_markup(reply_markup=None)
+    
     def _format_analysis_result(self, result: dict, code: str) -> str:
         """Formatea el resultado del análisis para Telegram"""
         if not result.get('success'):
@@ -310,6 +388,20 @@ def merge_sort(arr):
             response += "\n🔍 **PATRONES DETECTADOS:**\n"
             for pattern in result['patterns'][:5]:  # Limitar a 5 patrones
                 response += f"• {pattern['type']}: {pattern['description']}\n"
+            hidden = result.get('pattern_total', 0) - min(5, len(result['patterns']))
+            if hidden > 0:
+                counts = ', '.join(f"{kind}: {count}" for kind, count in result['pattern_counts'].items())
+                response += f"… y {hidden} más ({counts})\n"
+        
+        # Agregar antipatrones de rendimiento si existen
+        if result.get('performance_issues'):
+            response += "\n⚠️ **PROBLEMAS DE RENDIMIENTO:**\n"
+            for issue in result['performance_issues'][:5]:
+                response += f"• Línea {issue['line']}: {issue['message']} ({issue['total_cost']})\n"
+                response += f"  💡 {issue['suggestion']}\n"
+            hidden = len(result['performance_issues']) - 5
+            if hidden > 0:
+                response += f"… y {hidden} más\n"
         
         # Agregar detalles técnicos si existen
         if result.get('complexity'):
@@ -387,7 +479,8 @@ def merge_sort(arr):
         application.add_handler(CommandHandler("complexity", self.complexity_guide))
         application.add_handler(CommandHandler("about", self.about_command))
         
-        # Handler para botones inline
+        # Handlers para botones inline (las valoraciones van antes que el genérico)
+        application.add_handler(CallbackQueryHandler(self.feedback_callback, pattern=r'^fb:'))
         application.add_handler(CallbackQueryHandler(self.button_callback))
         
         # Handler para mensajes de texto
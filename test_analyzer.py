@@ -3,13 +3,20 @@
 Script de prueba para el analizador de algoritmos
 """
 
+import json
 import sys
+import tempfile
 from pathlib import Path
 
 # Agregar el directorio actual al path
 sys.path.append(str(Path(__file__).parent))
 
 from core.analyzer import AlgorithmAnalyzer
+from core.complexity import ComplexityCalculator
+from core.io_calls import IOCatalog
+from core.patterns import PatternDetector, PatternKind, PatternTable
+from core.recurrence import solve_recurrence
+from core.symbolic import Complexity, parse_notation
 
 
 def test_analyzer():
@@ -81,5 +88,386 @@ def get_first_element(arr):
     print("\n✅ Pruebas completadas")
 
 
+def test_pattern_records_are_structured():
+    """El detector produce registros con profundidad y límite; el calculador no lee texto"""
+    code = """
+def matmul(a, b, n):
+    for i in range(n):
+        for j in range(n):
+            for k in range(n):
+                a[i][j] += b[i][k]
+"""
+    patterns = PatternDetector().detect_patterns(code)
+    # Los bucles interiores quedan representados por el bucle anidado exterior
+    assert [(p.kind, p.depth, p.bound) for p in patterns] == [(PatternKind.NESTED_LOOP, 3, 'n')]
+    assert AlgorithmAnalyzer(use_neural_network=False).analyze_code(code)['notation'] == 'O(n³)'
+    
+    # La tabla por columnas se serializa y reconstruye sin perder filas
+    restored = PatternTable.from_dict(patterns.to_dict())
+    assert [r.to_dict() for r in restored] == list(patterns.as_dicts())
+    assert restored[-1].depth == patterns[-1].depth
+    
+    # Las tablas derivadas no comparten estado con la original
+    derived = patterns.top(5)
+    derived.add(PatternKind.SORTING, 9, callee='sorted')
+    assert len(patterns) == 1 and not patterns.contains('callee', 'sorted')
+
+
+def test_patterns_are_deduplicated_and_bounded():
+    """Los bucles repetidos se funden y el resultado conserva solo los K más significativos"""
+    code = "def f(a, n):\n" + "".join(
+        f"    for i{k} in range(n):\n        for j{k} in range(n):\n            a += 1\n" for k in range(30)
+    ) + "    for x in a:\n        pass\n"
+    result = AlgorithmAnalyzer(use_neural_network=False, max_patterns=5).analyze_code(code)
+    assert result['pattern_counts'] == {'nested_loop': 30, 'simple_loop': 1}
+    assert result['pattern_total'] == 31
+    assert [p['kind'] for p in result['patterns']] == ['nested_loop'] * 5
+    assert result['notation'] == 'O(n²)'
+    
+    # El recorte no afecta a la complejidad y conserva los patrones más costosos
+    pairs = "def g(a, n):\n" + "".join(
+        f"    for i{k} in range(3):\n        for j{k} in range(3):\n            pass\n" for k in range(25)
+    ) + "    for x in a:\n        sorted(a)\n"
+    fib = "def fib(n):\n    if n < 2:\n        return n\n    return fib(n - 1) + fib(n - 2)\n"
+    analyzer = AlgorithmAnalyzer(use_neural_network=False)
+    result = analyzer.analyze_code(pairs)
+    assert result['notation'] == 'O(n² log n)'
+    assert len(result['patterns']) == 20 and result['patterns'][-1]['cost'] == 'O(n² log n)'
+    result = analyzer.analyze_code(code + fib)
+    assert result['notation'] == 'O(2ⁿ)' and result['patterns'][-1]['kind'] == 'recursion'
+
+
+def test_cached_results_are_isolated():
+    """Modificar un resultado devuelto no altera los siguientes aciertos de caché"""
+    analyzer = AlgorithmAnalyzer(use_neural_network=False, cache_size=4)
+    code = "def f(arr):\n    seen = []\n    for x in arr:\n        if x in seen:\n            seen.append(x)\n"
+    first = analyzer.analyze_code(code)
+    first['complexity']['dominant_term'] = 'O(1)'
+    first['patterns'].clear()
+    first['performance_issues'][0]['rule'] = 'changed'
+    
+    second = analyzer.analyze_code(code)
+    assert second['complexity']['dominant_term'] == 'O(n²)'
+    assert second['patterns'] and second['performance_issues'][0]['rule'] == 'list_membership'
+
+
+def test_profiling_bypasses_cache():
+    """Con el perfilado activo cada análisis se ejecuta y trae sus propios perfiles"""
+    analyzer = AlgorithmAnalyzer(use_neural_network=False, cache_size=4)
+    code = "def f(arr):\n    for x in arr:\n        print(x)\n"
+    with tempfile.TemporaryDirectory() as output_dir:
+        analyzer.enable_profiling(output_dir)
+        first = analyzer.analyze_code(code)
+        second = analyzer.analyze_code(code)
+        assert first['profile']['pstats'] != second['profile']['pstats']
+        assert Path(second['profile']['pstats']).exists()
+    analyzer.disable_profiling()
+    assert 'profile' not in analyzer.analyze_code(code)
+
+
+class _RecordingClassifier:
+    """Clasificador que solo registra las llamadas a predict"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def predict(self, code):
+        self.calls += 1
+        return 'O(n)', 0.95
+
+
+def test_cascade_skips_neural_when_traditional_is_decisive():
+    """La cascada solo consulta la red para resultados tradicionales dudosos"""
+    analyzer = AlgorithmAnalyzer(neural_policy='cascade')
+    analyzer.neural_classifier = _RecordingClassifier()
+    
+    simple_loop = "def total(arr):\n    s = 0\n    for x in arr:\n        s += x\n    return s\n"
+    recursive = "def fib(n):\n    if n < 2:\n        return n\n    return fib(n - 1) + fib(n - 2)\n"
+    constant = "def first(arr):\n    return arr[0]\n"
+    
+    assert analyzer.analyze_code(simple_loop)['neural_reason'] is None
+    assert analyzer.analyze_code(recursive)['neural_reason'] == 'recursion'
+    assert analyzer.analyze_code(constant)['neural_reason'] == 'no_patterns'
+    
+    stats = analyzer.get_neural_stats()
+    assert analyzer.neural_classifier.calls == 2
+    assert (stats['invoked'], stats['skipped']) == (2, 1)
+    assert stats['reasons'] == {'recursion': 1, 'no_patterns': 1}
+
+
+def test_symbolic_complexity_algebra():
+    """Formas canónicas internadas, composición secuencial/anidada y orden total"""
+    n, m, log_n = Complexity.poly('n'), Complexity.poly('m'), Complexity.log('n')
+    
+    assert n * m is m * n
+    assert n + n ** 2 is n ** 2
+    assert (n + m).notation == 'O(n + m)'
+    assert (n * log_n).notation == 'O(n log n)'
+    assert Complexity.constant() < log_n < n < n * log_n < n ** 2 < Complexity.exp('n') < Complexity.factorial('n')
+    assert parse_notation('O(n²)') is n ** 2
+    
+    # Un bucle seguido de otro anidado: domina el anidado
+    calc = ComplexityCalculator()
+    code = "def f(arr):\n    for x in arr:\n        pass\n    for i in arr:\n        for j in arr:\n            pass\n"
+    result = calc.calculate_complexity(PatternDetector().detect_patterns(code))
+    assert parse_notation(result['total_complexity']) is n ** 2
+    assert result['total_complexity'] == 'O(n²)'
+
+
+def test_recurrences_are_solved():
+    """Las funciones recursivas se resuelven por su recurrencia, no por su nombre"""
+    merge_sort = (
+        "def merge_sort(arr):\n    if len(arr) <= 1:\n        return arr\n    mid = len(arr) // 2\n"
+        "    return merge(merge_sort(arr[:mid]), merge_sort(arr[mid:]))\n\n"
+        "def merge(a, b):\n    out = []\n    i = j = 0\n    while i < len(a) and j < len(b):\n"
+        "        if a[i] < b[j]:\n            out.append(a[i])\n            i += 1\n"
+        "        else:\n            out.append(b[j])\n            j += 1\n"
+        "    return out + a[i:] + b[j:]\n"
+    )
+    search = (
+        "def search(arr, t, lo, hi):\n    if lo > hi:\n        return -1\n    mid = (lo + hi) // 2\n"
+        "    if arr[mid] < t:\n        return search(arr, t, mid + 1, hi)\n    return search(arr, t, lo, mid - 1)\n"
+    )
+    # Las particiones (comprensiones filtradas, índices junto al pivote) cuentan en el peor caso
+    quicksort = (
+        "def quicksort(arr):\n    if len(arr) <= 1:\n        return arr\n    p = arr[0]\n"
+        "    return quicksort([x for x in arr[1:] if x < p]) + [p] + quicksort([x for x in arr[1:] if x >= p])\n"
+    )
+    in_place = (
+        "def qs(arr, lo, hi):\n    if lo < hi:\n        p = partition(arr, lo, hi)\n"
+        "        qs(arr, lo, p - 1)\n        qs(arr, p + 1, hi)\n\n"
+        "def partition(arr, lo, hi):\n    i = lo\n    for j in range(lo, hi):\n        if arr[j] < arr[hi]:\n"
+        "            arr[i], arr[j] = arr[j], arr[i]\n            i += 1\n    return i\n"
+    )
+    # Un bucle alrededor de la llamada multiplica las ramas por sus vueltas
+    in_loop = "def f(n):\n    if n < 1:\n        return 0\n    for i in range(n):\n        f(n // 2)\n"
+    fixed_loop = "def t(n):\n    if n < 1:\n        return 1\n    for k in range(4):\n        t(n // 2)\n"
+    calc = ComplexityCalculator()
+    detector = PatternDetector()
+    
+    for code, recurrence, expected in [
+        (merge_sort, 'T(n) = 2T(n/2) + O(n)', 'O(n log n)'),
+        (search, 'T(n) = T(n/2) + O(1)', 'O(log n)'),
+        (quicksort, 'T(n) = T(n-1) + O(n)', 'O(n²)'),
+        (in_place, 'T(n) = T(n-1) + O(n)', 'O(n²)'),
+        (in_loop, 'T(n) = n·T(n/2) + O(n)', 'O(2ⁿ)'),
+        (fixed_loop, 'T(n) = 4T(n/2) + O(n)', 'O(n²)'),
+    ]:
+        patterns = detector.detect_patterns(code)
+        assert [p.recurrence for p in patterns if p.kind is PatternKind.RECURSION] == [recurrence]
+        assert calc.calculate_complexity(patterns)['total_complexity'] == expected
+    
+    # Una recurrencia sin resolver no la rebaja un bucle
+    walk = "def visit(node, seen):\n    for child in node.children:\n        visit(child, seen)\n    for x in seen:\n        print(x)\n"
+    assert calc.calculate_complexity(detector.detect_patterns(walk))['total_complexity'] == 'O(2ⁿ)'
+    
+    assert solve_recurrence('T(n) = T(n-1) + T(n-2) + O(1)') is Complexity.exp('n')
+    assert solve_recurrence('T(n) = T(n/3) + T(2n/3) + O(n)').notation == 'O(n log n)'
+    assert solve_recurrence('T(n) = 7T(n/2) + O(n²)').notation == 'O(n^2.81)'
+
+
+def test_loop_bounds():
+    """Cada bucle aporta sus iteraciones reales: constantes, logarítmicas o lineales"""
+    calc = ComplexityCalculator()
+    detector = PatternDetector()
+    cases = [
+        ("def f(n):\n    i = 1\n    while i < n:\n        i *= 2\n", 'O(log n)'),
+        ("def f(n):\n    while n > 0:\n        n -= 1\n", 'O(n)'),
+        # Cualquier factor mayor que 1 es geométrico
+        ("def f(n):\n    while n > 1:\n        n /= 1.5\n", 'O(log n)'),
+        ("def f(n):\n    i = 1\n    while i < n:\n        i = i * 1.5\n", 'O(log n)'),
+        ("def f(arr):\n    for i in range(10):\n        print(arr[i])\n", 'O(1)'),
+        ("def f(arr):\n    for k in range(3):\n        for x in arr:\n            print(x)\n", 'O(n)'),
+        ("def f(n):\n    for i in range(n):\n        for j in range(i, n):\n            print(j)\n", 'O(n²)'),
+        ("def f(n):\n    for i in range(n):\n        j = 1\n        while j < n:\n            j *= 2\n", 'O(n log n)'),
+    ]
+    for code, expected in cases:
+        assert calc.calculate_complexity(detector.detect_patterns(code))['total_complexity'] == expected, code
+
+
+def test_library_call_costs():
+    """Las llamadas de biblioteca cuestan según el tipo del receptor y se multiplican por sus bucles"""
+    calc = ComplexityCalculator()
+    detector = PatternDetector()
+    cases = [
+        ("def f(a):\n    out = []\n    for x in a:\n        if x not in out:\n            out.append(x)\n", 'python', 'O(n²)'),
+        ("def f(a):\n    seen = set()\n    for x in a:\n        if x in seen:\n            return x\n        seen.add(x)\n", 'python', 'O(n)'),
+        ("def f(a):\n    return sorted(a)[0]\n", 'python', 'O(n log n)'),
+        # Pertenencia a una cadena literal: tamaño fijo
+        ("def f(text):\n    n = 0\n    for c in text:\n        if c in 'aeiou':\n            n += 1\n    return n\n",
+         'python', 'O(n)'),
+        ("def f(parts):\n    return ', '.join(parts)\n", 'python', 'O(n)'),
+        # Las porciones copian la secuencia salvo las ventanas de ancho fijo
+        ("def f(a):\n    for x in a:\n        rest = a[x:]\n", 'python', 'O(n²)'),
+        ("def f(s):\n    for i in range(len(s)):\n        w = s[i:i + 3]\n", 'python', 'O(n)'),
+        ("def f(a):\n    return a[::-1]\n", 'python', 'O(n)'),
+        # Un return sale del bucle: su porción se copia una vez
+        ("def f(a, t):\n    for i in range(len(a)):\n        if a[i] == t:\n            return a[i:]\n", 'python', 'O(n)'),
+        # Receptor de tipo no inferido: se supone una lista; el valor por defecto fija el tipo
+        ("def f(a, b):\n    for x in a:\n        if x in b:\n            print(x)\n", 'python', 'O(n²)'),
+        ("def f(a, memo={}):\n    for x in a:\n        if x in memo:\n            print(x)\n", 'python', 'O(n)'),
+        ("def f(q):\n    while q:\n        q.pop(0)\n", 'python', 'O(n²)'),
+        ("void f(int[] a) {\n  for (int i = 0; i < a.length; i++) {\n    Arrays.sort(a);\n  }\n}\n", 'java', 'O(n² log n)'),
+    ]
+    for code, language, expected in cases:
+        patterns = detector.detect_patterns(code, language)
+        assert calc.calculate_complexity(patterns)['total_complexity'] == expected, code
+
+
+def test_performance_issues():
+    """Los antipatrones de los bucles se informan con línea, coste y sugerencia"""
+    code = (
+        "import re\n"
+        "def process(items):\n"
+        "    out = []\n"
+        "    text = ''\n"
+        "    for i in range(len(items)):\n"
+        "        if items[i] in out:\n"
+        "            continue\n"
+        "        out.append(items[i])\n"
+        "        ordered = sorted(items)\n"
+        "        text += str(i)\n"
+        "        pattern = re.compile('a+b')\n"
+        "        rest = items[i:]\n"
+        "        first = out.pop(0)\n"
+        "    return out\n"
+    )
+    result = AlgorithmAnalyzer(use_neural_network=False).analyze_code(code)
+    issues = {issue['rule']: issue for issue in result['performance_issues']}
+    
+    assert set(issues) == {'list_membership', 'repeated_sort', 'string_concat',
+                           'regex_compile', 'quadratic_slicing', 'pop_front'}
+    assert issues['list_membership']['line'] == 6
+    assert issues['list_membership']['total_cost'] == 'O(n²)'
+    assert issues['repeated_sort']['total_cost'] == 'O(n² log n)'
+    # El coste total del análisis incluye los de sus antipatrones
+    assert result['complexity']['total_complexity'] == 'O(n² log n)'
+    assert all(issue['loop_line'] == 5 and issue['suggestion'] for issue in issues.values())
+    
+    # Falsos positivos: ventanas de ancho fijo, pop de un dict, len() en el bucle
+    code = (
+        "def pairs(s, left, right):\n"
+        "    out = []\n"
+        "    counts = {}\n"
+        "    i = j = 0\n"
+        "    while i < len(left) and j < len(right):\n"
+        "        out.append(s[i:i + 2] + s[j - 2:j])\n"
+        "        counts.pop(0, None)\n"
+        "        i += 1\n"
+        "    return out\n"
+    )
+    rules = [issue['rule'] for issue in AlgorithmAnalyzer(use_neural_network=False).analyze_code(code)['performance_issues']]
+    assert 'quadratic_slicing' not in rules
+    assert 'pop_front' not in rules
+    assert 'invariant_call' not in rules
+    
+    # Pertenencia a un parámetro sin tipo: se informa como lista, con la suposición explícita
+    code = "def scan(a, b):\n    for x in a:\n        if x in b:\n            print(x)\n"
+    issues = AlgorithmAnalyzer(use_neural_network=False).analyze_code(code)['performance_issues']
+    assert [issue['rule'] for issue in issues] == ['list_membership']
+    assert 'se supone una lista' in issues[0]['message']
+    
+    # El resultado es JSON plano
+    assert json.loads(json.dumps(result)) == result
+
+
+def test_io_calls_in_loops():
+    """Las llamadas de E/S en bucles o recursiones se informan con su multiplicador"""
+    code = (
+        "def load(ids, cursor):\n"
+        "    rows = []\n"
+        "    for i in ids:\n"
+        "        for j in ids:\n"
+        "            cursor.execute('select 1', (i, j))\n"
+        "        rows.append(requests.get(i).json())\n"
+        "    for k in range(3):\n"
+        "        time.sleep(1)\n"
+        "    return rows\n"
+        "def crawl(n):\n"
+        "    if n <= 1:\n"
+        "        return 1\n"
+        "    urlopen('http://host')\n"
+        "    return crawl(n - 1) + crawl(n - 1)\n"
+    )
+    detector = PatternDetector()
+    issues = {issue.line: issue for issue in detector.detect_patterns(code).issues}
+    
+    # El bucle de tres vueltas no crece con la entrada
+    assert set(issues) == {5, 6, 13}
+    assert issues[5].rule == 'io_in_loop' and issues[5].total_cost == 'O(n²)' and issues[5].loop_line == 4
+    assert issues[6].total_cost == 'O(n)' and issues[6].loop_line == 3
+    assert issues[13].rule == 'io_in_recursion' and issues[13].total_cost == 'O(2ⁿ)'
+    
+    # Catálogo configurable y lenguajes sin AST
+    catalog = IOCatalog({'javascript': {'cache': ['redis.*']}})
+    js = "for (let i = 0; i < n; i++) {\n  redis.get(keys[i]);\n}\nfetch(url);\n"
+    issues = PatternDetector(catalog).detect_patterns(js, 'javascript').issues
+    assert [(issue.line, issue.loop_line, issue.total_cost) for issue in issues] == [(2, 1, 'O(n)')]
+
+
+def test_memoization_opportunities():
+    """Las recursiones puras con subproblemas solapados sugieren memoización con su coste estimado"""
+    code = (
+        "def fibonacci_recursive(n):\n"
+        "    if n <= 1:\n"
+        "        return n\n"
+        "    return fibonacci_recursive(n - 1) + fibonacci_recursive(n - 2)\n"
+        "def lcs(a, b, i, j):\n"
+        "    if i == 0 or j == 0:\n"
+        "        return 0\n"
+        "    if a[i - 1] == b[j - 1]:\n"
+        "        return 1 + lcs(a, b, i - 1, j - 1)\n"
+        "    return max(lcs(a, b, i - 1, j), lcs(a, b, i, j - 1))\n"
+        "@lru_cache(maxsize=None)\n"
+        "def memo_fib(n):\n"
+        "    return n if n < 2 else memo_fib(n - 1) + memo_fib(n - 2)\n"
+        "def hanoi(n, a, b, c):\n"
+        "    if n:\n"
+        "        hanoi(n - 1, a, c, b)\n"
+        "        print(a, c)\n"
+        "        hanoi(n - 1, c, b, a)\n"
+        "def merge_sort(arr):\n"
+        "    if len(arr) <= 1:\n"
+        "        return arr\n"
+        "    mid = len(arr) // 2\n"
+        "    return merge(merge_sort(arr[:mid]), merge_sort(arr[mid:]))\n"
+        "def permute(arr, l, r):\n"
+        "    if l == r:\n"
+        "        return 1\n"
+        "    total = 0\n"
+        "    for i in range(l, r + 1):\n"
+        "        arr[l], arr[i] = arr[i], arr[l]\n"
+        "        total += permute(arr, l + 1, r)\n"
+        "        arr[l], arr[i] = arr[i], arr[l]\n"
+        "    return total\n"
+    )
+    result = AlgorithmAnalyzer(use_neural_network=False).analyze_code(code)
+    issues = {issue['line']: issue for issue in result['performance_issues'] if issue['rule'] == 'memoization'}
+    
+    # Ya memoizada, con efectos laterales (print, intercambios en el argumento) o sin solapamiento: no se sugiere
+    assert set(issues) == {1, 5}
+    assert issues[1]['total_cost'] == 'O(2ⁿ)' and issues[1]['improved_cost'] == 'O(n)'
+    assert issues[5]['improved_cost'] == 'O(n²)'
+    assert 'lru_cache' in issues[5]['suggestion']
+    
+    # Una recursión ya memoizada cuesta lo que sus estados distintos
+    memo_fib = next(p for p in result['patterns'] if p['callee'] == 'memo_fib')
+    assert memo_fib['cost'] == 'O(n)'
+    memoized = "@lru_cache(maxsize=None)\ndef fib(n):\n    return n if n < 2 else fib(n - 1) + fib(n - 2)\n"
+    assert AlgorithmAnalyzer(use_neural_network=False).analyze_code(memoized)['notation'] == 'O(n)'
+
+
 if __name__ == "__main__":
-    test_analyzer() 
\ No newline at end of file
+    test_analyzer()
+    test_pattern_records_are_structured()
+    test_patterns_are_deduplicated_and_bounded()
+    test_cached_results_are_isolated()
+    test_profiling_bypasses_cache()
+    test_cascade_skips_neural_when_traditional_is_decisive()
+    test_symbolic_complexity_algebra()
+    test_recurrences_are_solved()
+    test_loop_bounds()
+    test_library_call_costs()
+    test_performance_issues()
+    test_io_calls_in_loops()
+    test_memoization_opportunities() 
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los backends intercambiables del clasificador
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from ml.backends import BACKENDS, create_backend
+
+
+def _separable_data(seed: int = 0):
+    """Tres clases separadas por la primera característica"""
+    rng = np.random.RandomState(seed)
+    y = np.repeat(np.arange(3), 20)
+    X = rng.normal(0.0, 0.1, size=(len(y), 4)).astype(np.float32)
+    X[:, 0] += y * 2.0
+    return X, y
+
+
+def test_backends_round_trip():
+    """Cada backend disponible entrena, se guarda y predice lo mismo tras cargarse"""
+    X, y = _separable_data()
+    trained = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in BACKENDS:
+            backend = create_backend(name, X.shape[1], 3, verbose=False)
+            try:
+                backend.fit(X, y, X, y, epochs=40, batch_size=8)
+            except ImportError as e:
+                # Dependencia opcional ausente (TensorFlow, scikit-learn)
+                print(f"⏭️  {name} omitido: {e}")
+                continue
+            model_path = str(Path(tmp) / name)
+            backend.save(model_path)
+            assert backend.model_file(model_path).exists(), name
+
+            loaded = create_backend(name, X.shape[1], 3, verbose=False)
+            loaded.load(model_path)
+            proba = loaded.predict_proba(X)
+            assert proba.shape == (len(y), 3), name
+            assert np.allclose(proba, backend.predict_proba(X), atol=1e-5), name
+            assert np.mean(np.argmax(proba, axis=1) == y) >= 0.9, name
+            trained.append(name)
+    # numpy_mlp no tiene dependencias opcionales
+    assert 'numpy_mlp' in trained
+
+
+if __name__ == "__main__":
+    test_backends_round_trip()
+    print("✅ Pruebas de backends completadas")
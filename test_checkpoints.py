@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los checkpoints y la reanudación del entrenamiento
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from ml.checkpoints import CheckpointManager
+from ml.dataset_generator import AlgorithmDatasetGenerator
+from ml.neural_network import AlgorithmClassifier
+
+
+def test_resume_matches_uninterrupted_run():
+    """Entrenar 12 épocas y reanudar hasta 24 da los mismos pesos que 24 seguidas"""
+    dataset = AlgorithmDatasetGenerator().generate_training_dataset(20, seed=7)
+
+    full = AlgorithmClassifier(backend='numpy_mlp', patience=100)
+    full.train(dataset, epochs=24)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        interrupted = AlgorithmClassifier(backend='numpy_mlp', patience=100)
+        interrupted.train(dataset, epochs=12, checkpoints=CheckpointManager(tmp, every=3, keep=2))
+        assert len(CheckpointManager(tmp).checkpoints()) == 2
+
+        resumed = AlgorithmClassifier(backend='numpy_mlp', patience=100)
+        history = resumed.train(dataset, epochs=24, checkpoints=CheckpointManager(tmp, every=3),
+                                resume=True)
+
+    assert len(history.history['accuracy']) == 24
+    for expected, actual in zip(full.backend.weights, resumed.backend.weights):
+        assert np.allclose(expected, actual)
+
+
+if __name__ == "__main__":
+    test_resume_matches_uninterrupted_run()
+    print("✅ Pruebas de checkpoints completadas")
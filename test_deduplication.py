@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la deduplicación del corpus por huellas del AST
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from ml.deduplication import CorpusDeduplicator, ast_fingerprint
+
+
+def test_fingerprint_ignores_names_and_docstrings():
+    """Renombrar variables o cambiar comentarios no cambia la huella"""
+    a = "def total(arr):\n    '''Suma'''\n    s = 0\n    for x in arr:\n        s += x  # acumula\n    return s\n"
+    b = "def add_all(values):\n    acc = 0\n    for v in values:\n        acc += v\n    return acc\n"
+    c = "def total(arr):\n    s = 0\n    for x in arr:\n        s *= x\n    return s\n"
+    assert ast_fingerprint(a) == ast_fingerprint(b)
+    assert ast_fingerprint(a) != ast_fingerprint(c)
+
+
+def test_deduplicate_exact_and_near():
+    """Se eliminan duplicados exactos y casi duplicados; con etiquetas distintas prevalece la primera"""
+    base = "\n".join(f"    x{i} = arr[{i}] + {i}" for i in range(12))
+    original = f"def f(arr):\n{base}\n    return arr\n"
+    renamed = original.replace('arr', 'data')
+    near = original.replace('+ 11', '- 11')
+    other_class = "def g(n):\n    return n\n"
+
+    dataset = [(original, 'O(1)'), (renamed, 'O(1)'), (near, 'O(1)'), (other_class, 'O(1)'),
+               (original, 'O(n)'), (near, 'O(n)'), (near.replace('+ 10', '- 10'), 'O(n)')]
+    kept, stats = CorpusDeduplicator(threshold=0.8).deduplicate(dataset)
+
+    assert stats['exact_duplicates'] == 1
+    assert stats['near_duplicates'] == 2
+    # Mismo programa o casi el mismo con otra etiqueta: no se conserva en ninguna otra clase
+    assert stats['label_conflicts'] == 3
+    assert kept == [(original, 'O(1)'), (other_class, 'O(1)')]
+
+
+if __name__ == "__main__":
+    test_fingerprint_ignores_names_and_docstrings()
+    test_deduplicate_exact_and_near()
+    print("✅ Pruebas de deduplicación completadas")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la caché de la matriz de características
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+import ml.feature_cache as feature_cache
+from ml.dataset_generator import AlgorithmDatasetGenerator
+from ml.feature_cache import FeatureMatrixBuilder
+
+
+def test_cache_key_tracks_code_and_extractor_version():
+    """La clave cambia con el código del dataset y con la versión del extractor"""
+    dataset = AlgorithmDatasetGenerator().generate_training_dataset(3, seed=5)
+    builder = FeatureMatrixBuilder(cache_dir=None)
+    key = builder.dataset_key(dataset)
+    assert key == builder.dataset_key(list(dataset))
+
+    edited = [(code + "\n# cambio", label) if i == 0 else (code, label) for i, (code, label) in enumerate(dataset)]
+    assert builder.dataset_key(edited) != key
+    assert FeatureMatrixBuilder(cache_dir=None, language='java').dataset_key(dataset) != key
+
+    original = feature_cache.FEATURE_EXTRACTOR_VERSION
+    feature_cache.FEATURE_EXTRACTOR_VERSION = original + 1
+    try:
+        assert builder.dataset_key(dataset) != key
+    finally:
+        feature_cache.FEATURE_EXTRACTOR_VERSION = original
+
+
+def test_cache_is_invalidated_and_reused():
+    """Un acierto devuelve la misma matriz; un código distinto se extrae de nuevo"""
+    dataset = AlgorithmDatasetGenerator().generate_training_dataset(3, seed=5)
+    with tempfile.TemporaryDirectory() as tmp:
+        builder = FeatureMatrixBuilder(cache_dir=tmp, workers=1)
+        X, y = builder.build(dataset)
+        x_path, _ = builder.cache_paths(builder.dataset_key(dataset))
+        assert x_path.exists()
+
+        cached_X, cached_y = builder.build(dataset)
+        assert np.array_equal(X, cached_X) and np.array_equal(y, cached_y)
+
+        edited = [("def f(n):\n    for i in range(n):\n        print(i)\n", dataset[0][1])] + dataset[1:]
+        edited_X, _ = builder.build(edited)
+        assert len(list(Path(tmp).glob('X_*.npy'))) == 2
+        assert not np.array_equal(edited_X[0], X[0])
+        assert np.array_equal(edited_X[1:], X[1:])
+
+
+def test_parallel_matches_serial():
+    """Extraer en varios procesos da la misma matriz que en uno"""
+    dataset = AlgorithmDatasetGenerator().generate_training_dataset(4, seed=11)
+    serial_X, serial_y = FeatureMatrixBuilder(cache_dir=None, workers=1).build(dataset)
+    parallel_X, parallel_y = FeatureMatrixBuilder(cache_dir=None, workers=2, chunk_size=7).build(dataset)
+    assert np.array_equal(serial_X, parallel_X)
+    assert np.array_equal(serial_y, parallel_y)
+
+
+if __name__ == "__main__":
+    test_cache_key_tracks_code_and_extractor_version()
+    test_cache_is_invalidated_and_reused()
+    test_parallel_matches_serial()
+    print("✅ Pruebas de la caché de características completadas")
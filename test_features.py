@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Pruebas del extractor de características de una sola pasada
+"""
+
+import sys
+from pathlib import Path
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from ml.features import FeatureExtractor
+
+
+def test_loops_and_nesting():
+    """Cuenta bucles, bucles anidados y el patrón for-in-range"""
+    code = """
+def bubble_sort(arr):
+    n = len(arr)
+    for i in range(n):
+        for j in range(0, n-i-1):
+            if arr[j] > arr[j+1]:
+                arr[j], arr[j+1] = arr[j+1], arr[j]
+    return arr
+"""
+    features = FeatureExtractor().describe(code)
+    assert features['num_loops'] == 2
+    assert features['num_nested_loops'] == 1
+    assert features['max_nesting_level'] == 4
+    assert features['has_sorting'] == 1
+    assert features['loop_patterns'] == 3.5
+
+
+def test_recursion_counts():
+    """Las llamadas recursivas se cuentan sin incluir la definición"""
+    code = """
+def fibonacci(n):
+    if n <= 1:
+        return n
+    return fibonacci(n-1) + fibonacci(n-2)
+"""
+    features = FeatureExtractor().describe(code)
+    assert features['num_recursive_calls'] == 2
+    assert features['recursion_patterns'] == 4.0
+
+
+def test_ignores_strings_and_comments():
+    """Las palabras clave dentro de cadenas y comentarios no cuentan"""
+    code = '''
+def describe():
+    # for while if sort
+    text = "for x in range(10): search()"
+    return text
+'''
+    features = FeatureExtractor().describe(code)
+    assert features['num_loops'] == 0
+    assert features['num_conditionals'] == 0
+    assert features['num_function_calls'] == 0
+    assert features['has_sorting'] == 0
+    assert features['has_search'] == 0
+
+
+def test_braced_languages():
+    """Los lenguajes con llaves usan la profundidad de bloques y comentarios //"""
+    code = """
+int sum(int* arr, int n) {
+    int total = 0; // for each element
+    for (int i = 0; i < n; i++) {
+        for (int j = 0; j < n; j++) {
+            total += arr[i] * arr[j];
+        }
+    }
+    return total;
+}
+"""
+    features = FeatureExtractor().describe(code, 'cpp')
+    assert features['num_loops'] == 2
+    assert features['num_nested_loops'] == 1
+    assert features['max_nesting_level'] == 3
+    assert features['num_function_calls'] == 0
+
+
+if __name__ == "__main__":
+    test_loops_and_nesting()
+    test_recursion_counts()
+    test_ignores_strings_and_comments()
+    test_braced_languages()
+    print("✅ Pruebas del extractor completadas")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las valoraciones de usuarios y del ajuste incremental
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from ml.dataset_generator import AlgorithmDatasetGenerator
+from ml.feedback import FeedbackStore
+from ml.fine_tune import FineTuner
+from ml.neural_network import AlgorithmClassifier
+
+
+LINEAR = """def total(arr):
+    s = 0
+    for x in arr:
+        s += x
+    return s"""
+
+QUADRATIC = """def pairs(arr):
+    count = 0
+    for a in arr:
+        for b in arr:
+            count += a * b
+    return count"""
+
+
+def test_store_keeps_latest_label_and_cursor():
+    """La última valoración de un código prevalece y el cursor marca lo consumido"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeedbackStore(str(Path(tmp) / 'feedback.jsonl'))
+        store.record(LINEAR, 'python', 'O(n²)', correct=False, label='O(n)')
+        store.record(QUADRATIC, 'python', 'O(n)', correct=False)
+        store.record(LINEAR, 'python', 'O(n)', correct=True)
+
+        pending, offset = store.pending()
+        assert [(e['code'], e['label']) for e in pending] == [(LINEAR, 'O(n)')]
+
+        store.commit(offset)
+        assert store.pending()[0] == []
+        assert store.stats() == {'total': 3, 'correct': 1, 'incorrect': 2, 'relabeled': 1}
+
+
+def test_fine_tune_publishes_and_consumes_feedback():
+    """Un ciclo de ajuste actualiza el modelo, avanza el cursor y registra las métricas"""
+    dataset = AlgorithmDatasetGenerator().generate_training_dataset(20, seed=42)
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = str(Path(tmp) / 'model')
+        classifier = AlgorithmClassifier(backend='numpy_mlp')
+        classifier.train(dataset, epochs=30)
+        classifier.save_model(model_path)
+
+        # Etiquetas que el modelo no conoce: no alcanzan el mínimo y no se consumen
+        partial_path = str(Path(tmp) / 'partial')
+        partial = AlgorithmClassifier(backend='numpy_mlp')
+        partial.train([(code, label) for code, label in dataset if label != 'O(n!)'], epochs=5)
+        partial.save_model(partial_path)
+        unknown = FeedbackStore(str(Path(tmp) / 'unknown.jsonl'))
+        for i in range(8):
+            unknown.record(LINEAR + f"\n# {i}", 'python', 'O(n)', correct=False, label='O(n!)')
+        report = FineTuner(partial_path, unknown, min_samples=8, feature_cache=None).run()
+        assert report['status'] == 'skipped'
+        assert len(unknown.pending()[0]) == 8
+
+        store = FeedbackStore(str(Path(tmp) / 'feedback.jsonl'))
+        for i in range(4):
+            store.record(LINEAR + f"\n# {i}", 'python', 'O(n²)', correct=False, label='O(n)')
+            store.record(QUADRATIC + f"\n# {i}", 'python', 'O(n²)', correct=True)
+
+        tuner = FineTuner(model_path, store, min_samples=8, base_samples_per_class=20,
+                          feature_cache=None, max_regression=1.0)
+        report = tuner.run()
+
+        assert report['status'] == 'accepted'
+        assert report['used_samples'] == 8
+        assert report['replay_samples'] == 32
+        assert store.pending()[0] == []
+        assert Path(f"{model_path}_finetune.json").exists()
+        assert tuner.run()['status'] == 'skipped'
+        AlgorithmClassifier(model_path).predict(LINEAR)
+
+
+if __name__ == "__main__":
+    test_store_keeps_latest_label_and_cursor()
+    test_fine_tune_publishes_and_consumes_feedback()
+    print("✅ Pruebas de valoraciones completadas")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la búsqueda de hiperparámetros con k-fold
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from ml.hyperparameter_search import HyperparameterSearch, search_candidates
+
+
+SPACE = {'numpy_mlp': {'hidden': [(2,), (16,)], 'learning_rate': [1e-3, 1e-2]}}
+
+
+def _separable_data(seed: int = 0):
+    """Tres clases separadas por la primera característica"""
+    rng = np.random.RandomState(seed)
+    labels = np.repeat(np.array(['O(1)', 'O(n)', 'O(n²)']), 12)
+    X = rng.normal(0.0, 0.1, size=(len(labels), 4)).astype(np.float32)
+    X[:, 0] += np.repeat(np.arange(3), 12) * 2.0
+    return X, labels
+
+
+def test_kfold_split():
+    """Cada muestra valida en un solo fold, estratificado; los folds se ajustan a la clase menor"""
+    _, labels = _separable_data()
+    splits = HyperparameterSearch(SPACE, folds=3).splits(labels)
+    assert len(splits) == 3
+    validated = np.concatenate([val for _, val in splits])
+    assert sorted(validated.tolist()) == list(range(len(labels)))
+    for train, val in splits:
+        assert not set(train.tolist()) & set(val.tolist())
+        assert sorted(set(labels[val].tolist())) == sorted(set(labels.tolist()))
+
+    # Con 2 muestras en la clase menor solo caben 2 folds
+    assert len(HyperparameterSearch(SPACE, folds=5).splits(labels[10:])) == 2
+
+
+def test_small_grid_selects_best_configuration():
+    """La rejilla evalúa cada configuración y elige la más precisa o la menor que cumple el objetivo"""
+    X, labels = _separable_data()
+    assert len(search_candidates(SPACE)) == 4
+
+    search = HyperparameterSearch(SPACE, folds=3, epochs=30, batch_size=8, workers=1)
+    result = search.run(X, labels)
+    assert result['folds'] == 3 and not result['skipped']
+    assert len(result['results']) == 4
+    accuracies = [r['accuracy_mean'] for r in result['results']]
+    assert accuracies == sorted(accuracies, reverse=True)
+    assert result['selected']['accuracy_mean'] == accuracies[0]
+
+    target = HyperparameterSearch.select(result['results'], target_accuracy=0.0)
+    assert target['model_bytes'] == min(r['model_bytes'] for r in result['results'])
+    assert target['params']['hidden'] == (2,)
+
+
+if __name__ == "__main__":
+    test_kfold_split()
+    test_small_grid_selects_best_configuration()
+    print("✅ Pruebas de la búsqueda de hiperparámetros completadas")
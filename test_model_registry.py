@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Pruebas del registro de modelos compartido
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from core.analyzer import AlgorithmAnalyzer
+from ml.dataset_generator import AlgorithmDatasetGenerator
+from ml.model_registry import SMOKE_TEST_CODE, get_registry
+from ml.neural_network import AlgorithmClassifier
+
+
+def _train(model_path: str, seed: int):
+    classifier = AlgorithmClassifier(backend='numpy_mlp', seed=seed)
+    classifier.train(AlgorithmDatasetGenerator().generate_training_dataset(10, seed=seed), epochs=5)
+    classifier.save_model(model_path)
+
+
+def test_registry_shares_and_hot_swaps_models():
+    """Los analizadores comparten una carga y ven la versión nueva tras recargar"""
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = str(Path(tmp) / 'model')
+        _train(model_path, seed=1)
+
+        registry = get_registry()
+        first = AlgorithmAnalyzer(model_path=model_path)
+        second = AlgorithmAnalyzer(model_path=model_path)
+        assert first.neural_classifier is second.neural_classifier
+
+        in_flight = first.neural_classifier
+        assert not registry.reload(model_path)
+
+        _train(model_path, seed=2)
+        assert registry.reload(model_path)
+        assert first.model_handle.version == 2
+        assert first.neural_classifier is second.neural_classifier is not in_flight
+        # Una petición que ya tenía la versión anterior termina con ella
+        in_flight.predict(SMOKE_TEST_CODE)
+        assert first.analyze_code(SMOKE_TEST_CODE)['neural_notation'] is not None
+
+
+if __name__ == "__main__":
+    test_registry_shares_and_hot_swaps_models()
+    print("✅ Pruebas del registro de modelos completadas")
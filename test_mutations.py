@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Pruebas del motor de mutaciones sobre el AST
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Agregar el directorio actual al path
+sys.path.append(str(Path(__file__).parent))
+
+from ml.mutations import ASTMutator
+
+
+SOURCE = """
+def count_pairs(arr, target):
+    n = len(arr)
+    count = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if arr[i] + arr[j] == target:
+                count += 1
+    return count
+"""
+
+
+def _run(code, *args):
+    namespace = {}
+    exec(code, namespace)
+    functions = [v for k, v in namespace.items() if callable(v) and not k.endswith(('_step', '_block'))]
+    return [f(*args) for f in functions]
+
+
+def test_mutations_preserve_behaviour():
+    """Todas las variantes compilan y calculan lo mismo que el original"""
+    mutator = ASTMutator()
+    expected = _run(SOURCE, [1, 2, 3, 4, 5], 6)
+    for seed in range(50):
+        variant = mutator.mutate(SOURCE, random.Random(seed))
+        compile(variant, '<test>', 'exec')
+        assert _run(variant, [1, 2, 3, 4, 5], 6) == expected
+
+
+def test_for_while_round_trip():
+    """for -> while -> for conserva la estructura del bucle"""
+    to_while = ASTMutator(['for_to_while'], max_mutations=1)
+    to_for = ASTMutator(['while_to_for'], max_mutations=1)
+    code = "def total(n):\n    s = 0\n    for i in range(n):\n        s += i\n    return s\n"
+    as_while = to_while.mutate(code, random.Random(0))
+    assert 'while i < n' in as_while
+    assert to_for.mutate(as_while, random.Random(0)).strip() == code.strip()
+
+
+def test_invalid_code_is_returned_unchanged():
+    """Si el código no se puede analizar no se inventa nada"""
+    code = "def broken(:\n    pass"
+    assert ASTMutator().mutate(code, random.Random(0)) == code
+
+
+if __name__ == "__main__":
+    test_mutations_preserve_behaviour()
+    test_for_while_round_trip()
+    test_invalid_code_is_returned_unchanged()
+    print("✅ Pruebas de mutaciones completadas")
@@ -8,17 +8,43 @@ import os
 from pathlib import Path
 import argparse
 import json
+from typing import List, Optional
 
 # Agregar el directorio actual al path
 sys.path.append(str(Path(__file__).parent))
 
 from ml.neural_network import AlgorithmClassifier
 from ml.dataset_generator import AlgorithmDatasetGenerator
+from ml.feature_cache import FeatureMatrixBuilder
+from ml.dataset_shards import ShardedDataset
+from ml.deduplication import CorpusDeduplicator
+from ml.backends import BACKENDS, DEFAULT_BACKEND
+from ml.checkpoints import CheckpointManager
+from ml.hyperparameter_search import DEFAULT_SEARCH_SPACE, HyperparameterSearch, print_search_summary
 
 
 def train_model(samples_per_class: int = 100, epochs: int = 100, 
-                batch_size: int = 32, model_path: str = "models/algorithm_classifier"):
-    """Entrena el modelo de clasificación de algoritmos"""
+                batch_size: int = 32, model_path: str = "models/algorithm_classifier",
+                feature_cache: Optional[str] = "models/feature_cache",
+                workers: Optional[int] = None, shards_dir: Optional[str] = None,
+                dedup: bool = True, dedup_threshold: float = 0.9,
+                backend: str = DEFAULT_BACKEND, search: Optional[str] = None,
+                folds: int = 5, search_iter: int = 20, target_accuracy: Optional[float] = None,
+                search_backends: Optional[List[str]] = None, seed: int = 42,
+                checkpoint_dir: Optional[str] = None, checkpoint_every: int = 1,
+                keep_checkpoints: int = 3, resume: bool = False):
+    """
+    Entrena el modelo de clasificación de algoritmos
+    
+    Con `search` ('grid' o 'random') primero se evalúan las configuraciones
+    del espacio de búsqueda con validación cruzada k-fold y se entrena la
+    elegida: la más pequeña que alcanza `target_accuracy` o, si no se
+    indica, la más precisa.
+    
+    Con `checkpoint_dir` se guarda un checkpoint cada `checkpoint_every`
+    épocas; `resume` continúa desde el último (el dataset se regenera con la
+    misma semilla, así que debe coincidir).
+    """
     
     print("🧠 ENTRENAMIENTO DE RED NEURONAL")
     print("=" * 50)
@@ -26,26 +52,91 @@ def train_model(samples_per_class: int = 100, epochs: int = 100,
     # Crear directorio para modelos si no existe
     os.makedirs("models", exist_ok=True)
     
-    # Generar dataset
-    print("📊 Generando dataset de entrenamiento...")
-    generator = AlgorithmDatasetGenerator()
-    dataset = generator.generate_training_dataset(samples_per_class=100)
+    # Generar dataset (o leerlo en streaming desde shards pregenerados)
+    if shards_dir:
+        print(f"📊 Usando dataset en shards: {shards_dir}")
+        dataset = ShardedDataset(shards_dir)
+    else:
+        print("📊 Generando dataset de entrenamiento...")
+        generator = AlgorithmDatasetGenerator()
+        dataset = generator.generate_training_dataset(samples_per_class=samples_per_class, seed=seed)
     
     # Mostrar estadísticas del dataset
     print(f"Total de muestras: {len(dataset)}")
     print("Dataset generado exitosamente")
     
+    # Eliminar duplicados antes de extraer características
+    if dedup and isinstance(dataset, ShardedDataset):
+        print("ℹ️  Deduplicación omitida: los shards se leen en streaming")
+    elif dedup:
+        print("\n🧹 Eliminando duplicados y casi duplicados...")
+        deduplicator = CorpusDeduplicator(threshold=dedup_threshold)
+        dataset, dedup_stats = deduplicator.deduplicate(dataset)
+        print(f"Duplicados exactos: {dedup_stats['exact_duplicates']}")
+        print(f"Casi duplicados: {dedup_stats['near_duplicates']}")
+        if dedup_stats['label_conflicts']:
+            print(f"⚠️  Programas repetidos con distinta etiqueta (se conserva la primera): {dedup_stats['label_conflicts']}")
+        print(f"Muestras conservadas: {dedup_stats['kept']}")
+    
+    # Las características se extraen en paralelo y se cachean
+    feature_builder = FeatureMatrixBuilder(cache_dir=feature_cache, workers=workers)
+    
+    checkpoints = None
+    if checkpoint_dir:
+        checkpoints = CheckpointManager(checkpoint_dir, every=checkpoint_every, keep=keep_checkpoints)
+        if not resume and checkpoints.checkpoints():
+            print(f"🗑️  Eliminando checkpoints anteriores de {checkpoint_dir}")
+            checkpoints.clear()
+    elif resume:
+        raise ValueError("--resume requiere --checkpoint-dir")
+    
+    # Búsqueda de hiperparámetros con validación cruzada
+    backend_params = {}
+    search_results = None
+    latest = checkpoints.latest() if checkpoints is not None and resume else None
+    if latest is not None and search:
+        # La búsqueda ya se hizo en la ejecución interrumpida
+        backend = latest['metadata']['backend']
+        backend_params = latest['metadata']['backend_params']
+        print(f"♻️  Se omite la búsqueda: se reanuda {backend} {backend_params}")
+    elif search:
+        print(f"\n🔎 Búsqueda de hiperparámetros ({search}, {folds} folds)...")
+        space = {
+            name: values for name, values in DEFAULT_SEARCH_SPACE.items()
+            if not search_backends or name in search_backends
+        }
+        X, y = feature_builder.build(dataset)
+        searcher = HyperparameterSearch(space, mode=search, n_iter=search_iter, folds=folds,
+                                        epochs=epochs, batch_size=batch_size, workers=workers)
+        search_results = searcher.run(X, y, target_accuracy=target_accuracy)
+        print_search_summary(search_results)
+        
+        selected = search_results['selected']
+        if selected is None:
+            raise ValueError("La búsqueda no produjo ninguna configuración")
+        backend, backend_params = selected['backend'], selected['params']
+        if target_accuracy is not None and selected['accuracy_mean'] < target_accuracy:
+            print(f"⚠️  Ninguna configuración alcanza {target_accuracy:.2%}; se usa la más precisa")
+        print(f"\n🏆 Seleccionado: {backend} {backend_params} "
+              f"(precisión CV {selected['accuracy_mean']:.4f})")
+        
+        with open(f"{model_path}_search.json", 'w') as f:
+            json.dump(search_results, f, indent=2, default=list)
+    
     # Crear y entrenar el clasificador
     print("\n🔧 Creando clasificador...")
-    classifier = AlgorithmClassifier()
+    classifier = AlgorithmClassifier(backend=backend, **backend_params)
     
     print(f"\n🚀 Iniciando entrenamiento...")
+    print(f"Backend: {backend}")
     print(f"Épocas: {epochs}")
     print(f"Batch size: {batch_size}")
     print(f"Muestras por clase: {samples_per_class}")
     
     # Entrenar el modelo
-    history = classifier.train(dataset, epochs=epochs, batch_size=batch_size)
+    history = classifier.train(dataset, epochs=epochs, batch_size=batch_size,
+                               feature_builder=feature_builder,
+                               checkpoints=checkpoints, resume=resume)
     
     # Guardar el modelo
     print(f"\n💾 Guardando modelo en {model_path}...")
@@ -66,11 +157,13 @@ def train_model(samples_per_class: int = 100, epochs: int = 100,
         'final_loss': float(history.history['loss'][-1]),
         'final_val_loss': float(history.history['val_loss'][-1]),
         'epochs_trained': len(history.history['accuracy']),
+        'backend': backend,
+        'backend_params': backend_params,
         'feature_importance': {k: float(v) for k, v in feature_importance.items()}
     }
     
     with open(f"{model_path}_metrics.json", 'w') as f:
-        json.dump(metrics, f, indent=2)
+        json.dump(metrics, f, indent=2, default=list)
     
     print(f"\n✅ Entrenamiento completado!")
     print(f"Precisión final: {metrics['final_accuracy']:.4f}")
@@ -115,6 +208,40 @@ def main():
                        help='Ruta para guardar el modelo (default: models/algorithm_classifier)')
     parser.add_argument('--test', action='store_true',
                        help='Ejecutar pruebas después del entrenamiento')
+    parser.add_argument('--feature-cache', type=str, default='models/feature_cache',
+                       help='Directorio de caché de características (default: models/feature_cache)')
+    parser.add_argument('--no-feature-cache', action='store_true',
+                       help='Extraer características sin usar la caché')
+    parser.add_argument('--shards', type=str, default=None,
+                       help='Directorio con un dataset en shards (ver ml/dataset_shards.py)')
+    parser.add_argument('--backend', choices=list(BACKENDS), default=DEFAULT_BACKEND,
+                       help=f'Modelo del clasificador (default: {DEFAULT_BACKEND})')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='No eliminar duplicados del dataset')
+    parser.add_argument('--dedup-threshold', type=float, default=0.9,
+                       help='Similitud de Jaccard a partir de la cual dos muestras son casi duplicadas (default: 0.9)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Procesos para extraer características y evaluar folds (default: núcleos disponibles)')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Semilla del dataset generado (default: 42)')
+    parser.add_argument('--checkpoint-dir', type=str, default=None,
+                       help='Directorio para checkpoints periódicos del entrenamiento')
+    parser.add_argument('--checkpoint-every', type=int, default=1,
+                       help='Épocas entre checkpoints (default: 1)')
+    parser.add_argument('--keep-checkpoints', type=int, default=3,
+                       help='Checkpoints recientes a conservar (default: 3)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continuar desde el último checkpoint de --checkpoint-dir')
+    parser.add_argument('--search', choices=['grid', 'random'], default=None,
+                       help='Buscar hiperparámetros con validación cruzada antes de entrenar')
+    parser.add_argument('--folds', type=int, default=5,
+                       help='Folds de la validación cruzada (default: 5)')
+    parser.add_argument('--search-iter', type=int, default=20,
+                       help='Configuraciones a probar en la búsqueda aleatoria (default: 20)')
+    parser.add_argument('--search-backends', type=str, default=None,
+                       help='Backends a incluir en la búsqueda, separados por comas (default: todos)')
+    parser.add_argument('--target-accuracy', type=float, default=None,
+                       help='Precisión CV mínima: se elige el modelo más pequeño que la alcance')
     
     args = parser.parse_args()
     
@@ -124,7 +251,23 @@ def main():
             samples_per_class=args.samples,
             epochs=args.epochs,
             batch_size=args.batch_size,
-            model_path=args.model_path
+            model_path=args.model_path,
+            feature_cache=None if args.no_feature_cache else args.feature_cache,
+            workers=args.workers,
+            shards_dir=args.shards,
+            dedup=not args.no_dedup,
+            dedup_threshold=args.dedup_threshold,
+            backend=args.backend,
+            search=args.search,
+            folds=args.folds,
+            search_iter=args.search_iter,
+            target_accuracy=args.target_accuracy,
+            search_backends=args.search_backends.split(',') if args.search_backends else None,
+            seed=args.seed,
+            checkpoint_dir=args.checkpoint_dir,
+            checkpoint_every=args.checkpoint_every,
+            keep_checkpoints=args.keep_checkpoints,
+            resume=args.resume
         )
         
         # Ejecutar pruebas si se solicita
@@ -0,0 +1,176 @@
+"""
+Perfilador del analizador de algoritmos
+Ejecuta el análisis bajo cProfile y genera archivos .pstats y pilas colapsadas
+"""
+
+import cProfile
+import io
+import pstats
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Módulos propios del analizador incluidos en las pilas colapsadas
+DEFAULT_SCOPE = ('core', 'utils', 'ml', 'cli')
+
+# Límites para la reconstrucción de pilas a partir del grafo de llamadas
+MAX_STACK_DEPTH = 64
+MIN_PATH_FRACTION = 1e-4
+
+
+class AnalysisProfiler:
+    """Perfila ejecuciones del analizador y exporta los resultados"""
+
+    def __init__(self, output_dir: str = 'profiles', scope: Tuple[str, ...] = DEFAULT_SCOPE):
+        self.output_dir = Path(output_dir)
+        self.scope_dirs = [str(PROJECT_ROOT / module) for module in scope]
+        self._run_count = 0
+        self._scope_cache: Dict[str, bool] = {}
+
+    def profile(self, func: Callable, *args, label: str = 'analysis', **kwargs) -> Tuple[Any, Dict[str, str]]:
+        """
+        Ejecuta una función bajo cProfile y guarda los resultados
+
+        Args:
+            func: Función a perfilar
+            label: Prefijo para los archivos generados
+
+        Returns:
+            Tupla con el resultado de la función y las rutas generadas
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+        paths = self._write_outputs(profiler, label)
+        return result, paths
+
+    def _write_outputs(self, profiler: cProfile.Profile, label: str) -> Dict[str, str]:
+        """Escribe el archivo .pstats y las pilas colapsadas"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._run_count += 1
+        base_name = f"{label}_{time.strftime('%Y%m%d_%H%M%S')}_{self._run_count:03d}"
+
+        pstats_path = self.output_dir / f"{base_name}.pstats"
+        profiler.dump_stats(str(pstats_path))
+
+        stats = pstats.Stats(profiler)
+        collapsed_path = self.output_dir / f"{base_name}.collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, microseconds in sorted(self.collapse_stacks(stats).items()):
+                f.write(f"{stack} {microseconds}\n")
+
+        return {
+            'pstats': str(pstats_path),
+            'collapsed': str(collapsed_path)
+        }
+
+    def collapse_stacks(self, stats: pstats.Stats) -> Dict[str, int]:
+        """
+        Reconstruye pilas colapsadas (formato flamegraph) desde el grafo de llamadas
+
+        cProfile solo registra aristas llamador→llamado, así que el tiempo propio
+        de cada función se reparte entre sus caminos de llamada en proporción al
+        tiempo acumulado de cada arista. Las funciones fuera del alcance se omiten
+        de las pilas y su tiempo se atribuye al marco propio más interno.
+
+        Returns:
+            Diccionario {pila: microsegundos}
+        """
+        raw_stats = stats.stats  # type: ignore[attr-defined]
+        path_cache: Dict[Tuple, List[Tuple[Tuple, float]]] = {}
+        collapsed: Dict[str, int] = {}
+
+        for func, (_, _, self_time, _, _) in raw_stats.items():
+            if self_time <= 0:
+                continue
+            paths, _ = self._call_paths(func, raw_stats, path_cache, frozenset())
+            for path, fraction in paths:
+                frames = [self._frame_label(f) for f in path if self._in_scope(f)]
+                if not frames:
+                    continue
+                microseconds = int(round(self_time * fraction * 1_000_000))
+                if microseconds <= 0:
+                    continue
+                stack = ';'.join(frames)
+                collapsed[stack] = collapsed.get(stack, 0) + microseconds
+
+        return collapsed
+
+    def _call_paths(self, func: Tuple, raw_stats: Dict, cache: Dict,
+                    visiting: frozenset) -> Tuple[List[Tuple[Tuple, float]], bool]:
+        """
+        Enumera los caminos raíz→func con la fracción de tiempo de cada uno
+
+        Returns:
+            Tupla con los caminos y si alguno fue truncado por un ciclo
+        """
+        if func in cache:
+            return cache[func], False
+
+        all_callers = raw_stats.get(func, (0, 0, 0, 0, {}))[4]
+        callers = {c: v for c, v in all_callers.items() if c not in visiting and c != func}
+        truncated = any(c in visiting for c in all_callers)
+
+        if not callers or len(visiting) >= MAX_STACK_DEPTH:
+            return [((func,), 1.0)], truncated or bool(callers)
+
+        # Peso de cada llamador: tiempo acumulado de la arista (o número de llamadas)
+        weights = {c: (v[3] if v[3] > 0 else v[1]) for c, v in callers.items()}
+        total = sum(weights.values()) or 1.0
+
+        paths = []
+        for caller, weight in weights.items():
+            share = weight / total
+            if share < MIN_PATH_FRACTION:
+                continue
+            caller_paths, caller_truncated = self._call_paths(caller, raw_stats, cache, visiting | {func})
+            truncated = truncated or caller_truncated
+            for path, fraction in caller_paths:
+                combined = fraction * share
+                if combined >= MIN_PATH_FRACTION:
+                    paths.append((path + (func,), combined))
+
+        if not paths:
+            paths = [((func,), 1.0)]
+
+        # No se memoizan caminos truncados por un ciclo
+        if not truncated:
+            cache[func] = paths
+        return paths, truncated
+
+    def _in_scope(self, func: Tuple) -> bool:
+        """Verifica si una función pertenece a los módulos del analizador"""
+        filename = func[0]
+        if filename not in self._scope_cache:
+            if not filename or filename.startswith('<') or filename == '~':
+                self._scope_cache[filename] = False
+            else:
+                resolved = str(Path(filename).resolve())
+                self._scope_cache[filename] = any(
+                    resolved.startswith(scope_dir) for scope_dir in self.scope_dirs
+                )
+        return self._scope_cache[filename]
+
+    def _frame_label(self, func: Tuple) -> str:
+        """Genera la etiqueta de un marco, p. ej. core.patterns:detect_patterns"""
+        filename, _, name = func
+        try:
+            relative = Path(filename).resolve().relative_to(PROJECT_ROOT)
+            module = '.'.join(relative.with_suffix('').parts)
+        except ValueError:
+            module = Path(filename).stem
+        return f"{module}:{name}"
+
+    def summary(self, pstats_path: str, limit: int = 15) -> str:
+        """Genera un resumen textual de las funciones más costosas"""
+        buffer = io.StringIO()
+        stats = pstats.Stats(pstats_path, stream=buffer)
+        stats.sort_stats('cumulative').print_stats(limit)
+        return buffer.getvalue()